@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+OCI Instance Sniper - Benchmark
+Runs the real attempt loop (try_create_instance, the engine fan-out and
+wait_for_instance_running) against the local fake OCI endpoint and reports:
+
+- attempts per second and p50/p99 per-call latency
+- time from capacity appearing to the launch_instance call landing
+- time from launch to RUNNING with a public IP
+
+The startup benchmark measures cold start in fresh interpreters: module
+import, the stats and check commands, and the deferred OCI SDK import.
+
+Usage:
+    python scripts/benchmark.py attempts --engine threads --delay 2 --capacity-at 15
+    python scripts/benchmark.py startup --runs 10 [--script old-copy-of-sniper.py]
+    python scripts/benchmark.py compare bench-results/a.json bench-results/b.json
+
+Results are written as JSON to bench-results/ (or --output) so runs can be compared.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "bench-results")
+
+
+def load_script(filename, module_name):
+    """Import one of the hyphenated scripts in scripts/ as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (None for an empty list)"""
+    if not values:
+        return None
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(pct / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def fetch_events(endpoint):
+    with urllib.request.urlopen(f"{endpoint}/_fake/events", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def reset_fake(endpoint):
+    request = urllib.request.Request(f"{endpoint}/_fake/reset", data=b"{}", method="POST")
+    urllib.request.urlopen(request, timeout=10).close()
+
+
+def sandbox_env(workdir):
+    """Environment that keeps the sniper's config, regions, history and log in workdir
+
+    A benchmark must neither read the developer's config/ files nor write
+    oci-sniper.log into the project root.
+    """
+    config_file = os.path.join(workdir, "sniper-config.json")
+    with open(config_file, "w", encoding="utf-8") as f:
+        json.dump({"language": "EN", "history_db": os.path.join(workdir, "history.db")}, f)
+    return {
+        "SNIPER_CONFIG_PATH": config_file,
+        "SNIPER_REGIONS_PATH": os.path.join(workdir, "regions.json"),  # Missing: no regions.json entries
+        "SNIPER_LOG_PATH": os.path.join(workdir, "oci-sniper.log"),
+    }
+
+
+# ============================================================================
+# ATTEMPT BENCHMARK
+# ============================================================================
+
+
+def run_attempts(args):
+    """Run one benchmark of the attempt loop and return the result dict"""
+    fake = load_script("fake-oci-server.py", "fake_oci_server")
+    scenario = fake.load_scenario()
+    scenario.update(
+        {
+            "ads_per_region": args.ads,
+            # Capacity appears in the last AD of every region at --capacity-at
+            "capacity": {f"AD-{args.ads}": [{"start": args.capacity_at}]},
+            "latency_ms": {"min": args.latency_min, "max": args.latency_max},
+            "provisioning_seconds": args.provisioning,
+            "vnic_delay_seconds": min(args.provisioning, 3),
+            "public_ip_delay_seconds": args.provisioning,
+        }
+    )
+    if args.throttle:
+        scenario["throttle"] = {"requests_per_second": args.throttle, "burst": args.throttle}
+
+    server = fake.make_server("127.0.0.1", 0, scenario)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+
+    # init_runtime() reads the settings and opens the log, all in a temp dir
+    workdir = tempfile.mkdtemp(prefix="sniper-bench-")
+    os.environ.update(sandbox_env(workdir))
+    os.environ["OCI_ENDPOINT_OVERRIDE"] = endpoint + "/{region}"
+    os.environ.setdefault("SSH_PUBLIC_KEY", "ssh-rsa AAAA" + "B" * 200 + " benchmark")
+    sniper = load_script("oci-instance-sniper.py", "oci_instance_sniper")
+    sniper.init_runtime()
+    sniper.load_sdk()
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.ERROR)
+
+    sniper.MAX_ATTEMPTS = 10 ** 6
+    sniper.HISTORY = sniper.AttemptHistory(sniper.HISTORY_DB)
+
+    regions = [
+        {
+            "id": f"bench-region-{n}",
+            "name": f"Bench {n}",
+            "compartment_id": "ocid1.compartment.oc1..bench",
+            "image_id": "ocid1.image.oc1..bench",
+            "subnet_id": "ocid1.subnet.oc1..bench",
+            "reserved_public_ip_ocid": "",
+        }
+        for n in range(1, args.regions + 1)
+    ]
+    oci_config = sniper.load_oci_config()
+    for region in regions:
+        sniper.init_region_clients(oci_config, region)
+        sniper.resolve_region(oci_config, region)
+    targets = [(region, ad) for region in regions for ad in region["ad_names"]]
+
+    class ConstantScheduler:
+        name = "constant"
+
+        def next_delay(self, target, targets):
+            return args.delay
+
+    scheduler = sniper.create_scheduler("adaptive") if args.scheduler == "adaptive" else ConstantScheduler()
+    if args.engine == "async":
+        engine = sniper.AsyncSniperEngine(targets, scheduler=scheduler)
+    else:
+        engine = sniper.SniperEngine(targets, scheduler=scheduler)
+
+    # Scenario clock starts now
+    reset_fake(endpoint)
+    started = time.monotonic()
+    status, target, instance = engine.run()
+    engine.shutdown()
+    won = time.monotonic()
+
+    running_ip = None
+    if status == "SUCCESS":
+        region = target["region"]
+        _, public_ip, _ = sniper.wait_for_instance_running(
+            region["compute_client"],
+            instance.id,
+            region["network_client"],
+            work_request_client=region["work_request_client"],
+            work_request_id=target.get("work_request_id"),
+        )
+        if public_ip:
+            running_ip = time.monotonic() - won
+
+    events = fetch_events(endpoint)
+    server.shutdown()
+
+    launches = [e for e in events if e["operation"] == "launch_instance"]
+    probes = [e for e in events if e["operation"] == "create_compute_capacity_report"]
+    landed = [e["t"] for e in launches if e["status"] == 200]
+    latencies = [row[0] for row in sniper.HISTORY.query("SELECT latency_ms FROM attempts")]
+    duration = won - started
+    calls = len(latencies)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "params": {
+            "engine": args.engine,
+            "scheduler": args.scheduler,
+            "delay": args.delay,
+            "regions": args.regions,
+            "ads": args.ads,
+            "capacity_at": args.capacity_at,
+            "latency_ms": [args.latency_min, args.latency_max],
+            "provisioning": args.provisioning,
+            "throttle": args.throttle,
+            "max_workers": sniper.MAX_WORKERS,
+            "max_in_flight": sniper.MAX_IN_FLIGHT,
+            "capacity_probe": sniper.CAPACITY_PROBE,
+        },
+        "status": status,
+        "duration_s": round(duration, 3),
+        "attempts": calls,
+        "attempts_per_second": round(calls / duration, 2) if duration else None,
+        "launch_calls": len(launches),
+        "probe_calls": len(probes),
+        "throttled_calls": sum(1 for e in events if e["status"] == 429),
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+            "mean": round(statistics.mean(latencies), 1) if latencies else None,
+        },
+        "capacity_to_launch_s": round(min(landed) - args.capacity_at, 3) if landed else None,
+        "launch_to_running_ip_s": round(running_ip, 3) if running_ip is not None else None,
+    }
+
+
+def print_result(result):
+    print("=" * 80)
+    print(f"  Benchmark: {result['params']['engine']} / {result['params']['scheduler']} - {result['status']}")
+    print("=" * 80)
+    print(f"  Attempts:                  {result['attempts']} ({result['attempts_per_second']}/s)")
+    print(f"  Launch / probe calls:      {result['launch_calls']} / {result['probe_calls']}")
+    print(f"  Latency p50 / p99:         {result['latency_ms']['p50']} / {result['latency_ms']['p99']} ms")
+    print(f"  Capacity -> launch landed: {result['capacity_to_launch_s']} s")
+    print(f"  Launch -> RUNNING with IP: {result['launch_to_running_ip_s']} s")
+    print("=" * 80)
+
+
+def save_result(result, output=None, kind="attempts"):
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{kind}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved: {output}")
+
+
+# ============================================================================
+# STARTUP BENCHMARK
+# ============================================================================
+
+# Runs in a fresh interpreter: prints import(+init) and SDK load time in ms
+IMPORT_SNIPPET = """
+import importlib.util, sys, time
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("sniper", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+if hasattr(module, "init_runtime"):
+    module.init_runtime()
+ready = time.perf_counter()
+if hasattr(module, "load_sdk"):
+    module.load_sdk()
+print((ready - started) * 1000, (time.perf_counter() - ready) * 1000)
+"""
+
+
+def timed_run(command, env):
+    """Wall time of one subprocess in ms (None if it crashed or the command is unknown)"""
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    # Exit code 1 is a normal answer (e.g. stats without history), 2 is an argparse error
+    return (elapsed if result.returncode in (0, 1) else None), result.stdout
+
+
+def median_ms(values):
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def run_startup(args):
+    """Cold-start timings of the sniper script in fresh interpreters"""
+    script = os.path.abspath(args.script or os.path.join(SCRIPT_DIR, "oci-instance-sniper.py"))
+    env = dict(os.environ)
+    for name, value in sandbox_env(tempfile.mkdtemp(prefix="sniper-startup-")).items():
+        env.setdefault(name, value)
+    env.setdefault("SSH_PUBLIC_KEY", "ssh-rsa AAAA" + "B" * 200 + " benchmark")
+
+    timings = {"python": [], "import": [], "sdk": [], "stats": [], "check": []}
+    for _ in range(args.runs):
+        timings["python"].append(timed_run([sys.executable, "-c", "pass"], env)[0])
+        elapsed, output = timed_run([sys.executable, "-c", IMPORT_SNIPPET, script], env)
+        if elapsed is not None:
+            import_ms, sdk_ms = (float(value) for value in output.split()[-2:])
+            timings["import"].append(import_ms)
+            timings["sdk"].append(sdk_ms)
+        timings["stats"].append(timed_run([sys.executable, script, "stats"], env)[0])
+        timings["check"].append(timed_run([sys.executable, script, "check"], env)[0])
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "params": {"script": script, "runs": args.runs, "python": sys.version.split()[0]},
+        "startup_ms": {name: median_ms(values) for name, values in timings.items()},
+    }
+
+
+def print_startup(result):
+    startup = result["startup_ms"]
+    print("=" * 80)
+    print(f"  Startup: {os.path.basename(result['params']['script'])} (median of {result['params']['runs']} runs)")
+    print("=" * 80)
+    print(f"  Python interpreter only:   {startup['python']} ms")
+    print(f"  Import + init (no SDK):    {startup['import']} ms")
+    print(f"  Deferred OCI SDK import:   {startup['sdk']} ms")
+    print(f"  stats command (wall):      {startup['stats']} ms")
+    print(f"  check command (wall):      {startup['check']} ms")
+    print("=" * 80)
+
+
+# ============================================================================
+# COMPARE
+# ============================================================================
+
+COMPARE_METRICS = [
+    ("attempts_per_second", "Attempts/s", True),
+    ("latency_ms.p50", "Latency p50 (ms)", False),
+    ("latency_ms.p99", "Latency p99 (ms)", False),
+    ("capacity_to_launch_s", "Capacity -> launch (s)", False),
+    ("launch_to_running_ip_s", "Launch -> RUNNING+IP (s)", False),
+    ("startup_ms.import", "Import + init (ms)", False),
+    ("startup_ms.sdk", "OCI SDK import (ms)", False),
+    ("startup_ms.stats", "stats command (ms)", False),
+    ("startup_ms.check", "check command (ms)", False),
+]
+
+
+def metric(result, path):
+    value = result
+    for key in path.split("."):
+        value = (value or {}).get(key)
+    return value
+
+
+def compare(files):
+    """Print the key metrics of several result files side by side"""
+    results = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            results.append(json.load(f))
+
+    print(f"  {'Metric':<28}" + "".join(f"{os.path.basename(p)[:22]:>24}" for p in files))
+    print("  " + "-" * (28 + 24 * len(files)))
+    for path, label, _higher_is_better in COMPARE_METRICS:
+        if all(metric(result, path) is None for result in results):
+            continue  # e.g. attempt metrics when comparing startup runs
+        row = f"  {label:<28}"
+        base = metric(results[0], path)
+        for result in results:
+            value = metric(result, path)
+            cell = "-" if value is None else f"{value}"
+            if value is not None and base and result is not results[0]:
+                cell += f" ({(value - base) / base * 100:+.0f}%)"
+            row += f"{cell:>24}"
+        print(row)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCI Instance Sniper benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    attempts = sub.add_parser("attempts", help="Attempt loop against the fake OCI endpoint")
+    attempts.add_argument("--engine", choices=["threads", "async"], default="threads")
+    attempts.add_argument("--scheduler", choices=["constant", "adaptive"], default="constant")
+    attempts.add_argument("--delay", type=float, default=2.0, help="Constant delay between rounds per target (s)")
+    attempts.add_argument("--regions", type=int, default=2)
+    attempts.add_argument("--ads", type=int, default=3)
+    attempts.add_argument("--capacity-at", type=float, default=10.0, help="Capacity appears after N seconds")
+    attempts.add_argument("--latency-min", type=float, default=50.0, help="Injected latency min (ms)")
+    attempts.add_argument("--latency-max", type=float, default=250.0, help="Injected latency max (ms)")
+    attempts.add_argument("--provisioning", type=float, default=5.0, help="Seconds until RUNNING")
+    attempts.add_argument("--throttle", type=float, help="Fake 429 throttling: requests per second per region")
+    attempts.add_argument("--output", help="Result JSON file (default: bench-results/attempts-<time>.json)")
+    attempts.add_argument("--verbose", action="store_true", help="Show sniper log output")
+
+    startup = sub.add_parser("startup", help="Cold-start time of the sniper script")
+    startup.add_argument("--runs", type=int, default=10)
+    startup.add_argument("--script", help="Sniper script to measure (default: scripts/oci-instance-sniper.py)")
+    startup.add_argument("--output", help="Result JSON file (default: bench-results/startup-<time>.json)")
+
+    comp = sub.add_parser("compare", help="Compare result JSON files")
+    comp.add_argument("files", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        return compare(args.files)
+
+    if args.command == "startup":
+        result = run_startup(args)
+        print_startup(result)
+        save_result(result, args.output, kind="startup")
+        return 0
+
+    result = run_attempts(args)
+    print_result(result)
+    save_result(result, args.output)
+    return 0 if result["status"] == "SUCCESS" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
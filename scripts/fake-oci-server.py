@@ -0,0 +1,910 @@
+#!/usr/bin/env python3
+"""
+Fake OCI Endpoint
+Local stand-in for the OCI compute, virtual-network and identity APIs used by
+the OCI Instance Sniper, for offline load and regression testing.
+
+Usage:
+    python scripts/fake-oci-server.py --port 8080 --scenario scenario.json
+
+    # Point the sniper at it ({region} is replaced per region)
+    OCI_ENDPOINT_OVERRIDE=http://127.0.0.1:8080/{region} python scripts/oci-instance-sniper.py
+
+Scenario file (all keys optional, times in seconds since server start):
+    {
+      "ads_per_region": 3,
+      "capacity": {"AD-2": [{"start": 30, "end": 90, "count": 1, "max_ocpus": 2}]},
+      "capacity_probability": 0.0,
+      "throttle": {"requests_per_second": 5, "burst": 10, "retry_after": 1},
+      "latency_ms": {"min": 50, "max": 300},
+      "faults": {"reset_probability": 0.01, "lost_response_probability": 0.0,
+                 "hang_probability": 0.0, "hang_seconds": 30},
+      "provisioning_seconds": 20,
+      "vnic_delay_seconds": 3,
+      "public_ip_delay_seconds": 5,
+      "reserved_ips": 0,
+      "smtp_delay_seconds": 0,
+      "webhook_fail_count": 0
+    }
+
+Capacity windows are matched against the end of the AD name ("AD-2" matches
+"FAKE:EU-FRANKFURT-1-AD-2"). A window with "count" accepts that many
+launches, then it is used up. A window with "max_ocpus" only fits shape
+configurations up to that many OCPUs (launches, capacity reports and
+resizes via update_instance alike).
+
+"reset_probability" drops the connection before a request is processed,
+"lost_response_probability" after it (the launch happened, the client
+never hears of it). A launch with an opc-retry-token that was seen before
+returns the instance of the first call, like OCI.
+
+Test hooks (not part of OCI):
+    GET  /_fake/events   every API call seen so far (time, operation, region, AD, status)
+    POST /_fake/reset    forget instances and events, restart the scenario clock
+    POST /_fake/webhook  notification webhook sink (the first "webhook_fail_count" calls get a 500)
+
+With --smtp-port the server also runs an SMTP sink for the email notification
+(no STARTTLS/AUTH, so set "starttls": false). Every accepted message shows up
+as an "smtp_message" event; "smtp_delay_seconds" delays the greeting to
+simulate a slow mail server.
+
+With --redis-port the server also runs a Redis-compatible store for the
+sniper's launch coordination ("coordination": {"backend": "redis"}): PING,
+AUTH, SELECT, GET, SET (NX, PX/EX), DEL and the sniper's two lease scripts
+via EVAL. Writes show up as "redis_<command>" events; data lives in memory.
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import socketserver
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+API_VERSION = "20160918"
+DEFAULT_REGION = "fake-region-1"
+
+DEFAULT_SCENARIO = {
+    "ads_per_region": 3,
+    "capacity": {},
+    "capacity_probability": 0.0,
+    "throttle": None,
+    "latency_ms": {"min": 0, "max": 0},
+    "faults": {"reset_probability": 0.0, "lost_response_probability": 0.0, "hang_probability": 0.0, "hang_seconds": 30},
+    "provisioning_seconds": 20,
+    "vnic_delay_seconds": 3,
+    "public_ip_delay_seconds": 5,
+    "reserved_ips": 0,
+    "smtp_delay_seconds": 0,
+    "webhook_fail_count": 0,
+}
+
+
+def load_scenario(path=None):
+    """Load a scenario file on top of the defaults"""
+    scenario = json.loads(json.dumps(DEFAULT_SCENARIO))
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            scenario.update(json.load(f))
+    return scenario
+
+
+def iso_time(ts):
+    """OCI style timestamp"""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def fake_ocid(kind, region):
+    return f"ocid1.{kind}.oc1.{region}.fake{uuid.uuid4().hex}"
+
+
+class ApiError(Exception):
+    """OCI error response (status, code, message)"""
+
+    def __init__(self, status, code, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.headers = headers or {}
+
+
+# ============================================================================
+# FAKE CLOUD STATE
+# ============================================================================
+
+
+class FakeCloud:
+    """In-memory state of the fake tenancy (instances, VNICs, public IPs)"""
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.start = time.time()
+            self.instances = {}
+            self.retry_tokens = {}  # opc-retry-token -> instance of the first launch
+            self.public_ips = {}
+            self.events = []
+            self.window_usage = {}
+            self.buckets = {}
+            self.seeded_regions = set()
+            self.webhook_calls = 0
+
+    def seed_region(self, region):
+        """Create the scenario's reserved IPs the first time a region is used"""
+        with self.lock:
+            if region in self.seeded_regions:
+                return
+            self.seeded_regions.add(region)
+            for _ in range(self.scenario.get("reserved_ips", 0)):
+                self._create_public_ip(region, None, "fake-reserved-ip")
+
+    def now(self):
+        return time.time() - self.start
+
+    def record(self, operation, region, status, ad=None):
+        with self.lock:
+            self.events.append(
+                {
+                    "t": round(self.now(), 4),
+                    "operation": operation,
+                    "region": region,
+                    "ad": ad,
+                    "status": status,
+                }
+            )
+
+    # ---------------------------------------------------------------- throttling
+    def check_throttle(self, region):
+        """Token bucket per region, raises 429 TooManyRequests when empty"""
+        throttle = self.scenario.get("throttle")
+        if not throttle:
+            return
+        rate = throttle.get("requests_per_second", 5)
+        burst = throttle.get("burst", rate)
+        with self.lock:
+            tokens, last = self.buckets.get(region, (burst, time.monotonic()))
+            now = time.monotonic()
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens < 1:
+                self.buckets[region] = (tokens, now)
+                raise ApiError(
+                    429,
+                    "TooManyRequests",
+                    "Too many requests for the user",
+                    {"Retry-After": str(throttle.get("retry_after", 1))},
+                )
+            self.buckets[region] = (tokens - 1, now)
+
+    # ---------------------------------------------------------------- capacity
+    def has_capacity(self, ad, consume, ocpus=None):
+        """Check the scenario capacity windows for an AD (and shape size)"""
+        now = self.now()
+        with self.lock:
+            for pattern, windows in self.scenario.get("capacity", {}).items():
+                if not ad.upper().endswith(pattern.upper()):
+                    continue
+                for index, window in enumerate(windows):
+                    if not window.get("start", 0) <= now < window.get("end", float("inf")):
+                        continue
+                    key = (ad, pattern, index)
+                    used = self.window_usage.get(key, 0)
+                    if "count" in window and used >= window["count"]:
+                        continue
+                    if ocpus and "max_ocpus" in window and ocpus > window["max_ocpus"]:
+                        continue
+                    if consume:
+                        self.window_usage[key] = used + 1
+                    return True
+        return random.random() < self.scenario.get("capacity_probability", 0.0)
+
+    def ad_names(self, region):
+        return [
+            f"FAKE:{region.upper()}-AD-{n}"
+            for n in range(1, self.scenario.get("ads_per_region", 3) + 1)
+        ]
+
+    # ---------------------------------------------------------------- instances
+    def launch(self, region, body, retry_token=None):
+        if retry_token:
+            with self.lock:
+                instance = self.retry_tokens.get(retry_token)
+            if instance:
+                return instance
+        ad = body.get("availabilityDomain", "")
+        if ad not in self.ad_names(region):
+            raise ApiError(400, "InvalidParameter", f"Invalid availabilityDomain: {ad}")
+        if not self.has_capacity(ad, consume=True, ocpus=(body.get("shapeConfig") or {}).get("ocpus")):
+            raise ApiError(500, "InternalError", "Out of host capacity.")
+
+        instance_id = fake_ocid("instance", region)
+        vnic_details = body.get("createVnicDetails") or {}
+        instance = {
+            "id": instance_id,
+            "region": region,
+            "availabilityDomain": ad,
+            "compartmentId": body.get("compartmentId"),
+            "displayName": body.get("displayName"),
+            "shape": body.get("shape"),
+            "shapeConfig": {
+                "ocpus": (body.get("shapeConfig") or {}).get("ocpus"),
+                "memoryInGBs": (body.get("shapeConfig") or {}).get("memoryInGBs"),
+            },
+            "metadata": body.get("metadata"),
+            "freeformTags": body.get("freeformTags") or {},
+            "created": time.time(),
+            "terminated": None,
+            "assign_public_ip": vnic_details.get("assignPublicIp", True),
+            "work_request_id": fake_ocid("workrequest", region),
+            "vnic_id": fake_ocid("vnic", region),
+            "private_ip_id": fake_ocid("privateip", region),
+            "private_ip": f"10.0.0.{random.randint(2, 254)}",
+            "public_ip": f"130.61.{random.randint(0, 255)}.{random.randint(1, 254)}",
+        }
+        with self.lock:
+            self.instances[instance_id] = instance
+            if retry_token:
+                self.retry_tokens[retry_token] = instance
+        return instance
+
+    def update_instance(self, instance_id, body):
+        """Resize an instance; a larger shape configuration needs capacity in its AD"""
+        instance = self.get_instance(instance_id)
+        shape_config = body.get("shapeConfig") or {}
+        if shape_config.get("ocpus") and shape_config["ocpus"] > (instance["shapeConfig"]["ocpus"] or 0):
+            if not self.has_capacity(instance["availabilityDomain"], consume=True, ocpus=shape_config["ocpus"]):
+                raise ApiError(500, "InternalError", "Out of host capacity.")
+        with self.lock:
+            instance["shape"] = body.get("shape") or instance["shape"]
+            instance["shapeConfig"] = {
+                "ocpus": shape_config.get("ocpus", instance["shapeConfig"]["ocpus"]),
+                "memoryInGBs": shape_config.get("memoryInGBs", instance["shapeConfig"]["memoryInGBs"]),
+            }
+        return instance
+
+    def get_instance(self, instance_id):
+        instance = self.instances.get(instance_id)
+        if not instance:
+            raise ApiError(404, "NotAuthorizedOrNotFound", "Instance not found")
+        return instance
+
+    def instance_state(self, instance):
+        if instance["terminated"]:
+            age = time.time() - instance["terminated"]
+            return "TERMINATED" if age > 5 else "TERMINATING"
+        age = time.time() - instance["created"]
+        return "RUNNING" if age >= self.scenario.get("provisioning_seconds", 20) else "PROVISIONING"
+
+    def instance_json(self, instance):
+        return {
+            "id": instance["id"],
+            "region": instance["region"],
+            "availabilityDomain": instance["availabilityDomain"],
+            "compartmentId": instance["compartmentId"],
+            "displayName": instance["displayName"],
+            "shape": instance["shape"],
+            "shapeConfig": instance["shapeConfig"],
+            "metadata": instance["metadata"],
+            "freeformTags": instance["freeformTags"],
+            "lifecycleState": self.instance_state(instance),
+            "timeCreated": iso_time(instance["created"]),
+        }
+
+    def work_request_json(self, work_request_id):
+        """Launch work request: IN_PROGRESS while provisioning, SUCCEEDED once RUNNING"""
+        instance = next(
+            (i for i in list(self.instances.values()) if i["work_request_id"] == work_request_id), None
+        )
+        if not instance:
+            raise ApiError(404, "NotAuthorizedOrNotFound", "Work request not found")
+        provisioning = self.scenario.get("provisioning_seconds", 20)
+        age = time.time() - instance["created"]
+        state = self.instance_state(instance)
+        status = "IN_PROGRESS" if state == "PROVISIONING" else "SUCCEEDED"
+        return {
+            "id": work_request_id,
+            "operationType": "LaunchInstance",
+            "status": status,
+            "compartmentId": instance["compartmentId"],
+            "resources": [{"entityType": "instance", "identifier": instance["id"], "actionType": "CREATED"}],
+            "percentComplete": min(100.0, age / provisioning * 100) if provisioning else 100.0,
+            "timeAccepted": iso_time(instance["created"]),
+            "timeStarted": iso_time(instance["created"]),
+            "timeFinished": iso_time(instance["created"] + provisioning) if status == "SUCCEEDED" else None,
+        }
+
+    def vnic_ready(self, instance):
+        return time.time() - instance["created"] >= self.scenario.get("vnic_delay_seconds", 3)
+
+    def vnic_json(self, instance):
+        try:
+            public_ip = self.assigned_public_ip(instance["private_ip_id"])["ipAddress"]
+        except ApiError:
+            public_ip = None
+        return {
+            "id": instance["vnic_id"],
+            "availabilityDomain": instance["availabilityDomain"],
+            "compartmentId": instance["compartmentId"],
+            "isPrimary": True,
+            "lifecycleState": "AVAILABLE",
+            "privateIp": instance["private_ip"],
+            "publicIp": public_ip,
+            "timeCreated": iso_time(instance["created"]),
+        }
+
+    # ---------------------------------------------------------------- public IPs
+    def _create_public_ip(self, region, compartment_id, display_name):
+        ip_id = fake_ocid("publicip", region)
+        self.public_ips[ip_id] = {
+            "id": ip_id,
+            "region": region,
+            "compartmentId": compartment_id,
+            "displayName": display_name,
+            "ipAddress": f"158.180.{random.randint(0, 255)}.{random.randint(1, 254)}",
+            "lifetime": "RESERVED",
+            "lifecycleState": "AVAILABLE",
+            "privateIpId": None,
+            "scope": "REGION",
+            "timeCreated": iso_time(time.time()),
+        }
+        return self.public_ips[ip_id]
+
+    def create_public_ip(self, region, body):
+        """Reserved IP, or with privateIpId an ephemeral IP assigned right away"""
+        with self.lock:
+            ip = self._create_public_ip(
+                region, body.get("compartmentId"), body.get("displayName") or "fake-ip"
+            )
+            if body.get("lifetime") == "EPHEMERAL":
+                ip.update(
+                    {
+                        "lifetime": "EPHEMERAL",
+                        "lifecycleState": "ASSIGNED",
+                        "privateIpId": body.get("privateIpId"),
+                        "scope": "AVAILABILITY_DOMAIN",
+                    }
+                )
+            return ip
+
+    def assigned_public_ip(self, private_ip_id):
+        """Public IP on a private IP: an assigned reserved IP, else the instance's ephemeral IP"""
+        for ip in list(self.public_ips.values()):
+            if ip["privateIpId"] == private_ip_id and ip["lifecycleState"] == "ASSIGNED":
+                return ip
+        for instance in list(self.instances.values()):
+            if instance["private_ip_id"] == private_ip_id and instance["assign_public_ip"] and (
+                time.time() - instance["created"] >= self.scenario.get("public_ip_delay_seconds", 5)
+            ):
+                return {
+                    "id": f"ephemeral-{instance['id']}",
+                    "region": instance["region"],
+                    "compartmentId": instance["compartmentId"],
+                    "ipAddress": instance["public_ip"],
+                    "lifetime": "EPHEMERAL",
+                    "lifecycleState": "ASSIGNED",
+                    "privateIpId": private_ip_id,
+                    "scope": "AVAILABILITY_DOMAIN",
+                    "timeCreated": iso_time(instance["created"]),
+                }
+        raise ApiError(404, "NotAuthorizedOrNotFound", "No public IP for this private IP")
+
+    def update_public_ip(self, ip_id, body):
+        """Bind (or with privateIpId "" unbind) a reserved public IP"""
+        ip = self.get_public_ip(ip_id)
+        private_ip_id = body.get("privateIpId")
+        if private_ip_id:
+            try:
+                current = self.assigned_public_ip(private_ip_id)
+            except ApiError:
+                current = None
+            if current and current["id"] != ip_id:
+                raise ApiError(409, "Conflict", "The private IP already has a public IP assigned")
+        with self.lock:
+            ip["privateIpId"] = private_ip_id or None
+            ip["lifecycleState"] = "ASSIGNED" if private_ip_id else "AVAILABLE"
+            ip["displayName"] = body.get("displayName") or ip["displayName"]
+        return ip
+
+    def delete_public_ip(self, ip_id):
+        """Release an ephemeral IP (reserved IPs are deleted for good)"""
+        if ip_id.startswith("ephemeral-"):
+            self.get_instance(ip_id[len("ephemeral-"):])["assign_public_ip"] = False
+            return
+        self.get_public_ip(ip_id)
+        with self.lock:
+            del self.public_ips[ip_id]
+
+    def get_public_ip(self, ip_id):
+        ip = self.public_ips.get(ip_id)
+        if not ip:
+            raise ApiError(404, "NotAuthorizedOrNotFound", "Public IP not found")
+        return ip
+
+
+# ============================================================================
+# HTTP HANDLER
+# ============================================================================
+
+
+class FakeOciHandler(BaseHTTPRequestHandler):
+    """Routes OCI REST paths (optionally prefixed with /<region>) to FakeCloud"""
+
+    protocol_version = "HTTP/1.1"
+    cloud = None  # Set by make_server()
+    quiet = True
+
+    ROUTES = [
+        ("POST", r"/instances/?", "launch_instance"),
+        ("GET", r"/instances/?", "list_instances"),
+        ("GET", r"/instances/(?P<id>[^/]+)", "get_instance"),
+        ("PUT", r"/instances/(?P<id>[^/]+)", "update_instance"),
+        ("DELETE", r"/instances/(?P<id>[^/]+)", "terminate_instance"),
+        ("GET", r"/vnicAttachments/?", "list_vnic_attachments"),
+        ("GET", r"/vnics/(?P<id>[^/]+)", "get_vnic"),
+        ("GET", r"/publicIps/?", "list_public_ips"),
+        ("POST", r"/publicIps/?", "create_public_ip"),
+        ("GET", r"/publicIps/(?P<id>[^/]+)", "get_public_ip"),
+        ("PUT", r"/publicIps/(?P<id>[^/]+)", "update_public_ip"),
+        ("DELETE", r"/publicIps/(?P<id>[^/]+)", "delete_public_ip"),
+        ("POST", r"/publicIps/actions/getByPrivateIpId", "get_public_ip_by_private_ip_id"),
+        ("GET", r"/privateIps/?", "list_private_ips"),
+        ("GET", r"/availabilityDomains/?", "list_availability_domains"),
+        ("GET", r"/workRequests/(?P<id>[^/]+)", "get_work_request"),
+        ("POST", r"/computeCapacityReports/?", "create_compute_capacity_report"),
+    ]
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # ---------------------------------------------------------------- plumbing
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return {}
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("opc-request-id", uuid.uuid4().hex.upper())
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _split_path(self):
+        """Return (region, api path, query) for /<region>/20160918/... or /20160918/..."""
+        parsed = urlparse(self.path)
+        match = re.match(rf"^(?:/(?P<region>[a-z0-9-]+))?/{API_VERSION}(?P<path>/.*)$", parsed.path)
+        if not match:
+            return None, parsed.path, parse_qs(parsed.query)
+        region = match.group("region") or DEFAULT_REGION
+        return region, match.group("path"), parse_qs(parsed.query)
+
+    def _dispatch(self, method):
+        cloud = self.cloud
+        body = self._read_body() if method in ("POST", "PUT") else {}
+        region, path, query = self._split_path()
+
+        # Test hooks
+        if path == "/_fake/events" and method == "GET":
+            with cloud.lock:
+                return self._send(200, list(cloud.events))
+        if path == "/_fake/reset" and method == "POST":
+            cloud.reset()
+            return self._send(200, {"reset": True})
+        if path == "/_fake/webhook" and method == "POST":
+            with cloud.lock:
+                cloud.webhook_calls += 1
+                failed = cloud.webhook_calls <= cloud.scenario.get("webhook_fail_count", 0)
+            status = 500 if failed else 200
+            cloud.record("webhook", body.get("region"), status)
+            return self._send(status, {"received": not failed})
+
+        operation, params = None, {}
+        if region:
+            cloud.seed_region(region)
+            for route_method, pattern, name in self.ROUTES:
+                match = re.fullmatch(pattern, path)
+                if route_method == method and match:
+                    operation, params = name, match.groupdict()
+                    break
+        if not operation:
+            return self._send(404, {"code": "NotAuthorizedOrNotFound", "message": f"Unknown path {method} {path}"})
+
+        ad = body.get("availabilityDomain")
+
+        # Injected latency and network faults
+        latency = cloud.scenario.get("latency_ms") or {}
+        if latency.get("max"):
+            time.sleep(random.uniform(latency.get("min", 0), latency["max"]) / 1000)
+        faults = cloud.scenario.get("faults") or {}
+        if random.random() < faults.get("reset_probability", 0.0):
+            cloud.record(operation, region, "reset", ad)
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        if random.random() < faults.get("hang_probability", 0.0):
+            cloud.record(operation, region, "hang", ad)
+            time.sleep(faults.get("hang_seconds", 30))
+            self.close_connection = True
+            return
+
+        try:
+            cloud.check_throttle(region)
+            status, payload, headers = getattr(self, f"op_{operation}")(region, params, query, body)
+        except ApiError as e:
+            cloud.record(operation, region, e.status, ad)
+            return self._send(e.status, {"code": e.code, "message": e.message}, e.headers)
+
+        if random.random() < faults.get("lost_response_probability", 0.0):
+            cloud.record(operation, region, "lost", ad)
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        cloud.record(operation, region, status, ad)
+        self._send(status, payload, headers)
+
+    # ---------------------------------------------------------------- compute
+    def op_launch_instance(self, region, params, query, body):
+        instance = self.cloud.launch(region, body, self.headers.get("opc-retry-token"))
+        headers = {"opc-work-request-id": instance["work_request_id"], "etag": uuid.uuid4().hex}
+        return 200, self.cloud.instance_json(instance), headers
+
+    def op_list_instances(self, region, params, query, body):
+        compartment_id = query.get("compartmentId", [None])[0]
+        display_name = query.get("displayName", [None])[0]
+        items = [
+            self.cloud.instance_json(instance)
+            for instance in list(self.cloud.instances.values())
+            if instance["region"] == region
+            and (not compartment_id or instance["compartmentId"] == compartment_id)
+            and (not display_name or instance["displayName"] == display_name)
+        ]
+        return 200, items, None
+
+    def op_get_instance(self, region, params, query, body):
+        return 200, self.cloud.instance_json(self.cloud.get_instance(params["id"])), None
+
+    def op_update_instance(self, region, params, query, body):
+        instance = self.cloud.update_instance(params["id"], body)
+        return 200, self.cloud.instance_json(instance), {"etag": uuid.uuid4().hex}
+
+    def op_get_work_request(self, region, params, query, body):
+        return 200, self.cloud.work_request_json(params["id"]), None
+
+    def op_terminate_instance(self, region, params, query, body):
+        instance = self.cloud.get_instance(params["id"])
+        instance["terminated"] = instance["terminated"] or time.time()
+        return 204, None, None
+
+    def op_list_vnic_attachments(self, region, params, query, body):
+        instance_id = query.get("instanceId", [None])[0]
+        items = []
+        for instance in list(self.cloud.instances.values()):
+            if instance_id and instance["id"] != instance_id:
+                continue
+            if instance["region"] != region or not self.cloud.vnic_ready(instance):
+                continue
+            items.append(
+                {
+                    "id": fake_ocid("vnicattachment", region),
+                    "availabilityDomain": instance["availabilityDomain"],
+                    "compartmentId": instance["compartmentId"],
+                    "instanceId": instance["id"],
+                    "vnicId": instance["vnic_id"],
+                    "lifecycleState": "ATTACHED",
+                    "timeCreated": iso_time(instance["created"]),
+                }
+            )
+        return 200, items, None
+
+    def op_create_compute_capacity_report(self, region, params, query, body):
+        ad = body.get("availabilityDomain", "")
+        shapes = []
+        for shape in body.get("shapeAvailabilities") or []:
+            ocpus = (shape.get("instanceShapeConfig") or {}).get("ocpus")
+            available = self.cloud.has_capacity(ad, consume=False, ocpus=ocpus)
+            shapes.append(
+                {
+                    "instanceShape": shape.get("instanceShape"),
+                    "instanceShapeConfig": shape.get("instanceShapeConfig"),
+                    "availabilityStatus": "AVAILABLE" if available else "OUT_OF_HOST_CAPACITY",
+                    "availableCount": 1 if available else 0,
+                }
+            )
+        return 200, {
+            "compartmentId": body.get("compartmentId"),
+            "availabilityDomain": ad,
+            "shapeAvailabilities": shapes,
+            "timeCreated": iso_time(time.time()),
+        }, None
+
+    # ---------------------------------------------------------------- network
+    def op_get_vnic(self, region, params, query, body):
+        for instance in list(self.cloud.instances.values()):
+            if instance["vnic_id"] == params["id"]:
+                return 200, self.cloud.vnic_json(instance), None
+        raise ApiError(404, "NotAuthorizedOrNotFound", "VNIC not found")
+
+    def op_list_public_ips(self, region, params, query, body):
+        lifetime = query.get("lifetime", [None])[0]
+        items = [
+            ip for ip in list(self.cloud.public_ips.values())
+            if ip["region"] == region and (not lifetime or ip["lifetime"] == lifetime)
+        ]
+        return 200, items, None
+
+    def op_create_public_ip(self, region, params, query, body):
+        return 200, self.cloud.create_public_ip(region, body), None
+
+    def op_get_public_ip(self, region, params, query, body):
+        return 200, self.cloud.get_public_ip(params["id"]), None
+
+    def op_update_public_ip(self, region, params, query, body):
+        return 200, self.cloud.update_public_ip(params["id"], body), None
+
+    def op_delete_public_ip(self, region, params, query, body):
+        self.cloud.delete_public_ip(params["id"])
+        return 204, None, None
+
+    def op_get_public_ip_by_private_ip_id(self, region, params, query, body):
+        return 200, self.cloud.assigned_public_ip(body.get("privateIpId")), None
+
+    def op_list_private_ips(self, region, params, query, body):
+        vnic_id = query.get("vnicId", [None])[0]
+        items = [
+            {
+                "id": instance["private_ip_id"],
+                "vnicId": instance["vnic_id"],
+                "availabilityDomain": instance["availabilityDomain"],
+                "compartmentId": instance["compartmentId"],
+                "ipAddress": instance["private_ip"],
+                "isPrimary": True,
+                "timeCreated": iso_time(instance["created"]),
+            }
+            for instance in list(self.cloud.instances.values())
+            if instance["region"] == region
+            and self.cloud.vnic_ready(instance)
+            and (not vnic_id or instance["vnic_id"] == vnic_id)
+        ]
+        return 200, items, None
+
+    # ---------------------------------------------------------------- identity
+    def op_list_availability_domains(self, region, params, query, body):
+        compartment_id = query.get("compartmentId", [None])[0]
+        items = [
+            {"id": fake_ocid("availabilitydomain", region), "name": name, "compartmentId": compartment_id}
+            for name in self.cloud.ad_names(region)
+        ]
+        return 200, items, None
+
+
+class FakeSmtpHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP sink: accepts every message and records it as an event"""
+
+    cloud = None  # Set by make_smtp_server()
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("utf-8"))
+
+    def handle(self):
+        delay = self.cloud.scenario.get("smtp_delay_seconds", 0)
+        if delay:
+            time.sleep(delay)
+        self.reply("220 fake-smtp ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode("utf-8", "replace").strip()[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 fake-smtp")
+            elif verb in ("MAIL", "RCPT", "NOOP", "RSET"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data.rstrip(b"\r\n") == b".":
+                        break
+                self.cloud.record("smtp_message", None, 250)
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Minimal RESP server: the commands the sniper's RedisCoordinator sends"""
+
+    cloud = None  # Set by make_redis_server()
+    store = None  # key -> (value, expires at or None), shared by all connections
+    lock = None
+
+    def reply(self, value):
+        if value is None:
+            data = b"$-1\r\n"
+        elif isinstance(value, int):
+            data = f":{value}\r\n".encode()
+        elif isinstance(value, Exception):
+            data = f"-ERR {value}\r\n".encode()
+        elif value in ("OK", "PONG"):
+            data = f"+{value}\r\n".encode()
+        else:
+            encoded = value.encode("utf-8")
+            data = f"${len(encoded)}\r\n".encode() + encoded + b"\r\n"
+        self.wfile.write(data)
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode("utf-8", "replace").split()  # Inline command (telnet)
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode("utf-8"))
+        return args
+
+    def get(self, key):
+        value, expires = self.store.get(key, (None, None))
+        if expires is not None and time.monotonic() >= expires:
+            self.store.pop(key, None)
+            return None
+        return value
+
+    def execute(self, verb, args):
+        if verb == "PING":
+            return "PONG"
+        if verb in ("AUTH", "SELECT"):
+            return "OK"
+        if verb == "GET":
+            return self.get(args[0])
+        if verb == "SET":
+            key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+            expires = None
+            if "PX" in options:
+                expires = time.monotonic() + int(args[2 + options.index("PX") + 1]) / 1000
+            elif "EX" in options:
+                expires = time.monotonic() + int(args[2 + options.index("EX") + 1])
+            if "NX" in options and self.get(key) is not None:
+                return None
+            self.store[key] = (value, expires)
+            return "OK"
+        if verb == "DEL":
+            return sum(self.store.pop(key, None) is not None for key in args)
+        if verb == "EVAL":
+            # Only the sniper's lease scripts: compare-and-pexpire, compare-and-delete
+            script, key, token = args[0], args[2], args[3]
+            if self.get(key) != token:
+                return 0
+            if "pexpire" in script:
+                self.store[key] = (token, time.monotonic() + int(args[4]) / 1000)
+            else:
+                self.store.pop(key, None)
+            return 1
+        return ValueError(f"unknown command '{verb}'")
+
+    def handle(self):
+        while True:
+            try:
+                args = self.read_command()
+            except (OSError, ValueError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            verb = args[0].upper()
+            if verb == "QUIT":
+                self.reply("OK")
+                return
+            try:
+                with self.lock:
+                    result = self.execute(verb, args[1:])
+            except (IndexError, ValueError) as e:
+                result = ValueError(f"wrong arguments for '{verb}': {e}")
+            if verb in ("SET", "DEL", "EVAL"):
+                self.cloud.record(f"redis_{verb.lower()}", None, 200 if result not in (None, 0) else 409)
+            self.reply(result)
+
+
+def make_redis_server(cloud, host="127.0.0.1", port=6379):
+    """Redis stand-in for the launch coordination, sharing the event log of a fake OCI server"""
+    handler = type(
+        "RedisHandler", (FakeRedisHandler,), {"cloud": cloud, "store": {}, "lock": threading.Lock()}
+    )
+    server = socketserver.ThreadingTCPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def make_smtp_server(cloud, host="127.0.0.1", port=8025):
+    """SMTP sink sharing the event log of a fake OCI server"""
+    handler = type("SmtpHandler", (FakeSmtpHandler,), {"cloud": cloud})
+    server = socketserver.ThreadingTCPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def make_server(host="127.0.0.1", port=8080, scenario=None, quiet=True):
+    """Create a fake OCI server (call serve_forever() or run it in a thread)"""
+    cloud = FakeCloud(scenario or load_scenario())
+    handler = type("Handler", (FakeOciHandler,), {"cloud": cloud, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.cloud = cloud
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OCI endpoint for offline sniper testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--scenario", help="Scenario JSON file (capacity, throttling, latency, faults)")
+    parser.add_argument("--smtp-port", type=int, help="Also run an SMTP sink for email notifications")
+    parser.add_argument("--redis-port", type=int, help="Also run a Redis stand-in for the launch coordination")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, load_scenario(args.scenario), quiet=not args.verbose)
+    print(f"Fake OCI endpoint listening on http://{args.host}:{server.server_port}")
+    print(f"Use: OCI_ENDPOINT_OVERRIDE=http://{args.host}:{server.server_port}/{{region}}")
+    if args.smtp_port:
+        smtp_server = make_smtp_server(server.cloud, args.host, args.smtp_port)
+        threading.Thread(target=smtp_server.serve_forever, daemon=True).start()
+        print(f"SMTP sink listening on {args.host}:{args.smtp_port}")
+    if args.redis_port:
+        redis_server = make_redis_server(server.cloud, args.host, args.redis_port)
+        threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+        print(f"Redis stand-in listening on redis://{args.host}:{args.redis_port}/0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
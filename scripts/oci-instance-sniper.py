@@ -4,37 +4,40 @@ OCI Instance Sniper v1.4
 Automatically attempts to create an ARM instance in OCI when capacity becomes available.
 """
 
+import argparse
+import asyncio
+import atexit
 import json
 import logging
 import os
+import queue
 import re
 import smtplib
+import socket
+import sqlite3
 import subprocess
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import request as urllib_request
+from urllib.parse import unquote, urlparse
 
-# Auto-install dependencies if missing (UX improvement)
-try:
-    import oci
-    from tenacity import (
-        retry,
-        stop_after_attempt,
-        wait_exponential,
-        retry_if_exception_type,
-        before_sleep_log,
-    )
-    # Optional: python-dotenv for .env file support
-    try:
-        from dotenv import load_dotenv
-        load_dotenv()  # Load .env file if it exists
-    except ImportError:
-        pass  # python-dotenv not installed, skip .env loading
-except ImportError as e:
-    missing_module = str(e).split("'")[1]
+# The OCI SDK is imported on first use by load_sdk(), so "stats", "check" and
+# --help start without paying for it
+oci = None
+
+
+def install_dependencies(error):
+    """Auto-install dependencies if missing (UX improvement)"""
+    missing_module = getattr(error, "name", None) or str(error).split("'")[1]
     print(f"Missing dependency: {missing_module}")
     print("Installing required packages...")
     try:
@@ -57,13 +60,33 @@ except ImportError as e:
         print("Please run manually: pip install -r requirements.txt")
         sys.exit(1)
 
+
+def load_sdk():
+    """Import the OCI SDK (and tenacity) on first use
+
+    Only oci.core, oci.identity and oci.work_requests are used. OCI_PYTHON_SDK_NO_SERVICE_IMPORTS
+    keeps older SDK versions from importing all of their ~150 service packages.
+    """
+    global oci
+    if oci is None:
+        os.environ.setdefault("OCI_PYTHON_SDK_NO_SERVICE_IMPORTS", "1")
+        try:
+            import oci.core
+            import oci.identity
+            import oci.work_requests
+            import tenacity  # noqa: F401 - used by _launch_instance_with_retry()
+        except ImportError as e:
+            install_dependencies(e)
+    return oci
+
+
 # ============================================================================
 # LANGUAGE SELECTION
 # ============================================================================
 
 
-def load_config_file():
-    """Load configuration from config/sniper-config.json if it exists"""
+def config_file_path():
+    """Path of sniper-config.json"""
     # Check if config path is provided via environment variable (for multi-instance)
     config_file = os.getenv("SNIPER_CONFIG_PATH")
 
@@ -73,6 +96,16 @@ def load_config_file():
         script_dir = os.path.dirname(__file__)
         project_root = os.path.dirname(script_dir)
         config_file = os.path.join(project_root, "config", "sniper-config.json")
+    return config_file
+
+
+def load_config_file(strict=False):
+    """Load configuration from config/sniper-config.json if it exists
+
+    strict: raise on an unreadable file or invalid JSON instead of falling back
+    to the defaults (config reload keeps the running configuration then).
+    """
+    config_file = config_file_path()
 
     if os.path.exists(config_file):
         try:
@@ -80,6 +113,8 @@ def load_config_file():
                 config = json.load(f)
                 # Validate config values
                 if not isinstance(config, dict):
+                    if strict:
+                        raise ValueError("Config file is not a valid JSON object")
                     print(
                         "Warning: Config file is not a valid JSON object. Using defaults."
                     )
@@ -119,22 +154,347 @@ def load_config_file():
                             f"Warning: Invalid max attempts: {attempts}. Must be >= 1. Using default: 1440"
                         )
                         config["max_attempts"] = 1440
+                # Validate max workers (1-64 parallel launch calls)
+                if "max_workers" in config:
+                    workers = config["max_workers"]
+                    if not isinstance(workers, int) or workers < 1 or workers > 64:
+                        print(
+                            f"Warning: Invalid max workers: {workers}. Must be 1-64. Using default: 12"
+                        )
+                        config["max_workers"] = 12
+                # Validate engine ("threads" or "async")
+                if "engine" in config and config["engine"] not in ("threads", "async"):
+                    print(
+                        f"Warning: Invalid engine: {config['engine']}. Must be 'threads' or 'async'. Using default: threads"
+                    )
+                    config["engine"] = "threads"
+                # Validate max in-flight launch calls for the async engine (1-512)
+                if "max_in_flight" in config:
+                    in_flight = config["max_in_flight"]
+                    if not isinstance(in_flight, int) or in_flight < 1 or in_flight > 512:
+                        print(
+                            f"Warning: Invalid max in-flight: {in_flight}. Must be 1-512. Using default: 64"
+                        )
+                        config["max_in_flight"] = 64
+                # Validate account profiles (one OCI config profile / tenancy each)
+                if "profiles" in config:
+                    profiles = config["profiles"]
+                    names = [profile.get("name") for profile in profiles if isinstance(profile, dict)] if isinstance(profiles, list) else []
+                    if (
+                        not isinstance(profiles, list)
+                        or len(names) != len(profiles)
+                        or not all(isinstance(name, str) and name for name in names)
+                        or len(set(names)) != len(names)
+                    ):
+                        print("Warning: Invalid profiles. Must be a list of objects with a unique \"name\". Ignored.")
+                        config["profiles"] = []
+                    for profile in config["profiles"]:
+                        regions = profile.get("regions")
+                        if regions is not None and not (
+                            (isinstance(regions, list) and all(isinstance(region, str) for region in regions))
+                            or (isinstance(regions, dict) and all(isinstance(entry, dict) for entry in regions.values()))
+                        ):
+                            print(
+                                f"Warning: Invalid regions of profile {profile['name']}. Must be a list of region "
+                                "identifiers or an object like regions.json. Using all regions."
+                            )
+                            profile["regions"] = None
+                        share = profile.get("share", 1)
+                        if isinstance(share, bool) or not isinstance(share, (int, float)) or share <= 0:
+                            print(f"Warning: Invalid share of profile {profile['name']}: {share}. Must be > 0. Using default: 1")
+                            profile["share"] = 1
+                # Validate checkpoint settings
+                if "checkpoint" in config:
+                    checkpoint = config["checkpoint"]
+                    if not isinstance(checkpoint, dict):
+                        print("Warning: Invalid checkpoint section. Must be an object. Using defaults.")
+                        config["checkpoint"] = {}
+                    else:
+                        if "enabled" in checkpoint and not isinstance(checkpoint["enabled"], bool):
+                            print(
+                                f"Warning: Invalid checkpoint.enabled: {checkpoint['enabled']}. "
+                                "Must be true/false. Using default: true"
+                            )
+                            checkpoint["enabled"] = True
+                        interval = checkpoint.get("interval_seconds", 30)
+                        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+                            print(
+                                f"Warning: Invalid checkpoint.interval_seconds: {interval}. Must be > 0. Using default: 30"
+                            )
+                            checkpoint["interval_seconds"] = 30
+                # Validate launch coordination between sniper processes/hosts
+                if "coordination" in config:
+                    coordination = config["coordination"]
+                    if not isinstance(coordination, dict):
+                        print("Warning: Invalid coordination section. Must be an object. Coordination disabled.")
+                        config["coordination"] = {}
+                    else:
+                        if coordination.get("backend", "none") not in ("none", "file", "sqlite", "redis"):
+                            # Asked for coordination: fall back to the local one instead of none
+                            print(
+                                f"Warning: Invalid coordination backend: {coordination['backend']}. "
+                                "Must be 'none', 'file', 'sqlite' or 'redis'. Using: file"
+                            )
+                            coordination["backend"] = "file"
+                        for key, default, low in (("lease_seconds", 30, 5), ("wait_seconds", 5, 0), ("poll_seconds", 1, 0.1)):
+                            value = coordination.get(key, default)
+                            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < low:
+                                print(
+                                    f"Warning: Invalid coordination.{key}: {value}. Must be >= {low}. Using default: {default}"
+                                )
+                                coordination[key] = default
+                # Validate duplicate-instance reconciliation
+                if "reconcile" in config:
+                    reconcile = config["reconcile"]
+                    if not isinstance(reconcile, dict):
+                        print("Warning: Invalid reconcile section. Must be an object. Using defaults.")
+                        config["reconcile"] = {}
+                    else:
+                        if "enabled" in reconcile and not isinstance(reconcile["enabled"], bool):
+                            print(
+                                f"Warning: Invalid reconcile.enabled: {reconcile['enabled']}. "
+                                "Must be true/false. Using default: true"
+                            )
+                            reconcile["enabled"] = True
+                        if reconcile.get("policy", "own") not in ("own", "all", "report"):
+                            print(
+                                f"Warning: Invalid reconcile policy: {reconcile['policy']}. "
+                                "Must be 'own', 'all' or 'report'. Using default: own"
+                            )
+                            reconcile["policy"] = "own"
+                        settle = reconcile.get("settle_seconds", 120)
+                        if isinstance(settle, bool) or not isinstance(settle, (int, float)) or settle < 0:
+                            print(
+                                f"Warning: Invalid reconcile.settle_seconds: {settle}. Must be >= 0. Using default: 120"
+                            )
+                            reconcile["settle_seconds"] = 120
+                # Validate config reload interval
+                if "config_reload_seconds" in config and (
+                    isinstance(config["config_reload_seconds"], bool)
+                    or not isinstance(config["config_reload_seconds"], (int, float))
+                    or config["config_reload_seconds"] < 0
+                ):
+                    print(
+                        f"Warning: Invalid config_reload_seconds: {config['config_reload_seconds']}. "
+                        "Must be >= 0. Using default: 5"
+                    )
+                    config["config_reload_seconds"] = 5
+                # Validate capacity probe flag
+                if "capacity_probe" in config and not isinstance(config["capacity_probe"], bool):
+                    print(
+                        f"Warning: Invalid capacity_probe: {config['capacity_probe']}. Must be true/false. Using default: true"
+                    )
+                    config["capacity_probe"] = True
+                # Validate attempt history flag
+                if "history_enabled" in config and not isinstance(config["history_enabled"], bool):
+                    print(
+                        f"Warning: Invalid history_enabled: {config['history_enabled']}. Must be true/false. Using default: true"
+                    )
+                    config["history_enabled"] = True
+                # Validate scheduler ("fixed", "adaptive" or "hedged")
+                if "scheduler" in config and config["scheduler"] not in ("fixed", "adaptive", "hedged"):
+                    print(
+                        f"Warning: Invalid scheduler: {config['scheduler']}. "
+                        "Must be 'fixed', 'adaptive' or 'hedged'. Using default: fixed"
+                    )
+                    config["scheduler"] = "fixed"
+                # Validate hedged scheduler settings
+                if "hedging" in config:
+                    hedging = config["hedging"]
+                    if not isinstance(hedging, dict):
+                        print("Warning: Invalid hedging section. Must be an object. Using defaults.")
+                        config["hedging"] = {}
+                    else:
+                        weights = hedging.get("ad_weights", {})
+                        if not isinstance(weights, dict):
+                            print("Warning: Invalid hedging.ad_weights. Must be an object. Using default: {}")
+                            hedging["ad_weights"] = {}
+                        else:
+                            for ad, weight in list(weights.items()):
+                                if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+                                    print(f"Warning: Invalid hedging.ad_weights.{ad}: {weight}. Must be > 0. Using: 1")
+                                    weights[ad] = 1
+                        hedge_after = hedging.get("hedge_after_seconds", 10)
+                        if isinstance(hedge_after, bool) or not isinstance(hedge_after, (int, float)) or hedge_after < 0:
+                            print(
+                                f"Warning: Invalid hedging.hedge_after_seconds: {hedge_after}. "
+                                "Must be >= 0. Using default: 10"
+                            )
+                            hedging["hedge_after_seconds"] = 10
+                # Validate global request budget (1-600 launch attempts per minute)
+                if "request_budget_per_minute" in config:
+                    budget = config["request_budget_per_minute"]
+                    if not isinstance(budget, (int, float)) or budget < 1 or budget > 600:
+                        print(
+                            f"Warning: Invalid request budget: {budget}. Must be 1-600 per minute. Using default: 20"
+                        )
+                        config["request_budget_per_minute"] = 20
+                # Validate shape ladder (best configuration first)
+                if "shape_ladder" in config:
+                    ladder = config["shape_ladder"]
+                    if not isinstance(ladder, list) or not ladder:
+                        error = "empty"
+                    else:
+                        default_shape = config.get("shape", "VM.Standard.A1.Flex")
+                        error = next(filter(None, (rung_error(rung, default_shape) for rung in ladder)), None)
+                    if error:
+                        print(
+                            f"Warning: Invalid shape_ladder ({error}). "
+                            "Must be a list of {\"shape\", \"ocpus\", \"memory_in_gbs\"}. Using ocpus/memory_in_gbs"
+                        )
+                        del config["shape_ladder"]
+                if "shape_ladder_mode" in config and config["shape_ladder_mode"] not in ("priority", "concurrent"):
+                    print(
+                        f"Warning: Invalid shape_ladder_mode: {config['shape_ladder_mode']}. "
+                        "Must be 'priority' or 'concurrent'. Using default: priority"
+                    )
+                    config["shape_ladder_mode"] = "priority"
+                if "resize_up" in config and not isinstance(config["resize_up"], dict):
+                    print("Warning: Invalid resize_up section. Must be an object. Resize disabled.")
+                    config["resize_up"] = {}
+                # Validate API rate limit per tenancy/region
+                if "rate_limit_per_second" in config:
+                    rate = config["rate_limit_per_second"]
+                    if not isinstance(rate, (int, float)) or rate < 0.1 or rate > 100:
+                        print(
+                            f"Warning: Invalid rate_limit_per_second: {rate}. Must be 0.1-100. Using default: 5"
+                        )
+                        config["rate_limit_per_second"] = 5
+                if "rate_limit_burst" in config:
+                    burst = config["rate_limit_burst"]
+                    if not isinstance(burst, int) or burst < 1 or burst > 100:
+                        print(f"Warning: Invalid rate_limit_burst: {burst}. Must be 1-100. Using default: 10")
+                        config["rate_limit_burst"] = 10
+                # Validate metrics endpoint settings
+                if "metrics" in config:
+                    metrics = config["metrics"]
+                    if not isinstance(metrics, dict):
+                        print("Warning: Invalid metrics section. Must be an object. Metrics disabled.")
+                        config["metrics"] = {}
+                    elif "port" in metrics and (
+                        not isinstance(metrics["port"], int) or not 1 <= metrics["port"] <= 65535
+                    ):
+                        print(
+                            f"Warning: Invalid metrics port: {metrics['port']}. Must be 1-65535. Using default: 9464"
+                        )
+                        metrics["port"] = 9464
+                # Validate control API of daemon mode
+                if "control" in config:
+                    control = config["control"]
+                    if not isinstance(control, dict):
+                        print("Warning: Invalid control section. Must be an object. Using defaults.")
+                        config["control"] = {}
+                    elif "port" in control and (
+                        not isinstance(control["port"], int) or not 1 <= control["port"] <= 65535
+                    ):
+                        print(
+                            f"Warning: Invalid control port: {control['port']}. Must be 1-65535. Using default: 9465"
+                        )
+                        control["port"] = 9465
+                # Validate log pipeline settings
+                if "logging" in config:
+                    log_config = config["logging"]
+                    if not isinstance(log_config, dict):
+                        print("Warning: Invalid logging section. Must be an object. Using defaults.")
+                        config["logging"] = {}
+                    else:
+                        if log_config.get("format", "text") not in ("text", "json"):
+                            print(
+                                f"Warning: Invalid logging format: {log_config['format']}. "
+                                "Must be 'text' or 'json'. Using default: text"
+                            )
+                            log_config["format"] = "text"
+                        if "coalesce_seconds" in log_config and (
+                            not isinstance(log_config["coalesce_seconds"], (int, float))
+                            or log_config["coalesce_seconds"] < 0
+                        ):
+                            print(
+                                f"Warning: Invalid logging coalesce_seconds: {log_config['coalesce_seconds']}. "
+                                "Must be >= 0. Using default: 600"
+                            )
+                            log_config["coalesce_seconds"] = 600
+                # Validate notification channels
+                if "notifications" in config:
+                    notifications = config["notifications"]
+                    if not isinstance(notifications, dict):
+                        print("Warning: Invalid notifications section. Must be an object. Webhooks/commands disabled.")
+                        config["notifications"] = {}
+                    else:
+                        webhooks = notifications.get("webhooks", [])
+                        if not isinstance(webhooks, list) or not all(
+                            isinstance(webhook, dict) and webhook.get("url") for webhook in webhooks
+                        ):
+                            print("Warning: Invalid notifications.webhooks. Must be a list of {\"url\": ...}. Ignored.")
+                            notifications["webhooks"] = []
+                        commands = notifications.get("commands", [])
+                        if not isinstance(commands, list) or not all(
+                            isinstance(command, dict) and command.get("command") for command in commands
+                        ):
+                            print("Warning: Invalid notifications.commands. Must be a list of {\"command\": ...}. Ignored.")
+                            notifications["commands"] = []
                 return config
         except json.JSONDecodeError as e:
+            if strict:
+                raise
             print(f"Error: Config file is corrupted (invalid JSON): {e}")
             print("Using default configuration. Please check config/sniper-config.json")
             return {}
         except Exception as e:
+            if strict:
+                raise
             print(f"Warning: Could not load config file: {e}")
             return {}
     return {}
 
 
-# Load config file (will override hardcoded values below if present)
-CONFIG_FILE = load_config_file()
+def regions_file_path():
+    """Path of regions.json"""
+    # Check if regions path is provided via environment variable
+    regions_file = os.getenv("SNIPER_REGIONS_PATH")
+
+    # If not provided, use default location next to sniper-config.json
+    if not regions_file:
+        script_dir = os.path.dirname(__file__)
+        project_root = os.path.dirname(script_dir)
+        regions_file = os.path.join(project_root, "config", "regions.json")
+    return regions_file
+
+
+def load_regions_file(strict=False):
+    """Load region-specific OCIDs from config/regions.json if it exists"""
+    regions_file = regions_file_path()
+
+    if os.path.exists(regions_file):
+        try:
+            with open(regions_file, "r", encoding="utf-8") as f:
+                regions = json.load(f)
+                if not isinstance(regions, dict):
+                    if strict:
+                        raise ValueError("Regions file is not a valid JSON object")
+                    print(
+                        "Warning: Regions file is not a valid JSON object. Ignoring it."
+                    )
+                    return {}
+                return regions
+        except json.JSONDecodeError as e:
+            if strict:
+                raise
+            print(f"Error: Regions file is corrupted (invalid JSON): {e}")
+            print("Ignoring regions. Please check config/regions.json")
+            return {}
+        except Exception as e:
+            if strict:
+                raise
+            print(f"Warning: Could not load regions file: {e}")
+            return {}
+    return {}
+
 
-# Language will be set by select_language() or from config
-LANGUAGE = CONFIG_FILE.get("language", None)
+# Filled by init_runtime() - importing the script reads no files
+CONFIG_FILE = {}
+REGIONS_FILE = {}  # One entry per region, only entries with a subnet are used
+PAYLOAD_CACHE = {}  # Sanitized request bodies, see get_payload()
+PAYLOAD_SETTINGS = None  # Settings the cached bodies were built from
 
 # ============================================================================
 # CONFIGURATION - CUSTOMIZE THESE VALUES
@@ -143,19 +503,7 @@ LANGUAGE = CONFIG_FILE.get("language", None)
 # OCI Configuration (will be loaded from ~/.oci/config)
 CONFIG_PROFILE = "DEFAULT"
 
-# Instance Configuration (can be overridden via .env file)
-COMPARTMENT_ID = os.getenv("OCI_COMPARTMENT_ID", "ocid1.tenancy.oc1..aaaaaaaax6rpppokzujbk3fmq2p5kfrhnocam4qj2clhoypvjnpy42szgbmq")
 AVAILABILITY_DOMAINS = ["AD-1", "AD-2", "AD-3"]  # Try all ADs
-SHAPE = "VM.Standard.A1.Flex"
-OCPUS = CONFIG_FILE.get("ocpus", 2)
-MEMORY_IN_GBS = CONFIG_FILE.get("memory_in_gbs", 12)
-BOOT_VOLUME_SIZE_IN_GBS = CONFIG_FILE.get("boot_volume_size_in_gbs", 50)  # Default 50 GB, Free Tier max 200 GB
-
-# Image Configuration (Ubuntu 24.04, can be overridden via .env file)
-IMAGE_ID = os.getenv("OCI_IMAGE_ID", "ocid1.image.oc1.eu-frankfurt-1.aaaaaaaakzxxzn5xxewosaxvv5xcptfuvobpg46cgxolvtqox54bzwzdkima")
-
-# Networking Configuration (can be overridden via .env file)
-SUBNET_ID = os.getenv("OCI_SUBNET_ID", "ocid1.subnet.oc1.eu-frankfurt-1.aaaaaaaad5iiapdcmmqknjkrcrpjortcmohf3b3fxsvbayovkkrpinidg3tq")
 ASSIGN_PUBLIC_IP = True
 
 # Reserved IP Configuration (NEW in v1.2)
@@ -165,6 +513,220 @@ ASSIGN_PUBLIC_IP = True
 RESERVED_PUBLIC_IP = None  # Will be set during runtime
 
 
+def rung_error(entry, default_shape):
+    """Why a shape ladder entry (config file or control API) is invalid, None if it is fine
+
+    Rungs of the Free Tier A1 shape get the limits of ocpus/memory_in_gbs.
+    """
+    if not isinstance(entry, dict):
+        return "a rung must be an object"
+    if "shape" in entry and (not isinstance(entry["shape"], str) or not entry["shape"]):
+        return "'shape' must be a shape name"
+    for key in ("ocpus", "memory_in_gbs"):
+        value = entry.get(key, 1)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            return f"'{key}' must be a positive number, not {value!r}"
+    if not (entry.get("shape") or entry.get("ocpus")):
+        return "a rung needs a 'shape' or 'ocpus'"
+    if entry.get("shape", default_shape) == "VM.Standard.A1.Flex":
+        if not 1 <= entry.get("ocpus", 1) <= 4:
+            return f"'ocpus' must be 1-4 on VM.Standard.A1.Flex, not {entry['ocpus']}"
+        if not 1 <= entry.get("memory_in_gbs", 1) <= 24:
+            return f"'memory_in_gbs' must be 1-24 GB on VM.Standard.A1.Flex, not {entry['memory_in_gbs']}"
+    return None
+
+
+def make_rung(entry):
+    """Shape ladder rung from a config entry ({"shape"?, "ocpus"?, "memory_in_gbs"?})
+
+    Flex shapes without sizes take ocpus/memory_in_gbs; fixed shapes have none.
+    """
+    shape = entry.get("shape", SHAPE)
+    flex = shape.endswith(".Flex")
+    return {
+        "shape": shape,
+        "ocpus": entry.get("ocpus", OCPUS if flex else None),
+        "memory_in_gbs": entry.get("memory_in_gbs", MEMORY_IN_GBS if flex else None),
+    }
+
+
+def apply_config(config):
+    """Derive all settings from a sniper-config.json dict and the environment
+
+    Config values override the hardcoded defaults below; .env values (loaded
+    by init_runtime()) override the OCIDs and email credentials.
+    """
+    global CONFIG_FILE, LANGUAGE, ENDPOINT_OVERRIDE, COMPARTMENT_ID, SHAPE, OCPUS, MEMORY_IN_GBS
+    global SHAPE_LADDER, SHAPE_LADDER_MODE, RESIZE_UP_ENABLED, RESIZE_UP_ATTEMPTS
+    global BOOT_VOLUME_SIZE_IN_GBS, IMAGE_ID, SUBNET_ID, MAX_WORKERS, CAPACITY_PROBE, ENGINE
+    global MAX_IN_FLIGHT, RETRY_DELAY_SECONDS, MAX_ATTEMPTS, SCHEDULER, REQUEST_BUDGET_PER_MINUTE
+    global AD_WEIGHTS, HEDGE_AFTER_SECONDS
+    global RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, INSTANCE_NAME, HISTORY_ENABLED, HISTORY_DB
+    global LOG_CONFIG, LOG_FORMAT, LOG_COALESCE_SECONDS
+    global METRICS_CONFIG, METRICS_ENABLED, METRICS_HOST, METRICS_PORT
+    global CONTROL_HOST, CONTROL_PORT, CONTROL_TOKEN
+    global EMAIL_CONFIG, EMAIL_NOTIFICATIONS_ENABLED, SMTP_SERVER, SMTP_PORT, SMTP_STARTTLS, EMAIL_FROM, EMAIL_TO, EMAIL_PASSWORD
+    global NOTIFY_WEBHOOKS, NOTIFY_COMMANDS, NOTIFY_QUEUE_SIZE, NOTIFY_WORKERS, NOTIFY_RETRIES, NOTIFY_TIMEOUT
+    global NOTIFY_FLUSH_SECONDS, CONFIG_RELOAD_SECONDS, PAYLOAD_CACHE, PAYLOAD_SETTINGS, PROFILES
+    global CHECKPOINT_ENABLED, CHECKPOINT_PATH, CHECKPOINT_SECONDS
+    global COORDINATION_BACKEND, COORDINATION_PATH, COORDINATION_URL, COORDINATION_KEY
+    global COORDINATION_LEASE_SECONDS, COORDINATION_WAIT_SECONDS, COORDINATION_POLL_SECONDS
+    global RECONCILE_ENABLED, RECONCILE_POLICY, RECONCILE_SETTLE_SECONDS
+
+    CONFIG_FILE = config
+
+    # Language will be set by select_language() or from config
+    LANGUAGE = config.get("language", None)
+
+    # Endpoint override for offline testing against scripts/fake-oci-server.py
+    # ({region} is replaced with the region identifier, e.g. http://127.0.0.1:8080/{region})
+    ENDPOINT_OVERRIDE = os.getenv("OCI_ENDPOINT_OVERRIDE", config.get("endpoint_override", ""))
+
+    # Instance Configuration (can be overridden via .env file)
+    COMPARTMENT_ID = os.getenv("OCI_COMPARTMENT_ID", "ocid1.tenancy.oc1..aaaaaaaax6rpppokzujbk3fmq2p5kfrhnocam4qj2clhoypvjnpy42szgbmq")
+    SHAPE = config.get("shape", "VM.Standard.A1.Flex")
+    OCPUS = config.get("ocpus", 2)
+    MEMORY_IN_GBS = config.get("memory_in_gbs", 12)
+
+    # Shape ladder: fallback configurations, best first (default: just SHAPE/OCPUS/MEMORY_IN_GBS)
+    SHAPE_LADDER = [
+        make_rung(rung) for rung in config.get("shape_ladder", [{"ocpus": OCPUS, "memory_in_gbs": MEMORY_IN_GBS}])
+    ]
+    SHAPE_LADDER_MODE = config.get("shape_ladder_mode", "priority")  # "priority" or "concurrent"
+    # Grow a smaller launched configuration to the best rung later (update_instance, reboots the instance)
+    RESIZE_UP_ENABLED = config.get("resize_up", {}).get("enabled", False)
+    RESIZE_UP_ATTEMPTS = config.get("resize_up", {}).get("attempts", 30)
+    BOOT_VOLUME_SIZE_IN_GBS = config.get("boot_volume_size_in_gbs", 50)  # Default 50 GB, Free Tier max 200 GB
+
+    # Image Configuration (Ubuntu 24.04, can be overridden via .env file)
+    IMAGE_ID = os.getenv("OCI_IMAGE_ID", "ocid1.image.oc1.eu-frankfurt-1.aaaaaaaakzxxzn5xxewosaxvv5xcptfuvobpg46cgxolvtqox54bzwzdkima")
+
+    # Networking Configuration (can be overridden via .env file)
+    SUBNET_ID = os.getenv("OCI_SUBNET_ID", "ocid1.subnet.oc1.eu-frankfurt-1.aaaaaaaad5iiapdcmmqknjkrcrpjortcmohf3b3fxsvbayovkkrpinidg3tq")
+
+    # Account profiles: one process snipes for several OCI config profiles (tenancies),
+    # each with its own compartment, regions, share of the request budget and rate limit
+    PROFILES = [
+        {
+            "name": profile["name"],
+            "oci_profile": profile.get("oci_profile", profile["name"]),
+            "compartment_id": profile.get("compartment_id", ""),
+            "regions": profile.get("regions"),  # Region ids or regions.json-style entries, None = all
+            "share": profile.get("share", 1),
+            "rate_limit_per_second": profile.get("rate_limit_per_second"),
+            "rate_limit_burst": profile.get("rate_limit_burst"),
+        }
+        for profile in config.get("profiles", [])
+    ]
+
+    # Retry Configuration
+    MAX_WORKERS = config.get("max_workers", 12)  # Parallel launch calls across all regions/ADs
+    CONFIG_RELOAD_SECONDS = config.get("config_reload_seconds", 5)  # Watch the config files, 0 = off
+    CAPACITY_PROBE = config.get("capacity_probe", True)  # Ask the capacity report API before launching
+    ENGINE = config.get("engine", "threads")  # "threads" or "async"
+    MAX_IN_FLIGHT = config.get("max_in_flight", 64)  # Global concurrency limit of the async engine
+    RETRY_DELAY_SECONDS = config.get(
+        "retry_delay_seconds", 60
+    )  # Wait 60 seconds between attempts
+    MAX_ATTEMPTS = config.get(
+        "max_attempts", 1440
+    )  # Try for 24 hours (1440 * 60 seconds)
+    SCHEDULER = config.get("scheduler", "fixed")  # "fixed" (10s/30s/60s ladder), "adaptive" or "hedged"
+    REQUEST_BUDGET_PER_MINUTE = config.get("request_budget_per_minute", 20)  # Adaptive: all targets together
+    # Hedged: ADs of a region take turns within the retry delay instead of firing at once
+    HEDGING_CONFIG = config.get("hedging", {})
+    AD_WEIGHTS = HEDGING_CONFIG.get("ad_weights", {})  # AD name suffix ("AD-2") -> share of the requests
+    HEDGE_AFTER_SECONDS = HEDGING_CONFIG.get("hedge_after_seconds", 10)  # Slow call: next AD right away, 0 = off
+    RATE_LIMIT_PER_SECOND = config.get("rate_limit_per_second", 5)  # API calls per tenancy/region
+    RATE_LIMIT_BURST = config.get("rate_limit_burst", 10)
+
+    # Instance Name
+    INSTANCE_NAME = config.get("instance_name", "oci-instance")
+
+    # Attempt history (SQLite) for the stats command
+    HISTORY_ENABLED = config.get("history_enabled", True)
+    HISTORY_DB = config.get("history_db") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "oci-sniper-history.db"
+    )
+
+    # Crash-resumable engine state (attempt counts, due times, AD names, reserved IP, launched instances).
+    # Default path: per region selection, so per-region processes (start.ps1) don't share a file.
+    CHECKPOINT_CONFIG = config.get("checkpoint", {})
+    CHECKPOINT_ENABLED = CHECKPOINT_CONFIG.get("enabled", True)
+    CHECKPOINT_PATH = CHECKPOINT_CONFIG.get("path", "")
+    CHECKPOINT_SECONDS = CHECKPOINT_CONFIG.get("interval_seconds", 30)
+
+    # Exactly-once launches across sniper processes and hosts (e.g. one process per region):
+    # snipers with the same key launch one instance between them, then all of them stop
+    COORDINATION_CONFIG = config.get("coordination", {})
+    COORDINATION_BACKEND = COORDINATION_CONFIG.get("backend", "none")  # "none", "file", "sqlite" or "redis"
+    COORDINATION_PATH = COORDINATION_CONFIG.get("path", "")  # file: directory, sqlite: database file
+    COORDINATION_URL = os.getenv("SNIPER_COORDINATION_URL", COORDINATION_CONFIG.get("url", "redis://127.0.0.1:6379/0"))
+    COORDINATION_KEY = COORDINATION_CONFIG.get("key") or INSTANCE_NAME
+    COORDINATION_LEASE_SECONDS = COORDINATION_CONFIG.get("lease_seconds", 30)  # Expiry of a dead holder's lease
+    COORDINATION_WAIT_SECONDS = COORDINATION_CONFIG.get("wait_seconds", 5)  # Wait for a lease held by another launch
+    COORDINATION_POLL_SECONDS = COORDINATION_CONFIG.get("poll_seconds", 1)  # Check for wins of other snipers
+
+    # Duplicates of a win (launches already in flight, uncoordinated snipers): after the success path,
+    # "own" terminates surplus instances this process launched, "all" every surplus one, "report" none
+    RECONCILE_CONFIG = config.get("reconcile", {})
+    RECONCILE_ENABLED = RECONCILE_CONFIG.get("enabled", True)
+    RECONCILE_POLICY = RECONCILE_CONFIG.get("policy", "own")
+    RECONCILE_SETTLE_SECONDS = RECONCILE_CONFIG.get("settle_seconds", 120)  # Max. wait for launches in flight
+
+    # Log pipeline: file format ("text" or "json") and coalescing of repeated attempt outcomes
+    LOG_CONFIG = config.get("logging", {})
+    LOG_FORMAT = LOG_CONFIG.get("format", "text")
+    LOG_COALESCE_SECONDS = LOG_CONFIG.get("coalesce_seconds", 600)  # 0 = log every repeat
+
+    # Metrics endpoint (Prometheus text format), off by default
+    METRICS_CONFIG = config.get("metrics", {})
+    METRICS_ENABLED = METRICS_CONFIG.get("enabled", False)
+    METRICS_HOST = METRICS_CONFIG.get("host", "127.0.0.1")
+    METRICS_PORT = METRICS_CONFIG.get("port", 9464)
+
+    # Control API of daemon mode (--daemon), localhost only by default
+    CONTROL_CONFIG = config.get("control", {})
+    CONTROL_HOST = CONTROL_CONFIG.get("host", "127.0.0.1")
+    CONTROL_PORT = CONTROL_CONFIG.get("port", 9465)
+    CONTROL_TOKEN = os.getenv("SNIPER_CONTROL_TOKEN", CONTROL_CONFIG.get("token", ""))
+
+    # Email notifications (from .env or config/sniper-config.json)
+    EMAIL_CONFIG = config.get("email", {})
+    EMAIL_NOTIFICATIONS_ENABLED = EMAIL_CONFIG.get("enabled", False)
+    SMTP_SERVER = EMAIL_CONFIG.get("smtp_server", "smtp.gmail.com")
+    SMTP_PORT = EMAIL_CONFIG.get("smtp_port", 587)
+    SMTP_STARTTLS = EMAIL_CONFIG.get("starttls", True)
+    # Priority: .env > config file (for security - passwords should be in .env)
+    EMAIL_FROM = os.getenv("EMAIL_FROM", EMAIL_CONFIG.get("from", ""))
+    EMAIL_TO = os.getenv("EMAIL_TO", EMAIL_CONFIG.get("to", ""))
+    EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", EMAIL_CONFIG.get("password", ""))
+
+    # Notification dispatcher: webhooks, local commands, queue and retry settings
+    NOTIFY_CONFIG = config.get("notifications", {})
+    NOTIFY_WEBHOOKS = NOTIFY_CONFIG.get("webhooks", [])
+    NOTIFY_COMMANDS = NOTIFY_CONFIG.get("commands", [])
+    NOTIFY_QUEUE_SIZE = NOTIFY_CONFIG.get("queue_size", 100)
+    NOTIFY_WORKERS = NOTIFY_CONFIG.get("workers", 2)
+    NOTIFY_RETRIES = NOTIFY_CONFIG.get("retries", 3)
+    NOTIFY_TIMEOUT = NOTIFY_CONFIG.get("timeout", 10)  # Seconds per delivery attempt and channel
+    NOTIFY_FLUSH_SECONDS = NOTIFY_CONFIG.get("flush_seconds", 30)  # Grace period for pending ones at exit
+
+    # Request bodies are built from these settings: start a new cache when they change.
+    # Rebinding (not clearing) keeps bodies built from a half-applied config out of it.
+    settings = (INSTANCE_NAME, BOOT_VOLUME_SIZE_IN_GBS, COMPARTMENT_ID, IMAGE_ID, SUBNET_ID)
+    if settings != PAYLOAD_SETTINGS:
+        PAYLOAD_CACHE, PAYLOAD_SETTINGS = {}, settings
+
+
+# Defaults until init_runtime() applies the config file
+apply_config({})
+
+HISTORY = None  # Opened in main()
+NOTIFIER = None  # Started in main() on success
+COORDINATOR = None  # Opened in main() unless the coordination backend is "none"
+
+
 # ============================================================================
 # SSH KEY AUTO-LOADING
 # ============================================================================
@@ -202,31 +764,9 @@ def load_ssh_key():
     return "your_ssh_public_key_here"
 
 
-# SSH Key (auto-loaded from ~/.ssh/*.pub or environment variable)
-SSH_PUBLIC_KEY = load_ssh_key()
-
-# Retry Configuration
-RETRY_DELAY_SECONDS = CONFIG_FILE.get(
-    "retry_delay_seconds", 60
-)  # Wait 60 seconds between attempts
-MAX_ATTEMPTS = CONFIG_FILE.get(
-    "max_attempts", 1440
-)  # Try for 24 hours (1440 * 60 seconds)
+# SSH Key (auto-loaded from ~/.ssh/*.pub or environment variable by init_runtime())
+SSH_PUBLIC_KEY = "your_ssh_public_key_here"
 
-# Instance Name
-INSTANCE_NAME = CONFIG_FILE.get("instance_name", "oci-instance")
-
-# ============================================================================
-# EMAIL NOTIFICATIONS (from .env or config/sniper-config.json)
-# ============================================================================
-EMAIL_CONFIG = CONFIG_FILE.get("email", {})
-EMAIL_NOTIFICATIONS_ENABLED = EMAIL_CONFIG.get("enabled", False)
-SMTP_SERVER = EMAIL_CONFIG.get("smtp_server", "smtp.gmail.com")
-SMTP_PORT = EMAIL_CONFIG.get("smtp_port", 587)
-# Priority: .env > config file (for security - passwords should be in .env)
-EMAIL_FROM = os.getenv("EMAIL_FROM", EMAIL_CONFIG.get("from", ""))
-EMAIL_TO = os.getenv("EMAIL_TO", EMAIL_CONFIG.get("to", ""))
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", EMAIL_CONFIG.get("password", ""))
 
 # ============================================================================
 # TRANSLATIONS
@@ -241,6 +781,7 @@ TRANSLATIONS = {
         "max_attempts": "Max Attempts",
         "oci_init_success": "OCI SDK initialized successfully",
         "oci_init_failed": "Failed to initialize OCI SDK",
+        "regions": "Regions",
         "available_ads": "Available ADs",
         "attempt": "Attempt",
         "attempting_create": "Attempting to create instance in",
@@ -249,6 +790,12 @@ TRANSLATIONS = {
         "instance_state": "Instance State",
         "no_capacity": "No capacity in",
         "error_in_ad": "Error in",
+        "throttled": "Throttled (429) in",
+        "trying_rung": "trying",
+        "shape_ladder": "Shape ladder",
+        "resizing": "Resizing instance to",
+        "resize_done": "Instance resized to",
+        "resize_gave_up": "No capacity for a resize, keeping",
         "unexpected_error": "Unexpected error in",
         "waiting_for_running": "Waiting for instance to reach RUNNING state...",
         "instance_running": "Instance is now RUNNING!",
@@ -259,6 +806,7 @@ TRANSLATIONS = {
         "email_sent": "Email notification sent to",
         "email_failed": "Failed to send email notification",
         "instance_created_title": "INSTANCE SUCCESSFULLY CREATED!",
+        "instance_provisioning_title": "INSTANCE LAUNCHED - IP ASSIGNED, STILL PROVISIONING",
         "instance_details": "Instance Details",
         "ssh_connection_info": "SSH CONNECTION INFO",
         "next_steps": "Next steps",
@@ -269,6 +817,15 @@ TRANSLATIONS = {
         "waiting_before_retry": "Waiting {seconds} seconds before next attempt...",
         "max_attempts_reached": "Max attempts ({attempts}) reached. No capacity found.",
         "script_can_restart": "The script can be restarted at any time to continue trying.",
+        "resumed_checkpoint": "Resumed from checkpoint",
+        "fulfilled_elsewhere": "Instance already launched by another sniper",
+        "coordination_reset_hint": "Start with --reset-coordination to snipe another instance.",
+        "hedging": "Slow response from {slow} ({seconds}s), hedging with",
+        "coordination_error": "Coordination backend error",
+        "duplicate_instance": "Duplicate instance (not terminated)",
+        "duplicate_terminated": "Duplicate instance terminated",
+        "duplicate_terminate_failed": "Could not terminate duplicate instance",
+        "reconcile_failed": "Could not list instances for the duplicate check in",
         "script_interrupted": "Script interrupted by user (Ctrl+C)",
         "fatal_error": "Fatal error",
         "reserved_ip_prompt": "Do you want to create a RESERVED Public IP? (Recommended for SSH config)",
@@ -276,9 +833,12 @@ TRANSLATIONS = {
         "reserved_ip_yes": "This is recommended if you plan to use SSH config (~/.ssh/config)",
         "reserved_ip_creating": "Creating reserved public IP...",
         "reserved_ip_created": "Reserved IP created",
+        "reserved_ip_attached": "Reserved IP attached",
+        "ephemeral_ip_assigned": "New ephemeral IP assigned instead",
         "bad_request": "Bad Request - Check your configuration (Shape, Image, Subnet)",
         "auth_failed": "Authentication failed - Run: oci setup config",
         "config_errors_found": "[X] Configuration errors found:",
+        "config_valid": "Configuration is valid",
         "please_run_setup": "Please run setup.ps1 first or manually configure the script:",
         "setup_command": "   powershell -ExecutionPolicy Bypass -File setup.ps1",
         "quota_exceeded": "SERVICE LIMIT EXCEEDED - Your A1 quota is used up!",
@@ -294,6 +854,7 @@ TRANSLATIONS = {
         "max_attempts": "Max. Versuche",
         "oci_init_success": "OCI SDK erfolgreich initialisiert",
         "oci_init_failed": "OCI SDK Initialisierung fehlgeschlagen",
+        "regions": "Regionen",
         "available_ads": "Verfuegbare ADs",
         "attempt": "Versuch",
         "attempting_create": "Versuche Instanz zu erstellen in",
@@ -302,6 +863,12 @@ TRANSLATIONS = {
         "instance_state": "Instanz-Status",
         "no_capacity": "Keine Kapazitaet in",
         "error_in_ad": "Fehler in",
+        "throttled": "Gedrosselt (429) in",
+        "trying_rung": "versuche",
+        "shape_ladder": "Shape-Stufen",
+        "resizing": "Vergroessere Instanz auf",
+        "resize_done": "Instanz vergroessert auf",
+        "resize_gave_up": "Keine Kapazitaet zum Vergroessern, behalte",
         "unexpected_error": "Unerwarteter Fehler in",
         "waiting_for_running": "Warte bis Instanz RUNNING Status erreicht...",
         "instance_running": "Instanz laeuft jetzt!",
@@ -312,6 +879,7 @@ TRANSLATIONS = {
         "email_sent": "Email-Benachrichtigung gesendet an",
         "email_failed": "Email-Benachrichtigung fehlgeschlagen",
         "instance_created_title": "INSTANZ ERFOLGREICH ERSTELLT!",
+        "instance_provisioning_title": "INSTANZ GESTARTET - IP ZUGEWIESEN, WIRD NOCH BEREITGESTELLT",
         "instance_details": "Instanz-Details",
         "ssh_connection_info": "SSH VERBINDUNGSINFO",
         "next_steps": "Naechste Schritte",
@@ -322,6 +890,15 @@ TRANSLATIONS = {
         "waiting_before_retry": "Warte {seconds} Sekunden vor naechstem Versuch...",
         "max_attempts_reached": "Max. Versuche ({attempts}) erreicht. Keine Kapazitaet gefunden.",
         "script_can_restart": "Das Skript kann jederzeit neu gestartet werden.",
+        "resumed_checkpoint": "Vom Checkpoint fortgesetzt",
+        "fulfilled_elsewhere": "Instanz bereits von einem anderen Sniper gestartet",
+        "coordination_reset_hint": "Mit --reset-coordination starten, um eine weitere Instanz zu snipen.",
+        "hedging": "Langsame Antwort von {slow} ({seconds}s), zusaetzlicher Versuch in",
+        "coordination_error": "Fehler im Koordinations-Backend",
+        "duplicate_instance": "Doppelte Instanz (nicht beendet)",
+        "duplicate_terminated": "Doppelte Instanz beendet",
+        "duplicate_terminate_failed": "Doppelte Instanz konnte nicht beendet werden",
+        "reconcile_failed": "Instanzen fuer die Duplikat-Pruefung nicht abrufbar in",
         "script_interrupted": "Skript durch Benutzer unterbrochen (Ctrl+C)",
         "fatal_error": "Fataler Fehler",
         "reserved_ip_prompt": "Moechten Sie eine RESERVIERTE oeffentliche IP erstellen?",
@@ -329,6 +906,8 @@ TRANSLATIONS = {
         "reserved_ip_yes": "Empfohlen wenn Sie SSH Config (~/.ssh/config) nutzen moechten",
         "reserved_ip_creating": "Erstelle reservierte oeffentliche IP...",
         "reserved_ip_created": "Reservierte IP erstellt",
+        "reserved_ip_attached": "Reservierte IP zugewiesen",
+        "ephemeral_ip_assigned": "Stattdessen neue ephemere IP zugewiesen",
         "reserved_ip_checking": "Pruefe auf vorhandene reservierte IPs...",
         "reserved_ip_found": "Reservierte IP gefunden",
         "reserved_ip_all_assigned": "Alle reservierten IPs sind bereits zugewiesen",
@@ -336,6 +915,7 @@ TRANSLATIONS = {
         "bad_request": "Ungueltige Anfrage - Pruefen Sie Ihre Konfiguration (Shape, Image, Subnet)",
         "auth_failed": "Authentifizierung fehlgeschlagen - Fuehren Sie aus: oci setup config",
         "config_errors_found": "Konfigurationsfehler gefunden:",
+        "config_valid": "Konfiguration ist gueltig",
         "please_run_setup": "Bitte fuehren Sie zuerst setup.ps1 aus oder konfigurieren Sie das Script manuell:",
         "setup_command": "   powershell -ExecutionPolicy Bypass -File setup.ps1",
         "quota_exceeded": "SERVICE-LIMIT UEBERSCHRITTEN - Dein A1-Kontingent ist aufgebraucht!",
@@ -393,112 +973,196 @@ def select_language():
 # LOGGING SETUP
 # ============================================================================
 
-# Configure UTF-8 encoding for Windows console
-if sys.platform == "win32":
-    # Set console output to UTF-8
-    os.system("chcp 65001 >nul 2>&1")
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
-
-# Log rotation: max 5 MB per file, keep 3 backup files
-from logging.handlers import RotatingFileHandler
-
-# Log file in project root (one level up from scripts/)
-_script_dir = os.path.dirname(os.path.abspath(__file__))
-_project_root = os.path.dirname(_script_dir)
-_log_file = os.path.join(_project_root, "oci-sniper.log")
-
-log_handler = RotatingFileHandler(
-    _log_file,
-    maxBytes=5 * 1024 * 1024,  # 5 MB
-    backupCount=3,  # Keep 3 old logs (oci-sniper.log.1, .2, .3)
-    encoding="utf-8"
-)
-
-# Console handler with UTF-8 stream
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        log_handler,
-        console_handler,
-    ],
-)
 logger = logging.getLogger(__name__)
+LOG_LISTENER = None  # Background thread writing the log records (setup_logging())
+LOG_COALESCER = None
 
 
-# ============================================================================
-# HELPER FUNCTIONS
-# ============================================================================
+def coalesced(availability_domain, event):
+    """Log record extras for a per-attempt outcome that repeats every round
 
+    Records with the same (AD, event) are coalesced into periodic summaries.
+    """
+    return {"coalesce": True, "ad": availability_domain, "event": event}
 
-def ask_yes_no(question):
-    """Ask user a yes/no question"""
-    while True:
-        response = input(f"{question} (y/n): ").lower().strip()
-        if response in ["y", "yes", "ja", "j"]:
-            return True
-        elif response in ["n", "no", "nein"]:
-            return False
-        else:
-            print("Please answer with 'y' or 'n'")
 
+class CoalescingFilter(logging.Filter):
+    """Collapse repeated per-attempt records into periodic summary records
 
-def send_email_notification(instance_data, public_ip, private_ip):
-    """Send email notification when instance is created"""
+    The first record of an (AD, event) key passes. Repeats within the
+    interval are only counted, then reported as one summary record
+    ("AD-2: 120 x no_capacity in 2h 0m") when the interval is over or on
+    flush(). Records without the "coalesce" extra always pass.
+    """
 
-    if not EMAIL_NOTIFICATIONS_ENABLED:
-        return
+    def __init__(self, interval):
+        super().__init__()
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.windows = {}  # (ad, event) -> [window start, repeats, level]
+
+    def filter(self, record):
+        now = time.monotonic()
+        allowed = True
+        with self.lock:
+            summaries = self._expire(now)
+            if getattr(record, "coalesce", False):
+                key = (record.ad, record.event)
+                if key in self.windows:
+                    self.windows[key][1] += 1
+                    allowed = False
+                else:
+                    self.windows[key] = [now, 0, record.levelno]
+        self._emit(summaries, now)
+        return allowed
+
+    def _expire(self, now):
+        expired = [key for key, (start, _, _) in self.windows.items() if now - start >= self.interval]
+        return [(key, self.windows.pop(key)) for key in expired]
+
+    def _emit(self, summaries, now):
+        for (ad, event), (start, repeats, level) in summaries:
+            if not repeats:
+                continue
+            seconds = now - start
+            hours, minutes = divmod(int(seconds) // 60, 60)
+            duration = f"{hours}h {minutes}m" if hours else f"{minutes}m {int(seconds) % 60}s"
+            logger.log(
+                level,
+                f"[=] {ad}: {repeats + 1} x {event} in {duration}",
+                extra={"ad": ad, "event": event, "count": repeats + 1, "window_seconds": round(seconds)},
+            )
 
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = "[OK] OCI Instance Successfully Created!"
-        msg["From"] = EMAIL_FROM
-        msg["To"] = EMAIL_TO
+    def flush(self):
+        """Report every pending summary (at exit)"""
+        now = time.monotonic()
+        with self.lock:
+            summaries = list(self.windows.items())
+            self.windows.clear()
+        self._emit(summaries, now)
 
-        # Email body
-        text = f"""
-Your OCI Instance is ready!
 
-Instance Details:
-- Name: {instance_data.display_name}
-- Shape: {instance_data.shape} ({OCPUS} OCPUs, {MEMORY_IN_GBS} GB RAM)
-- Availability Domain: {instance_data.availability_domain}
-- Public IP: {public_ip}
-- Private IP: {private_ip}
+class JsonFormatter(logging.Formatter):
+    """JSON lines: one object per record, including its structured fields"""
 
-SSH Command:
-ssh ubuntu@{public_ip}
+    FIELDS = ("region", "ad", "event", "count", "window_seconds")
 
-Status: RUNNING [OK]
-Created at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage().strip(),
+        }
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, ensure_ascii=False)
 
-Next Steps:
-1. SSH into your instance
-2. Update system: sudo apt update && sudo apt upgrade -y
-3. Install Docker: curl -fsSL https://get.docker.com | sh
-4. Deploy Nextcloud!
 
----
-Sent by OCI Instance Sniper
-        """
+def stop_logging():
+    """Write pending coalesced summaries and drain the log queue"""
+    global LOG_LISTENER
+    if LOG_COALESCER:
+        LOG_COALESCER.flush()
+    if LOG_LISTENER:
+        LOG_LISTENER.stop()
+        LOG_LISTENER = None
 
-        msg.attach(MIMEText(text, "plain"))
 
-        # Send email
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_FROM, EMAIL_PASSWORD)
-            server.send_message(msg)
+def setup_logging():
+    """Console (UTF-8) and rotating file log, called once by init_runtime()
 
-        logger.info(f"📧 {t('email_sent')}: {EMAIL_TO}")
+    Callers only put records on a queue; a listener thread formats and
+    writes them, so log I/O stays off the launch threads.
+    """
+    global LOG_LISTENER, LOG_COALESCER
+    if LOG_LISTENER:
+        return  # Already set up
 
-    except Exception as e:
-        logger.warning(f"[!]  {t('email_failed')}: {str(e)}")
+    # Configure UTF-8 encoding for Windows console
+    if sys.platform == "win32":
+        # Set console output to UTF-8
+        os.system("chcp 65001 >nul 2>&1")
+        import io
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+    # Log rotation: max 5 MB per file, keep 3 backup files
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+    # Log file in project root (one level up from scripts/), unless provided via environment variable
+    _log_file = os.getenv("SNIPER_LOG_PATH")
+    if not _log_file:
+        _script_dir = os.path.dirname(os.path.abspath(__file__))
+        _project_root = os.path.dirname(_script_dir)
+        _log_file = os.path.join(_project_root, "oci-sniper.log")
+
+    log_handler = RotatingFileHandler(
+        _log_file,
+        maxBytes=5 * 1024 * 1024,  # 5 MB
+        backupCount=3,  # Keep 3 old logs (oci-sniper.log.1, .2, .3)
+        encoding="utf-8"
+    )
+
+    text_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    log_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else text_formatter)
+
+    # Console handler with UTF-8 stream
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(text_formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    if LOG_COALESCE_SECONDS:
+        LOG_COALESCER = CoalescingFilter(LOG_COALESCE_SECONDS)
+        queue_handler.addFilter(LOG_COALESCER)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(queue_handler)
+    LOG_LISTENER = QueueListener(log_queue, log_handler, console_handler, respect_handler_level=True)
+    LOG_LISTENER.start()
+    atexit.register(stop_logging)
+
+
+def init_runtime():
+    """Explicit startup step: .env, config files, SSH key and logging
+
+    Importing the script has no side effects; every entry point calls this
+    first. The OCI SDK is loaded separately (load_sdk()) only where needed.
+    """
+    global REGIONS_FILE, SSH_PUBLIC_KEY
+
+    # Optional: python-dotenv for .env file support
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()  # Load .env file if it exists
+    except ImportError:
+        pass  # python-dotenv not installed, skip .env loading
+
+    # Config file overrides the hardcoded defaults
+    apply_config(load_config_file())
+    REGIONS_FILE = load_regions_file()
+    SSH_PUBLIC_KEY = load_ssh_key()
+    setup_logging()
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+
+def ask_yes_no(question):
+    """Ask user a yes/no question"""
+    while True:
+        response = input(f"{question} (y/n): ").lower().strip()
+        if response in ["y", "yes", "ja", "j"]:
+            return True
+        elif response in ["n", "no", "nein"]:
+            return False
+        else:
+            print("Please answer with 'y' or 'n'")
 
 
 def generate_ssh_config(public_ip, instance_name):
@@ -526,50 +1190,154 @@ Host oci
         logger.warning(f"[!]  Could not write SSH config file: {str(e)}")
 
 
-def wait_for_instance_running(compute_client, instance_id, network_client, timeout=600):
-    """Wait for instance to reach RUNNING state and get IP addresses"""
-
-    logger.info(f"[...] {t('waiting_for_running')}")
-
-    start_time = time.time()
-    elapsed = 0
+def wait_for_instance_running(
+    compute_client,
+    instance_id,
+    network_client,
+    timeout=600,
+    work_request_client=None,
+    work_request_id=None,
+):
+    """Wait until the instance has its public IP (or is RUNNING) and get its IP addresses
 
-    while time.time() - start_time < timeout:
-        try:
-            instance = compute_client.get_instance(instance_id).data
-            elapsed = int(time.time() - start_time)
+    Polls on an adaptive schedule: every second at first, then backing off
+    to 10s (up to 30s while throttled). While the launch work request is in
+    progress it is followed instead of get_instance. The VNIC is looked up
+    in parallel from the first poll on, so the public IP is returned as soon
+    as OCI assigns it, often before the instance reaches RUNNING.
 
-            if instance.lifecycle_state == "RUNNING":
-                logger.info(f"[OK] {t('instance_running')}")
+    Returns:
+        Tuple (instance, public_ip, private_ip), (None, None, None) on timeout
+    """
 
-                # Get VNIC info for IP addresses
-                try:
-                    vnic_attachments = compute_client.list_vnic_attachments(
-                        compartment_id=instance.compartment_id, instance_id=instance.id
-                    ).data
+    logger.info(f"[...] {t('waiting_for_running')}")
 
-                    if vnic_attachments:
-                        vnic_id = vnic_attachments[0].vnic_id
-                        vnic = network_client.get_vnic(vnic_id).data
-                        return instance, vnic.public_ip, vnic.private_ip
+    start_time = time.monotonic()
+    interval = 1.0
+    instance = None
+    vnic_id = None
+    last_state = None
 
-                except Exception as e:
-                    logger.warning(f"Could not get VNIC info: {str(e)}")
+    def poll_state():
+        """Lifecycle state from the work request while it runs, else from get_instance"""
+        nonlocal work_request_id
+        if work_request_id and work_request_client:
+            try:
+                work_request = work_request_client.get_work_request(work_request_id).data
+                if work_request.status in ("ACCEPTED", "IN_PROGRESS"):
+                    return f"{work_request.status} {work_request.percent_complete or 0:.0f}% (work request)", None
+                if work_request.status in ("FAILED", "CANCELED"):
+                    logger.warning(f"[!]  Launch work request {work_request.status}")
+            except oci.exceptions.ServiceError as e:
+                if e.status == 429:
+                    raise
+                logger.debug(f"Could not follow work request: {str(e)}")
+            work_request_id = None  # Done (or not readable): back to get_instance
+        current = compute_client.get_instance(instance_id).data
+        return current.lifecycle_state, current
+
+    def poll_vnic(compartment_id, vnic_id):
+        """Primary VNIC of the instance (None while it is not attached yet)"""
+        if not vnic_id:
+            attachments = compute_client.list_vnic_attachments(
+                compartment_id=compartment_id, instance_id=instance_id
+            ).data
+            if not attachments:
+                return None, None
+            vnic_id = attachments[0].vnic_id
+        return vnic_id, network_client.get_vnic(vnic_id).data
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="tracker") as executor:
+        while time.monotonic() - start_time < timeout:
+            tick = time.monotonic()
+            elapsed = int(tick - start_time)
+            throttled = False
+            try:
+                if instance is None:
+                    instance = compute_client.get_instance(instance_id).data
+                    state = instance.lifecycle_state
+                    vnic = None
+                else:
+                    # Instance state and VNIC lookup in parallel
+                    state_future = executor.submit(poll_state)
+                    vnic_future = executor.submit(poll_vnic, instance.compartment_id, vnic_id)
+                    state, current = state_future.result()
+                    instance = current or instance
+                    vnic_id, vnic = vnic_future.result()
+
+                if state == "RUNNING" and state != last_state:
+                    logger.info(f"[OK] {t('instance_running')}")
+                if vnic and vnic.public_ip:
+                    logger.info(f"[OK] {t('public_ip')}: {vnic.public_ip} ({elapsed}s)")
+                    return instance, vnic.public_ip, vnic.private_ip
+                if state == "RUNNING":
+                    if vnic_id is None or vnic is None:
+                        vnic_id, vnic = poll_vnic(instance.compartment_id, vnic_id)
+                    return instance, vnic and vnic.public_ip, vnic and vnic.private_ip
+                if state in ("TERMINATING", "TERMINATED"):
+                    logger.warning(f"[!]  {t('instance_state')}: {state}")
                     return instance, None, None
 
-            logger.info(
-                f"[...] {t('instance_state')}: {instance.lifecycle_state} ({elapsed}s)"
-            )
-            time.sleep(10)
+                if state != last_state:
+                    logger.info(f"[...] {t('instance_state')}: {state} ({elapsed}s)")
+                last_state = state
 
-        except Exception as e:
-            logger.warning(f"Error checking instance status: {str(e)}")
-            time.sleep(10)
+            except oci.exceptions.ServiceError as e:
+                if e.status == 429:
+                    interval = min(interval * 2, 30)  # Back off harder while throttled
+                    throttled = True
+                logger.warning(f"Error checking instance status: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Error checking instance status: {str(e)}")
+
+            time.sleep(max(0.0, interval - (time.monotonic() - tick)))
+            if not throttled:
+                interval = min(interval * 1.5, 10.0)
 
     logger.warning(f"[!]  Timeout waiting for RUNNING state ({timeout}s)")
     return None, None, None
 
 
+def resize_up(compute_client, instance, attempts):
+    """Grow an instance launched on a lower shape ladder rung to the best rung
+
+    Keeps asking for the larger configuration every RETRY_DELAY_SECONDS
+    while the AD is out of host capacity. The instance reboots on resize.
+
+    Returns:
+        The updated instance, or the unchanged one if no capacity was found
+    """
+
+    best = SHAPE_LADDER[0]
+    config = instance.shape_config
+    current = (instance.shape, config.ocpus if config else None, config.memory_in_gbs if config else None)
+    if current == rung_key(best) or current not in [rung_key(rung) for rung in SHAPE_LADDER]:
+        return instance
+    landed = next(rung for rung in SHAPE_LADDER if rung_key(rung) == current)
+
+    details = oci.core.models.UpdateInstanceDetails(
+        shape=best["shape"],
+        shape_config=oci.core.models.UpdateInstanceShapeConfigDetails(
+            ocpus=best["ocpus"], memory_in_gbs=best["memory_in_gbs"]
+        ) if best["ocpus"] else None,
+    )
+    for attempt in range(1, attempts + 1):
+        logger.info(f"[...] {t('resizing')} {rung_label(best)} ({t('attempt')} {attempt}/{attempts})")
+        try:
+            instance = compute_client.update_instance(instance.id, details).data
+            logger.info(f"[OK] {t('resize_done')} {rung_label(best)}")
+            return instance
+        except oci.exceptions.ServiceError as e:
+            if not (e.status == 500 and "Out of host capacity" in e.message):
+                logger.warning(f"[!]  Resize failed: {e.code} - {e.message}")
+                return instance
+        if attempt < attempts:
+            time.sleep(RETRY_DELAY_SECONDS)
+
+    logger.warning(f"[!]  {t('resize_gave_up')} {rung_label(landed)}")
+    return instance
+
+
 def get_or_create_reserved_ip(
     network_client,
     compartment_id,
@@ -677,210 +1445,3720 @@ def get_or_create_reserved_ip(
         return None
 
 
-# ============================================================================
-# MAIN FUNCTIONS
-# ============================================================================
+def attach_reserved_ip(compute_client, network_client, instance, reserved_ip, timeout=300):
+    """Bind a reserved public IP to the primary private IP of a new instance
 
+    Starts as soon as the primary VNIC exists (usually while the instance
+    is still PROVISIONING) and runs alongside wait_for_instance_running().
+    An ephemeral public IP on the private IP is released first; if the
+    reserved IP then cannot be bound, a new ephemeral IP takes its place.
 
-def create_instance_config(availability_domain, reserved_ip_id=None):
-    """Create instance configuration for the given availability domain."""
+    Returns:
+        The public address the instance ends up with: the reserved IP, or
+        the new ephemeral IP ("" if that failed too). None if the public
+        IP on the instance was left untouched.
+    """
 
-    create_vnic_details = oci.core.models.CreateVnicDetails(
-        subnet_id=SUBNET_ID,
-        assign_public_ip=ASSIGN_PUBLIC_IP,
-    )
+    start_time = time.monotonic()
+    interval = 1.0
+    primary = None
 
-    instance_details = oci.core.models.LaunchInstanceDetails(
-        availability_domain=availability_domain,
-        compartment_id=COMPARTMENT_ID,
-        display_name=INSTANCE_NAME,
-        shape=SHAPE,
-        shape_config=oci.core.models.LaunchInstanceShapeConfigDetails(
-            ocpus=OCPUS, memory_in_gbs=MEMORY_IN_GBS
-        ),
-        create_vnic_details=create_vnic_details,
-        metadata={"ssh_authorized_keys": SSH_PUBLIC_KEY},
-        source_details=oci.core.models.InstanceSourceViaImageDetails(
-            image_id=IMAGE_ID,
-            source_type="image",
-            boot_volume_size_in_gbs=BOOT_VOLUME_SIZE_IN_GBS
-        ),
-    )
+    # Wait for the primary VNIC and its private IP
+    while primary is None:
+        if time.monotonic() - start_time >= timeout:
+            logger.warning(f"[!]  Timeout waiting for the VNIC, reserved IP not attached ({timeout}s)")
+            return None
+        try:
+            attachments = compute_client.list_vnic_attachments(
+                compartment_id=instance.compartment_id, instance_id=instance.id
+            ).data
+            if attachments:
+                private_ips = network_client.list_private_ips(vnic_id=attachments[0].vnic_id).data
+                primary = next((ip for ip in private_ips if ip.is_primary), None)
+        except oci.exceptions.ServiceError as e:
+            logger.debug(f"VNIC not ready for reserved IP: {str(e)}")
+        if primary is None:
+            time.sleep(interval)
+            interval = min(interval * 1.5, 10.0)
+
+    released = False
+    try:
+        try:
+            current = network_client.get_public_ip_by_private_ip_id(
+                oci.core.models.GetPublicIpByPrivateIpIdDetails(private_ip_id=primary.id)
+            ).data
+        except oci.exceptions.ServiceError as e:
+            if e.status != 404:
+                raise
+            current = None  # No public IP on the private IP yet
+
+        if current and current.id == reserved_ip.id:
+            return reserved_ip.ip_address
+        if current and current.lifetime == "EPHEMERAL":
+            network_client.delete_public_ip(current.id)
+            released = True
+
+        network_client.update_public_ip(
+            reserved_ip.id, oci.core.models.UpdatePublicIpDetails(private_ip_id=primary.id)
+        )
+        logger.info(f"[OK] {t('reserved_ip_attached')}: {reserved_ip.ip_address}")
+        return reserved_ip.ip_address
 
-    return instance_details
+    except oci.exceptions.ServiceError as e:
+        logger.warning(f"[!]  Could not attach reserved IP {reserved_ip.ip_address}: {e.code} - {e.message}")
+    except (oci.exceptions.RequestException, oci.exceptions.ConnectTimeout, ConnectionError, TimeoutError) as e:
+        logger.warning(f"[!]  Could not attach reserved IP {reserved_ip.ip_address}: {str(e)}")
 
+    if not released:
+        return None
 
-@retry(
-    retry=retry_if_exception_type(
-        (
-            oci.exceptions.RequestException,
-            oci.exceptions.ConnectTimeout,
-            ConnectionError,
-            TimeoutError,
-        )
-    ),
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    before_sleep=before_sleep_log(logger, logging.WARNING),
-    reraise=True,
-)
-def _launch_instance_with_retry(compute_client, instance_details, availability_domain):
-    """Internal function to launch instance with retry logic for network errors."""
-    logger.info(f"{t('attempting_create')} {availability_domain}...")
-    return compute_client.launch_instance(instance_details)
+    # The ephemeral IP is already gone: a new one instead of no public IP at all
+    try:
+        ephemeral = network_client.create_public_ip(
+            oci.core.models.CreatePublicIpDetails(
+                compartment_id=instance.compartment_id, lifetime="EPHEMERAL", private_ip_id=primary.id
+            )
+        ).data
+    except oci.exceptions.ServiceError as e:
+        logger.error(f"[X] Could not assign a new ephemeral IP, the instance has no public IP: {e.code} - {e.message}")
+        return ""
+    except (oci.exceptions.RequestException, oci.exceptions.ConnectTimeout, ConnectionError, TimeoutError) as e:
+        logger.error(f"[X] Could not assign a new ephemeral IP, the instance has no public IP: {str(e)}")
+        return ""
+    logger.info(f"[OK] {t('ephemeral_ip_assigned')}: {ephemeral.ip_address}")
+    return ephemeral.ip_address
 
 
-def try_create_instance(compute_client, availability_domain, reserved_ip_id=None):
-    """Attempt to create an instance in the specified availability domain."""
+# ============================================================================
+# NOTIFICATIONS
+# ============================================================================
 
-    try:
-        instance_details = create_instance_config(availability_domain, reserved_ip_id)
 
-        # Call with retry logic for network errors
-        response = _launch_instance_with_retry(
-            compute_client, instance_details, availability_domain
-        )
+def build_notification(instance, public_ip, private_ip, region=None):
+    """Event payload shared by all notification channels"""
+    shape_config = instance.shape_config
+    return {
+        "event": "instance_created",
+        "instance_id": instance.id,
+        "name": instance.display_name,
+        "region": region["id"] if region else None,
+        "availability_domain": instance.availability_domain,
+        "shape": instance.shape,
+        "ocpus": shape_config.ocpus if shape_config else None,
+        "memory_in_gbs": shape_config.memory_in_gbs if shape_config else None,
+        "public_ip": public_ip,
+        "private_ip": private_ip,
+        "state": instance.lifecycle_state,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+class EmailChannel:
+    """SMTP notification; the connection is kept open and reused between messages"""
+
+    name = "email"
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=self.timeout)
+        if SMTP_STARTTLS:
+            server.starttls()
+        if EMAIL_PASSWORD:
+            server.login(EMAIL_FROM, EMAIL_PASSWORD)
+        return server
 
-        logger.info(f"[OK] {t('success')} {availability_domain}!")
-        logger.info(f"{t('instance_ocid')}: {response.data.id}")
-        logger.info(f"{t('instance_state')}: {response.data.lifecycle_state}")
+    def send(self, payload):
+        msg = MIMEMultipart("alternative")
+        running = payload["state"] == "RUNNING"
+        if running:
+            msg["Subject"] = "[OK] OCI Instance Successfully Created!"
+        else:
+            msg["Subject"] = "[OK] OCI Instance Launched - IP Assigned, Still Provisioning"
+        msg["From"] = EMAIL_FROM
+        msg["To"] = EMAIL_TO
 
-        return True, response.data
+        # Email body
+        text = f"""
+{'Your OCI Instance is ready!' if running else 'Your OCI Instance has its IP address and is still provisioning.'}
 
-    except oci.exceptions.ServiceError as e:
-        if e.status == 500 and "Out of host capacity" in e.message:
-            logger.warning(f"[...] {t('no_capacity')} {availability_domain}: Out of host capacity.")
-            return False, None
-        elif e.status == 400:
-            # Check for service limit errors (quota exceeded)
-            if "service limits were exceeded" in e.message.lower():
-                logger.error(f"[X] {t('quota_exceeded')} {availability_domain}")
-                logger.error(f"    {e.message}")
-                logger.error("")
-                logger.error(t('quota_hint'))
-                # Return special code to signal quota error
-                return "QUOTA_ERROR", None
+Instance Details:
+- Name: {payload['name']}
+- Shape: {payload['shape']} ({payload['ocpus']} OCPUs, {payload['memory_in_gbs']} GB RAM)
+- Availability Domain: {payload['availability_domain']}
+- Public IP: {payload['public_ip']}
+- Private IP: {payload['private_ip']}
+
+SSH Command:
+ssh ubuntu@{payload['public_ip']}
+
+Status: {payload['state']}{' [OK]' if payload['state'] == 'RUNNING' else ''}
+Created at: {payload['created_at']}
+
+Next Steps:
+1. SSH into your instance
+2. Update system: sudo apt update && sudo apt upgrade -y
+3. Install Docker: curl -fsSL https://get.docker.com | sh
+4. Deploy Nextcloud!
+
+---
+Sent by OCI Instance Sniper
+        """
+
+        msg.attach(MIMEText(text, "plain"))
+
+        # Reuse the open connection if the server still answers
+        if self.server is not None:
+            try:
+                self.server.noop()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self.server is None:
+            self.server = self._connect()
+        try:
+            self.server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self.close()  # Next attempt reconnects
+            raise
+
+        logger.info(f"📧 {t('email_sent')}: {EMAIL_TO}")
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+
+class WebhookChannel:
+    """POST the event payload as JSON to a URL"""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def send(self, payload):
+        req = urllib_request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json", **self.headers},
+            method="POST",
+        )
+        with urllib_request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+        logger.info(f"[OK] Webhook notified: {self.url}")
+
+    def close(self):
+        pass
+
+
+class CommandChannel:
+    """Run a local command with the payload as JSON on stdin and SNIPER_* variables"""
+
+    name = "command"
+
+    def __init__(self, command, timeout):
+        self.command = command
+        self.timeout = timeout
+
+    def send(self, payload):
+        env = dict(os.environ)
+        for key, value in payload.items():
+            env[f"SNIPER_{key.upper()}"] = "" if value is None else str(value)
+        subprocess.run(
+            self.command,
+            input=json.dumps(payload),
+            env=env,
+            shell=isinstance(self.command, str),
+            capture_output=True,
+            text=True,
+            timeout=self.timeout,
+            check=True,
+        )
+
+    def close(self):
+        pass
+
+
+class ToastChannel:
+    """Windows desktop notification (winotify, falling back to win10toast)"""
+
+    name = "toast"
+
+    def send(self, payload):
+        public_ip = payload["public_ip"]
+        title = "OCI Instance Ready!" if payload["state"] == "RUNNING" else "OCI Instance IP Assigned (Provisioning)"
+        try:
+            # Try winotify first (modern, Python 3.13 compatible)
+            from winotify import Notification, audio
+            toast = Notification(
+                app_id="OCI Instance Sniper",
+                title=title,
+                msg=f"Instance created: {public_ip}\nSSH: ssh ubuntu@{public_ip}",
+                duration="long"
+            )
+            toast.set_audio(audio.Default, loop=False)
+            toast.show()
+        except ImportError:
+            try:
+                # Fallback to win10toast (older, may not work on Python 3.13+)
+                from win10toast import ToastNotifier
+            except ImportError:
+                return  # No notification library installed
+            toaster = ToastNotifier()
+            toaster.show_toast(
+                title,
+                f"Instance created: {public_ip}",
+                duration=15,
+                threaded=True
+            )
+
+    def close(self):
+        pass
+
+
+class NotificationDispatcher:
+    """Bounded notification queue, delivered by background worker threads
+
+    notify() never blocks the caller: every channel gets its own job, so a
+    slow or unreachable SMTP server only ties up one worker. Failed
+    deliveries are retried with exponential backoff. A channel is used by
+    one worker at a time (the SMTP connection is not thread-safe).
+    """
+
+    def __init__(self, channels, queue_size=100, workers=2, retries=3):
+        self.channels = channels
+        self.retries = retries
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.locks = {id(channel): threading.Lock() for channel in channels}
+        self.closing = threading.Event()
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"notify-{n}", daemon=True)
+            for n in range(max(1, workers))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def notify(self, payload):
+        """Queue the payload for every channel (dropped with a warning if the queue is full)"""
+        for channel in self.channels:
+            self._enqueue(channel, payload, 1)
+
+    def _enqueue(self, channel, payload, attempt):
+        try:
+            self.queue.put_nowait((channel, payload, attempt))
+        except queue.Full:
+            logger.warning(f"[!]  Notification queue full, dropping {channel.name} notification")
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                channel, payload, attempt = job
+                try:
+                    with self.locks[id(channel)]:
+                        channel.send(payload)
+                except Exception as e:
+                    if attempt < self.retries:
+                        logger.debug(f"{channel.name} notification failed (attempt {attempt}): {str(e)}")
+                        # Backoff, cut short when the process is about to exit
+                        self.closing.wait(min(2 ** attempt, 30))
+                        self._enqueue(channel, payload, attempt + 1)
+                    elif channel.name == "email":
+                        logger.warning(f"[!]  {t('email_failed')}: {str(e)}")
+                    else:
+                        logger.warning(f"[!]  {channel.name} notification failed: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def close(self, timeout):
+        """Wait up to timeout seconds for pending notifications, then stop the workers"""
+        self.closing.set()
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks and time.monotonic() < deadline:
+                self.queue.all_tasks_done.wait(deadline - time.monotonic())
+            pending = self.queue.unfinished_tasks
+
+        if pending:
+            logger.warning(f"[!]  {pending} notification(s) not delivered within {timeout}s")
+            return
+        for _ in self.workers:
+            self.queue.put(None)
+        for channel in self.channels:
+            channel.close()
+
+
+def create_notifier():
+    """Notification dispatcher for every configured channel (None if there is none)"""
+    channels = []
+    if EMAIL_NOTIFICATIONS_ENABLED:
+        channels.append(EmailChannel(NOTIFY_TIMEOUT))
+    for webhook in NOTIFY_WEBHOOKS:
+        channels.append(
+            WebhookChannel(webhook["url"], webhook.get("timeout", NOTIFY_TIMEOUT), webhook.get("headers"))
+        )
+    for command in NOTIFY_COMMANDS:
+        channels.append(CommandChannel(command["command"], command.get("timeout", NOTIFY_TIMEOUT)))
+    if sys.platform == "win32":
+        channels.append(ToastChannel())
+    if not channels:
+        return None
+    return NotificationDispatcher(channels, NOTIFY_QUEUE_SIZE, NOTIFY_WORKERS, NOTIFY_RETRIES)
+
+
+# ============================================================================
+# METRICS (Prometheus / OpenMetrics text format)
+# ============================================================================
+
+
+class Metrics:
+    """Minimal in-process metrics registry for the long-running sniper
+
+    Counters, gauges and histograms are kept in plain dicts keyed by label
+    tuples. render() produces the Prometheus text exposition format served
+    by start_metrics_server().
+    """
+
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.attempts = {}  # (region, ad, outcome) -> count
+        self.retries = {}  # (ad,) -> count
+        self.backoff = {}  # (region, ad) -> seconds
+        self.latency = {}  # (ad,) -> [bucket counts..., sum, count]
+        self.last_api_response = None
+
+    def observe_attempt(self, region, ad, outcome):
+        with self.lock:
+            key = (region or "", ad, outcome)
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+
+    def observe_launch(self, ad, seconds, responded):
+        """Record one launch_instance call (responded: OCI returned any HTTP answer)"""
+        with self.lock:
+            stats = self.latency.setdefault((ad,), [0] * len(self.LATENCY_BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats[i] += 1
+            stats[-2] += seconds
+            stats[-1] += 1
+            if responded:
+                self.last_api_response = time.time()
+
+    def observe_api_response(self):
+        with self.lock:
+            self.last_api_response = time.time()
+
+    def observe_retry(self, ad):
+        with self.lock:
+            self.retries[(ad,)] = self.retries.get((ad,), 0) + 1
+
+    def set_backoff(self, region, ad, seconds):
+        with self.lock:
+            self.backoff[(region or "", ad)] = seconds
+
+    @staticmethod
+    def _labels(names, values):
+        pairs = []
+        for name, value in zip(names, values):
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self.lock:
+            family(
+                "sniper_attempts_total", "counter", "Launch attempts by region, AD and outcome",
+                [
+                    f"sniper_attempts_total{self._labels(('region', 'ad', 'outcome'), key)} {value}"
+                    for key, value in sorted(self.attempts.items())
+                ],
+            )
+
+            samples = []
+            for key, stats in sorted(self.latency.items()):
+                for bound, count in zip(self.LATENCY_BUCKETS, stats):
+                    samples.append(
+                        f"sniper_launch_latency_seconds_bucket{self._labels(('ad', 'le'), key + (bound,))} {count}"
+                    )
+                samples.append(
+                    f"sniper_launch_latency_seconds_bucket{self._labels(('ad', 'le'), key + ('+Inf',))} {stats[-1]}"
+                )
+                samples.append(f"sniper_launch_latency_seconds_sum{self._labels(('ad',), key)} {stats[-2]:.6f}")
+                samples.append(f"sniper_launch_latency_seconds_count{self._labels(('ad',), key)} {stats[-1]}")
+            family("sniper_launch_latency_seconds", "histogram", "launch_instance call latency", samples)
+
+            family(
+                "sniper_backoff_seconds", "gauge", "Current delay before the next attempt per target",
+                [
+                    f"sniper_backoff_seconds{self._labels(('region', 'ad'), key)} {value:.3f}"
+                    for key, value in sorted(self.backoff.items())
+                ],
+            )
+            family(
+                "sniper_retries_total", "counter", "Network retries of launch_instance (tenacity)",
+                [
+                    f"sniper_retries_total{self._labels(('ad',), key)} {value}"
+                    for key, value in sorted(self.retries.items())
+                ],
+            )
+
+            samples = []
+            if self.last_api_response:
+                samples.append(f"sniper_seconds_since_last_api_response {time.time() - self.last_api_response:.3f}")
+            family(
+                "sniper_seconds_since_last_api_response", "gauge",
+                "Seconds since OCI last answered an API call", samples,
+            )
+
+        rss = get_process_rss()
+        family(
+            "process_resident_memory_bytes", "gauge", "Resident memory size in bytes",
+            [f"process_resident_memory_bytes {rss}"] if rss is not None else [],
+        )
+        family(
+            "process_start_time_seconds", "gauge", "Start time of the process since unix epoch",
+            [f"process_start_time_seconds {self.start_time:.3f}"],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def get_process_rss():
+    """Current resident set size in bytes (None if unknown on this platform)"""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil  # Optional, e.g. on Windows
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def start_metrics_server(metrics, host, port):
+    """Serve /metrics on a background thread"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the sniper log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"[OK] Metrics: http://{host}:{server.server_port}/metrics")
+    return server
+
+
+METRICS = Metrics()
+
+
+# ============================================================================
+# CONTROL API (daemon mode)
+# ============================================================================
+
+
+def start_control_server(engine, host, port, token="", region_loader=None):
+    """Serve the daemon control API on a background thread
+
+    Routes (JSON in and out):
+        GET    /status                  engine state and every target
+        POST   /pause, /resume, /burst, /stop
+        POST   /polling                 {"intensity": 2.0, "request_budget_per_minute": 40}
+        POST   /regions                 {"region": "eu-paris-1"} (entry from regions.json)
+        DELETE /regions/<region>
+        POST   /shapes                  {"ocpus": 1, "memory_in_gbs": 6, "position": 2}
+        DELETE /shapes/<index>
+
+    Changes are handed to the engine thread via engine.call(). Requests that
+    change something need "Content-Type: application/json" (no form posts
+    from a browser) and the bearer token if one is configured.
+    """
+
+    def add_region(body):
+        region_id = body.get("region")
+        if not isinstance(region_id, str) or not region_id:
+            raise ValueError("'region' is required")
+        if any(region["id"] == region_id for region in engine.call(lambda e: e._regions())):
+            raise ValueError(f"Region {region_id} is already being sniped")
+        region = region_loader(region_id)  # API calls outside of the engine thread
+        return engine.call(lambda e: e.add_region(region))
+
+    def add_rung(body):
+        position = body.get("position")
+        if position is not None and (not isinstance(position, int) or position < 0):
+            raise ValueError("'position' must be an index >= 0")
+        if not body.get("ocpus") or not body.get("memory_in_gbs"):
+            raise ValueError("'ocpus' and 'memory_in_gbs' are required")
+        error = rung_error({key: body[key] for key in ("shape", "ocpus", "memory_in_gbs") if key in body}, SHAPE)
+        if error:
+            raise ValueError(f"Invalid rung: {error}")
+        rung = make_rung(body)
+
+        def insert(e):
+            # On the engine thread: the ladder may change between requests
+            if rung in SHAPE_LADDER:
+                raise ValueError(f"{rung_label(rung)} is already on the shape ladder")
+            ladder = list(SHAPE_LADDER)
+            ladder.insert(len(ladder) if position is None else position, rung)
+            return e.set_shape_ladder(ladder)
+
+        return engine.call(insert)
+
+    def remove_rung(index):
+        def remove(e):
+            ladder = list(SHAPE_LADDER)
+            if not index.isdigit() or int(index) >= len(ladder):
+                raise ValueError(f"No shape ladder rung {index}")
+            del ladder[int(index)]
+            return e.set_shape_ladder(ladder)
+
+        return engine.call(remove)
+
+    post_routes = {
+        "/pause": lambda body: engine.call(lambda e: e.set_paused(True)),
+        "/resume": lambda body: engine.call(lambda e: e.set_paused(False)),
+        "/burst": lambda body: engine.call(lambda e: e.burst()),
+        "/stop": lambda body: engine.call(lambda e: e.stop()),
+        "/polling": lambda body: engine.call(
+            lambda e: e.set_polling(body.get("intensity"), body.get("request_budget_per_minute"))
+        ),
+        "/regions": add_region,
+        "/shapes": add_rung,
+    }
+    delete_routes = {
+        "/regions": lambda region_id: engine.call(lambda e: e.remove_region(region_id)),
+        "/shapes": remove_rung,
+    }
+
+    class ControlHandler(BaseHTTPRequestHandler):
+        def _reply(self, code, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self):
+            if token and self.headers.get("Authorization", "") != f"Bearer {token}":
+                self._reply(401, {"error": "unauthorized"})
+                return False
+            return True
+
+        def _run(self, action):
+            try:
+                self._reply(200, {"result": action()})
+            except ValueError as e:
+                self._reply(400, {"error": str(e)})
+            except FutureTimeoutError:
+                self._reply(503, {"error": "engine busy"})
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+
+        def _read_body(self):
+            if self.headers.get("Content-Type", "").split(";")[0].strip() != "application/json":
+                self._reply(415, {"error": "Content-Type must be application/json"})
+                return None
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                self._reply(400, {"error": "body must be a JSON object"})
+                return None
+            return body
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/status":
+                self._reply(404, {"error": "not found"})
+                return
+            if self._authorized():
+                self._run(lambda: engine.call(lambda e: e.status()))
+
+        def do_POST(self):
+            route = post_routes.get(self.path.split("?")[0])
+            if not route:
+                self._reply(404, {"error": "not found"})
+                return
+            if not self._authorized():
+                return
+            body = self._read_body()
+            if body is not None:
+                self._run(lambda: route(body))
+
+        def do_DELETE(self):
+            prefix, _, name = self.path.split("?")[0].rpartition("/")
+            route = delete_routes.get(prefix)
+            if not route or not name:
+                self._reply(404, {"error": "not found"})
+                return
+            if self._authorized() and self._read_body() is not None:
+                self._run(lambda: route(name))
+
+        def log_message(self, format, *args):
+            pass  # Changes are logged by the engine
+
+    server = ThreadingHTTPServer((host, port), ControlHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="control", daemon=True).start()
+    logger.info(f"[OK] Control API: http://{host}:{server.server_port}/status")
+    return server
+
+
+# ============================================================================
+# CONFIG RELOAD
+# ============================================================================
+
+
+class ConfigWatcher:
+    """Hot-reload sniper-config.json and regions.json into a running engine
+
+    Polls the modification time and size of both files every
+    config_reload_seconds. A change is validated with the same rules as at
+    startup (invalid JSON keeps the running configuration), regions whose
+    regions.json entry changed get new clients here, outside of the engine
+    thread, and the engine swaps everything in between two scheduling steps.
+    Unchanged regions keep their clients, warm connections, cached request
+    bodies and schedule state.
+    """
+
+    def __init__(self, engine, oci_config, region_ids=None):
+        self.engine = engine
+        self.oci_config = oci_config
+        self.region_ids = region_ids
+        self.paths = (config_file_path(), regions_file_path())
+        self.stamps = self._stamps()
+        self.stopping = threading.Event()
+
+    def _stamps(self):
+        stamps = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def start(self):
+        threading.Thread(target=self._run, name="config-watch", daemon=True).start()
+        logger.info(f"[OK] Watching config files for changes (every {CONFIG_RELOAD_SECONDS:g}s)")
+        return self
+
+    def stop(self):
+        self.stopping.set()
+
+    def _run(self):
+        while CONFIG_RELOAD_SECONDS and not self.stopping.wait(CONFIG_RELOAD_SECONDS):
+            stamps = self._stamps()
+            if stamps == self.stamps:
+                continue
+            self.stamps = stamps
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning(f"[!]  Config reload failed, keeping the running configuration: {str(e)}")
+
+    def _rebuild_regions(self, regions_file):
+        """Region dicts for changed, added (new dict) and removed (None) regions.json entries"""
+        if PROFILES:
+            return {}  # Account profiles bring their own region entries (restart to change)
+        current = {region["id"]: region for region in get_configured_regions(self.region_ids)}
+        wanted = {region["id"]: region for region in get_configured_regions(self.region_ids, regions_file)}
+        regions = {region_id: None for region_id in current if region_id not in wanted}
+        for region_id, region in wanted.items():
+            if current.get(region_id) != region:
+                init_region_clients(self.oci_config, region)
+                resolve_region(self.oci_config, region)
+                regions[region_id] = region
+        return regions
+
+    def reload(self):
+        config = load_config_file(strict=True)
+        regions_file = load_regions_file(strict=True)
+        regions = self._rebuild_regions(regions_file)
+        changes = self.engine.call(lambda e: e.reload_config(config, regions_file, regions), timeout=60)
+        logger.info(f"[OK] Config reloaded: {', '.join(changes) or 'no changes'}")
+        return changes
+
+
+# ============================================================================
+# RATE LIMITER (shared by all worker threads)
+# ============================================================================
+
+
+def parse_retry_after(headers, limit=300):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), None if absent"""
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), limit)
+
+
+class RateLimiter:
+    """Token bucket per (tenancy, region) shared by every launch and probe call
+
+    A 429 empties only the throttled bucket, blocks it for Retry-After (or an
+    exponential backoff without the header) and halves its refill rate and
+    burst, which then recover linearly over time (additive increase). Other
+    regions and tenancies keep their full speed while one is throttled.
+    """
+
+    MIN_RATE_FACTOR = 0.1
+    RECOVERY_PER_SECOND = 0.02  # Half rate -> full rate in 25s without new 429s
+    MAX_BACKOFF = 60
+
+    def __init__(self, rate_per_second=None, burst=None):
+        self._rate = rate_per_second
+        self._burst_size = burst
+        self.lock = threading.Lock()
+        self.buckets = {}
+        self.limits = {}  # key -> (rate, burst) of account profiles with their own limits
+
+    @property
+    def rate(self):
+        return self._rate or RATE_LIMIT_PER_SECOND  # Read at use: set by apply_config()
+
+    @property
+    def burst(self):
+        return self._burst_size or RATE_LIMIT_BURST
+
+    def set_limit(self, key, rate_per_second=None, burst=None):
+        """Own rate and burst for one key (account profile), None = the global setting"""
+        with self.lock:
+            self.limits[key] = (rate_per_second, burst)
+            self.buckets.pop(key, None)
+
+    def _limits(self, key):
+        rate, burst = self.limits.get(key, (None, None))
+        return rate or self.rate, burst or self.burst
+
+    def _bucket(self, key, now):
+        """Refill and return the bucket of one key (caller holds the lock)"""
+        bucket = self.buckets.get(key)
+        rate, burst = self._limits(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {
+                "key": key,
+                "tokens": float(burst),
+                "updated": now,
+                "blocked_until": 0.0,
+                "factor": 1.0,
+                "throttles": 0,
+            }
+        # No refill or recovery while blocked, so the bucket does not burst right after a pause
+        refill_from = max(bucket["updated"], min(bucket["blocked_until"], now))
+        bucket["factor"] = min(1.0, bucket["factor"] + (now - refill_from) * self.RECOVERY_PER_SECOND)
+        bucket["tokens"] = min(
+            self._burst(bucket), bucket["tokens"] + (now - refill_from) * rate * bucket["factor"]
+        )
+        bucket["updated"] = now
+        return bucket
+
+    def _burst(self, bucket):
+        return max(1.0, self._limits(bucket["key"])[1] * bucket["factor"])
+
+    def acquire(self, key, priority=False, cancel=None):
+        """Block until the bucket of key has a token, then take it
+
+        Normal calls (capacity probes) leave the last token to priority calls
+        (launch_instance), so a launch after a positive probe is not queued
+        behind the probes of other ADs. A cancelled CancelToken ends the wait
+        (AttemptCancelled).
+        """
+        while True:
+            if cancel:
+                cancel.check()
+            with self.lock:
+                now = time.monotonic()
+                bucket = self._bucket(key, now)
+                needed = 1 if priority or self._burst(bucket) < 2 else 2
+                if bucket["blocked_until"] > now:
+                    wait_seconds = bucket["blocked_until"] - now
+                elif bucket["tokens"] >= needed:
+                    bucket["tokens"] -= 1
+                    return
+                else:
+                    wait_seconds = (needed - bucket["tokens"]) / (self._limits(key)[0] * bucket["factor"])
+            if cancel:
+                cancel.sleep(wait_seconds)
+            else:
+                time.sleep(wait_seconds)
+
+    def wait_time(self, key):
+        """Seconds until key may send again (0 if a token is available now)"""
+        with self.lock:
+            now = time.monotonic()
+            bucket = self._bucket(key, now)
+            if bucket["blocked_until"] > now:
+                return bucket["blocked_until"] - now
+            if bucket["tokens"] >= 1:
+                return 0.0
+            return (1 - bucket["tokens"]) / (self._limits(key)[0] * bucket["factor"])
+
+    def throttled(self, key, retry_after=None):
+        """Register a 429 for key and return the enforced pause in seconds"""
+        with self.lock:
+            now = time.monotonic()
+            bucket = self._bucket(key, now)
+            if bucket["blocked_until"] <= now:
+                # Calls already in flight when the first 429 arrived do not count twice
+                bucket["throttles"] += 1
+                bucket["factor"] = max(self.MIN_RATE_FACTOR, bucket["factor"] / 2)
+            bucket["tokens"] = 0.0
+            if retry_after is None:
+                retry_after = min(self.MAX_BACKOFF, 2 ** bucket["throttles"])
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + retry_after)
+            return bucket["blocked_until"] - now
+
+    def ok(self, key):
+        """Register an answered, not throttled call for key (resets the backoff)"""
+        with self.lock:
+            self._bucket(key, time.monotonic())["throttles"] = 0
+
+
+def rate_key(region):
+    """Rate limiter key of a region dict: OCI throttles per tenancy and region"""
+    if not region:
+        return None
+    return region.get("tenancy_id"), region["id"]
+
+
+RATE_LIMITER = RateLimiter()
+
+
+# ============================================================================
+# LAUNCH COORDINATION (several processes/hosts, one instance)
+# ============================================================================
+
+
+class CoordinationError(Exception):
+    """The coordination backend failed (no launch without a lease)"""
+
+
+def coordination_goal(region):
+    """Name of the shared "target fulfilled" state a region's launches count towards
+
+    Snipers with the same key (default: instance_name) launch one instance
+    between them; every account profile has its own goal.
+    """
+    profile = region.get("profile") if region else None
+    return f"{COORDINATOR.key}:{profile}" if profile else COORDINATOR.key
+
+
+class Coordinator:
+    """One kept instance across sniper processes and hosts
+
+    Launch calls run in parallel without any lock. A successful launch
+    claims the goal: under the goal's lease, the first claim marks it
+    fulfilled and keeps its instance, later claims of other snipers lose
+    (their instance is a duplicate), and every engine polling fulfilled()
+    stops. The lease is only held for that check-and-mark; leases of the
+    backends with expiry (SQLite, Redis) are renewed while held and run
+    out when the holder dies.
+
+    Subclasses implement _try_acquire(), _renew(), _release(), _fulfilled(),
+    _fulfil() and _reset().
+    """
+
+    name = "none"
+    EXPIRES = True  # Lease runs out unless renewed
+
+    def __init__(self, key, lease_seconds=30, wait_seconds=5):
+        self.key = key  # Fixed at startup: a reloaded instance_name must not change the goal
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.lock = threading.Lock()
+        self.held = {}  # lease token -> goal, renewed by the renewer thread
+        self.renewer = None
+
+    def _backend(self, fn, *args):
+        try:
+            return fn(*args)
+        except (OSError, sqlite3.Error, ValueError) as e:
+            raise CoordinationError(f"{self.name}: {str(e)}") from e
+
+    def acquire(self, goal, cancel=None):
+        """Wait up to wait_seconds for the launch lease of goal
+
+        Returns:
+            Lease token, or None if the goal is fulfilled or another launch
+            still holds the lease
+
+        Raises:
+            AttemptCancelled: cancel was cancelled while waiting
+        """
+        token = f"{self.owner}:{uuid.uuid4().hex[:8]}"
+        deadline = time.monotonic() + self.wait_seconds
+        while not self._backend(self._try_acquire, goal, token):
+            if self.fulfilled(goal) or time.monotonic() >= deadline:
+                return None
+            if cancel:
+                cancel.sleep(0.1)
+            else:
+                time.sleep(0.1)
+        if self.fulfilled(goal):
+            # Won by the previous holder
+            self._backend(self._release, goal, token)
+            return None
+        with self.lock:
+            self.held[token] = goal
+            if self.EXPIRES and self.renewer is None:
+                self.renewer = threading.Thread(target=self._renew_loop, name="coordination", daemon=True)
+                self.renewer.start()
+        return token
+
+    def _renew_loop(self):
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            with self.lock:
+                held = dict(self.held)
+                if not held:
+                    self.renewer = None
+                    return
+            for token, goal in held.items():
+                try:
+                    self._backend(self._renew, goal, token)
+                except CoordinationError as e:
+                    logger.warning(f"[!]  {t('coordination_error')}: {str(e)}")
+
+    def release(self, goal, token):
+        """Give the lease back (a failure only delays the others until it runs out)"""
+        with self.lock:
+            self.held.pop(token, None)
+        try:
+            self._backend(self._release, goal, token)
+        except CoordinationError as e:
+            logger.warning(f"[!]  {t('coordination_error')}: {str(e)}")
+
+    def fulfilled(self, goal):
+        """Marker of the launch that fulfilled goal ({"owner", "instance_id", ...}) or None"""
+        return self._backend(self._fulfilled, goal)
+
+    def claim(self, goal, instance, region=None):
+        """Decide who keeps a win: mark goal fulfilled unless another sniper did first
+
+        Returns:
+            True if instance keeps the win (also when the goal was fulfilled
+            by this process: its own duplicates are left to reconcile_instances())
+        """
+        try:
+            token = self.acquire(goal)
+            marker = self.fulfilled(goal) if token is None else None
+        except CoordinationError as e:
+            # The instance exists either way; the others may launch another one
+            logger.error(f"[X] {t('coordination_error')}: {str(e)}")
+            return True
+        if token is None:
+            # Fulfilled meanwhile, or the lease is stuck: keep the win unless another sniper has it
+            if marker is None:
+                logger.warning(f"[!]  {t('coordination_error')}: lease of {goal} busy, keeping the instance")
+            return marker is None or marker.get("owner") == self.owner
+        try:
+            self.fulfil(goal, instance, region)
+        finally:
+            self.release(goal, token)
+        return True
+
+    def fulfil(self, goal, instance, region=None):
+        """Mark goal fulfilled by a launched instance (while holding its lease, see claim())"""
+        marker = {
+            "owner": self.owner,
+            "instance_id": instance.id,
+            "region": region["id"] if region else None,
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        try:
+            self._backend(self._fulfil, goal, marker)
+        except CoordinationError as e:
+            # The instance exists either way; the others may launch another one
+            logger.error(f"[X] {t('coordination_error')}: {str(e)}")
+
+    def reset(self, goal):
+        """Forget the win of goal, so the snipers launch another instance"""
+        self._backend(self._reset, goal)
+
+
+class FileCoordinator(Coordinator):
+    """Leases are OS file locks, the fulfilled marker a JSON file per goal
+
+    The OS drops the lock of a dead holder, so leases need no expiry.
+    Covers the processes of one host, or of several hosts sharing a
+    directory with working byte-range locks (SMB share).
+    """
+
+    name = "file"
+    EXPIRES = False
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.files = {}  # lease token -> open lock file
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, goal, suffix):
+        return os.path.join(self.path, re.sub(r"[^\w.-]", "_", goal) + suffix)
+
+    def _try_acquire(self, goal, token):
+        handle = open(self._file(goal, ".lock"), "a+b")
+        try:
+            handle.seek(0)
+            if os.name == "nt":
+                import msvcrt
+
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        with self.lock:
+            self.files[token] = handle
+        return True
+
+    def _renew(self, goal, token):
+        pass
+
+    def _release(self, goal, token):
+        with self.lock:
+            handle = self.files.pop(token, None)
+        if handle:
+            # Closing the file drops the lock
+            if os.name == "nt":
+                import msvcrt
+
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            handle.close()
+
+    def _fulfilled(self, goal):
+        try:
+            with open(self._file(goal, ".fulfilled.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _fulfil(self, goal, marker):
+        path = self._file(goal, ".fulfilled.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(marker, f)
+        os.replace(path + ".tmp", path)
+
+    def _reset(self, goal):
+        try:
+            os.remove(self._file(goal, ".fulfilled.json"))
+        except FileNotFoundError:
+            pass
+
+
+class SqliteCoordinator(Coordinator):
+    """Leases and fulfilled markers in a SQLite database (expiry by wall clock)
+
+    For processes of one host, or hosts sharing the database file on a
+    network drive with working file locks and roughly synchronized clocks.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._transaction(
+            ("CREATE TABLE IF NOT EXISTS leases (goal TEXT PRIMARY KEY, token TEXT NOT NULL, expires REAL NOT NULL)", ()),
+            ("CREATE TABLE IF NOT EXISTS fulfilled (goal TEXT PRIMARY KEY, marker TEXT NOT NULL)", ()),
+        )
+
+    def _transaction(self, *statements):
+        """Run (sql, params) statements in one write transaction, return the rows of the last one"""
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, params in statements:
+                rows = conn.execute(sql, params).fetchall()
+            conn.execute("COMMIT")
+            return rows
+        finally:
+            conn.close()
+
+    def _try_acquire(self, goal, token):
+        now = time.time()
+        rows = self._transaction(
+            ("DELETE FROM leases WHERE goal = ? AND expires < ?", (goal, now)),
+            (
+                "INSERT OR IGNORE INTO leases (goal, token, expires) VALUES (?, ?, ?)",
+                (goal, token, now + self.lease_seconds),
+            ),
+            ("SELECT token FROM leases WHERE goal = ?", (goal,)),
+        )
+        return rows[0][0] == token
+
+    def _renew(self, goal, token):
+        self._transaction(
+            (
+                "UPDATE leases SET expires = ? WHERE goal = ? AND token = ?",
+                (time.time() + self.lease_seconds, goal, token),
+            ),
+        )
+
+    def _release(self, goal, token):
+        self._transaction(("DELETE FROM leases WHERE goal = ? AND token = ?", (goal, token)))
+
+    def _fulfilled(self, goal):
+        rows = self._transaction(("SELECT marker FROM fulfilled WHERE goal = ?", (goal,)))
+        return json.loads(rows[0][0]) if rows else None
+
+    def _fulfil(self, goal, marker):
+        self._transaction(
+            ("INSERT OR IGNORE INTO fulfilled (goal, marker) VALUES (?, ?)", (goal, json.dumps(marker))),
+        )
+
+    def _reset(self, goal):
+        self._transaction(("DELETE FROM fulfilled WHERE goal = ?", (goal,)))
+
+
+class RedisCoordinator(Coordinator):
+    """Leases (SET NX PX, renewed while held) and fulfilled markers in Redis
+
+    Works across hosts with any Redis-compatible server; speaks the RESP
+    protocol directly, so no client package is needed. For local tests,
+    scripts/fake-oci-server.py --redis-port runs a stand-in.
+    """
+
+    name = "redis"
+    KEY_PREFIX = "oci-sniper"
+    # Only the holder may extend or delete its lease
+    RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, url, timeout=5, **kwargs):
+        super().__init__(**kwargs)
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Unsupported coordination url {url} (redis:// or rediss://)")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.tls = parsed.scheme == "rediss"
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.io_lock = threading.Lock()
+        self.sock = self.reader = None
+        self.command("PING")  # Fail at startup, not at the first launch
+
+    # ---------------------------------------------------------------- RESP
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        if self.tls:
+            import ssl
+
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        self.sock, self.reader = sock, sock.makefile("rb")
+        if self.password:
+            self._send(["AUTH"] + ([self.username] if self.username else []) + [self.password])
+            self._reply()
+        if self.db:
+            self._send(["SELECT", str(self.db)])
+            self._reply()
+
+    def _close(self):
+        if self.sock:
+            try:
+                self.reader.close()
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = self.reader = None
+
+    def _send(self, args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode("utf-8")
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self.sock.sendall(b"".join(parts))
+
+    def _reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the coordination server")
+        kind, body = line[:1], line[1:-2].decode("utf-8")
+        if kind == b"+":
+            return body
+        if kind == b"-":
+            raise CoordinationError(f"redis: {body}")
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            if int(body) < 0:
+                return None
+            return self.reader.read(int(body) + 2)[:-2].decode("utf-8")
+        if kind == b"*":
+            return None if int(body) < 0 else [self._reply() for _ in range(int(body))]
+        raise ConnectionError(f"Unexpected reply from the coordination server: {line[:40]!r}")
+
+    def command(self, *args):
+        """Send one command and return its reply (reconnects once on a dropped connection)"""
+        with self.io_lock:
+            for attempt in range(2):
+                try:
+                    if self.sock is None:
+                        self._connect()
+                    self._send(list(args))
+                    return self._reply()
+                except OSError:
+                    self._close()
+                    if attempt:
+                        raise
+
+    # ---------------------------------------------------------------- leases
+    def _key(self, goal, kind):
+        return f"{self.KEY_PREFIX}:{goal}:{kind}"
+
+    def _try_acquire(self, goal, token):
+        reply = self.command("SET", self._key(goal, "lease"), token, "NX", "PX", str(int(self.lease_seconds * 1000)))
+        return reply == "OK"
+
+    def _renew(self, goal, token):
+        self.command(
+            "EVAL", self.RENEW_SCRIPT, "1", self._key(goal, "lease"), token, str(int(self.lease_seconds * 1000))
+        )
+
+    def _release(self, goal, token):
+        self.command("EVAL", self.RELEASE_SCRIPT, "1", self._key(goal, "lease"), token)
+
+    def _fulfilled(self, goal):
+        marker = self.command("GET", self._key(goal, "fulfilled"))
+        return json.loads(marker) if marker else None
+
+    def _fulfil(self, goal, marker):
+        self.command("SET", self._key(goal, "fulfilled"), json.dumps(marker), "NX")
+
+    def _reset(self, goal):
+        self.command("DEL", self._key(goal, "fulfilled"))
+
+
+def open_coordinator():
+    """Open the configured coordination backend (None for "none")
+
+    Raises:
+        CoordinationError: The backend is unreachable (sniping without it could launch duplicates)
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    options = {
+        "key": COORDINATION_KEY,
+        "lease_seconds": COORDINATION_LEASE_SECONDS,
+        "wait_seconds": COORDINATION_WAIT_SECONDS,
+    }
+    try:
+        if COORDINATION_BACKEND == "file":
+            return FileCoordinator(COORDINATION_PATH or os.path.join(root, "oci-sniper-coordination"), **options)
+        if COORDINATION_BACKEND == "sqlite":
+            return SqliteCoordinator(COORDINATION_PATH or os.path.join(root, "oci-sniper-coordination.db"), **options)
+        if COORDINATION_BACKEND == "redis":
+            return RedisCoordinator(COORDINATION_URL, **options)
+    except (OSError, sqlite3.Error, ValueError) as e:
+        raise CoordinationError(f"{COORDINATION_BACKEND}: {str(e)}") from e
+    return None
+
+
+# ============================================================================
+# REGIONS (config/regions.json)
+# ============================================================================
+
+
+def get_configured_regions(region_ids=None, entries=None):
+    """Build the list of regions to snipe in
+
+    Every entry of config/regions.json with a subnet OCID is a configured
+    region. Missing compartment/image values fall back to the module globals.
+    A requested region that is not in regions.json is built from the globals
+    (environment / .env), which keeps single-region setups working.
+
+    Args:
+        region_ids: Optional list of region identifiers (e.g. ["eu-frankfurt-1"])
+        entries: regions.json content (default: the loaded REGIONS_FILE)
+
+    Returns:
+        List of region dicts (id, name, compartment_id, image_id, subnet_id)
+    """
+    regions = []
+
+    for region_id, entry in (REGIONS_FILE if entries is None else entries).items():
+        if not isinstance(entry, dict) or not entry.get("subnet_id"):
+            continue  # Region not set up yet
+        if region_ids and region_id not in region_ids:
+            continue
+        regions.append(
+            {
+                "id": region_id,
+                "name": entry.get("name", region_id),
+                "compartment_id": entry.get("compartment_id") or COMPARTMENT_ID,
+                "image_id": entry.get("image_id") or IMAGE_ID,
+                "subnet_id": entry["subnet_id"],
+                "reserved_public_ip_ocid": entry.get("reserved_public_ip_ocid", ""),
+            }
+        )
+
+    # Requested regions without an entry in regions.json use the globals
+    known = {region["id"] for region in regions}
+    for region_id in region_ids or []:
+        if region_id not in known:
+            regions.append(
+                {
+                    "id": region_id,
+                    "name": region_id,
+                    "compartment_id": COMPARTMENT_ID,
+                    "image_id": IMAGE_ID,
+                    "subnet_id": SUBNET_ID,
+                    "reserved_public_ip_ocid": "",
+                }
+            )
+
+    return regions
+
+
+def load_oci_config(profile=None):
+    """Load the OCI config from ~/.oci/config
+
+    With an endpoint override (fake OCI server) and no usable config file, a
+    throwaway offline identity with a freshly generated key is used instead.
+
+    Args:
+        profile: Profile section of ~/.oci/config (default: CONFIG_PROFILE)
+    """
+    try:
+        return oci.config.from_file("~/.oci/config", profile or CONFIG_PROFILE)
+    except Exception:
+        if not ENDPOINT_OVERRIDE:
+            raise
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    logger.warning(f"[!]  No usable ~/.oci/config - using an offline test identity for {ENDPOINT_OVERRIDE}")
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return {
+        "user": "ocid1.user.oc1..offline",
+        "tenancy": f"ocid1.tenancy.oc1..offline{'-' + profile.lower() if profile else ''}",
+        "fingerprint": "00:00:00:00:00:00:00:00:00:00:00:00:00:00:00:00",
+        "key_content": key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode("ascii"),
+        "region": os.getenv("OCI_REGION", "eu-frankfurt-1").split(",")[0],
+    }
+
+
+def init_region_clients(oci_config, region):
+    """Create region-scoped OCI clients and store them in the region dict
+
+    Args:
+        oci_config: OCI config dict loaded from ~/.oci/config
+        region: Region dict from get_configured_regions()
+    """
+    region_config = dict(oci_config)
+    if region["id"]:
+        region_config["region"] = region["id"]
+    else:
+        # Legacy single-region mode: use the region from ~/.oci/config
+        region["id"] = region["name"] = region_config["region"]
+
+    region["tenancy_id"] = region_config["tenancy"]  # Capacity reports need the root compartment
+    region["capacity_probe"] = CAPACITY_PROBE
+    client_kwargs = {}
+    if ENDPOINT_OVERRIDE:
+        client_kwargs["service_endpoint"] = ENDPOINT_OVERRIDE.replace("{region}", region["id"])
+
+    region["compute_client"] = oci.core.ComputeClient(region_config, **client_kwargs)
+    region["network_client"] = oci.core.VirtualNetworkClient(region_config, **client_kwargs)
+    region["identity_client"] = oci.identity.IdentityClient(region_config, **client_kwargs)
+    region["work_request_client"] = oci.work_requests.WorkRequestClient(region_config, **client_kwargs)
+
+
+def resolve_region(oci_config, region, saved=None):
+    """Resolve the full AD names and the reserved IP of a region
+
+    Args:
+        oci_config: OCI config dict loaded from ~/.oci/config
+        region: Region dict with clients from init_region_clients()
+        saved: Region state from the checkpoint (AD names, chosen reserved IP)
+    """
+    saved = saved or {}
+
+    # Get full availability domain names
+    if saved.get("ad_names"):
+        region["ad_names"] = saved["ad_names"]
+        logger.info(f"{profile_prefix(region)}[{region['id']}] {t('available_ads')}: {', '.join(region['ad_names'])}")
+    else:
+        resolve_ad_names(oci_config, region)
+
+    # Reserved IPs are regional: only use a configured OCID from this region
+    configured_ip_ocid = region.get("reserved_public_ip_ocid", "").strip()
+    if not configured_ip_ocid:
+        global_ip_ocid = CONFIG_FILE.get("reserved_public_ip_ocid", "").strip()
+        if f".{region['id']}." in global_ip_ocid:
+            configured_ip_ocid = global_ip_ocid
+    # The reserved IP found by the last run (no list_public_ips scan)
+    configured_ip_ocid = configured_ip_ocid or saved.get("reserved_ip_id") or ""
+
+    region["reserved_ip"] = get_or_create_reserved_ip(
+        region["network_client"], region["compartment_id"],
+        reserved_ip_ocid=configured_ip_ocid if configured_ip_ocid else None,
+        create_if_missing=False  # Nur nutzen wenn vorhanden, nicht erstellen
+    )
+
+
+def resolve_ad_names(oci_config, region):
+    """Full availability domain names of a region (fallback: AVAILABILITY_DOMAINS)"""
+    try:
+        list_ads = region["identity_client"].list_availability_domains(
+            oci_config["tenancy"]
+        )
+        region["ad_names"] = [ad.name for ad in list_ads.data]
+        logger.info(f"{profile_prefix(region)}[{region['id']}] {t('available_ads')}: {', '.join(region['ad_names'])}")
+    except Exception as e:
+        logger.warning(f"{profile_prefix(region)}[{region['id']}] Could not fetch AD names: {str(e)}")
+        region["ad_names"] = AVAILABILITY_DOMAINS
+
+
+# ============================================================================
+# MAIN FUNCTIONS
+# ============================================================================
+
+
+def create_instance_config(availability_domain, reserved_ip_id=None, region=None, rung=None):
+    """Create instance configuration for the given availability domain.
+
+    Region-specific OCIDs (compartment, image, subnet) are taken from the
+    region dict if given, otherwise from the module globals. The shape
+    configuration comes from the given shape ladder rung (default: the best).
+    """
+
+    region = region or {}
+    rung = rung or SHAPE_LADDER[0]
+
+    # Launched with the ephemeral IP; attach_reserved_ip() swaps in the reserved one after launch
+    # (and assigns a new ephemeral IP if binding fails after the swap started)
+    create_vnic_details = oci.core.models.CreateVnicDetails(
+        subnet_id=region.get("subnet_id", SUBNET_ID),
+        assign_public_ip=ASSIGN_PUBLIC_IP,
+    )
+
+    instance_details = oci.core.models.LaunchInstanceDetails(
+        availability_domain=availability_domain,
+        compartment_id=region.get("compartment_id", COMPARTMENT_ID),
+        display_name=INSTANCE_NAME,
+        shape=rung["shape"],
+        shape_config=oci.core.models.LaunchInstanceShapeConfigDetails(
+            ocpus=rung["ocpus"], memory_in_gbs=rung["memory_in_gbs"]
+        ) if rung["ocpus"] else None,  # Fixed shapes take no shape config
+        create_vnic_details=create_vnic_details,
+        metadata={"ssh_authorized_keys": SSH_PUBLIC_KEY},
+        source_details=oci.core.models.InstanceSourceViaImageDetails(
+            image_id=region.get("image_id", IMAGE_ID),
+            source_type="image",
+            boot_volume_size_in_gbs=BOOT_VOLUME_SIZE_IN_GBS
+        ),
+    )
+
+    return instance_details
+
+
+def create_capacity_report_details(availability_domain, region, rungs):
+    """Capacity report request for several shape configurations in one AD"""
+    return oci.core.models.CreateComputeCapacityReportDetails(
+        compartment_id=region["tenancy_id"],
+        availability_domain=availability_domain,
+        shape_availabilities=[
+            oci.core.models.CreateCapacityReportShapeAvailabilityDetails(
+                instance_shape=rung["shape"],
+                instance_shape_config=oci.core.models.CapacityReportInstanceShapeConfig(
+                    ocpus=rung["ocpus"], memory_in_gbs=rung["memory_in_gbs"]
+                ) if rung["ocpus"] else None,
+            )
+            for rung in rungs
+        ],
+    )
+
+
+def rung_key(rung):
+    return rung["shape"], rung["ocpus"], rung["memory_in_gbs"]
+
+
+def rung_label(rung):
+    """Short description of a shape ladder rung, e.g. "2 OCPUs / 12 GB" """
+    label = f"{rung['ocpus']:g} OCPUs / {rung['memory_in_gbs']:g} GB" if rung["ocpus"] else rung["shape"]
+    if rung["ocpus"] and rung["shape"] != SHAPE:
+        label = f"{rung['shape']} {label}"
+    return label
+
+
+def get_payload(compute_client, key, build):
+    """Request body for key, built and sanitized once
+
+    The model objects of a launch or probe request are identical on every
+    attempt for the same (region, AD, shape config). The body is cached as the
+    sanitized dict, so the hot path skips building the models and their
+    type-checked field-by-field conversion. The SDK still walks the plain dict
+    and JSON-encodes it on every call (a string body would be encoded again).
+    apply_config() starts a new cache when the settings change, keys carry the
+    region generation (bumped when a config reload rebuilds it).
+    """
+    cache = PAYLOAD_CACHE
+    payload = cache.get(key)
+    if payload is None:
+        payload = compute_client.base_client.sanitize_for_serialization(build())
+        cache[key] = payload
+    return payload
+
+
+def payload_region(region):
+    """Region part of a payload cache key"""
+    return region and (region["id"], region.get("profile"), region.get("generation", 0))
+
+
+class AttemptCancelled(Exception):
+    """The goal of an attempt was reached meanwhile (see CancelToken)"""
+
+
+class CancelToken:
+    """Cooperative cancellation of the attempts in flight after a win
+
+    Threaded through try_create_instance() into every wait of an attempt
+    (rate limiter, coordination lease, retry backoff): once cancelled,
+    those raise AttemptCancelled at once. A launch call already sent is
+    not interrupted.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def check(self):
+        if self.event.is_set():
+            raise AttemptCancelled()
+
+    def sleep(self, seconds):
+        """time.sleep() that ends early when cancelled"""
+        if self.event.wait(seconds):
+            raise AttemptCancelled()
+
+
+def _launch_instance(
+    compute_client, instance_details, availability_domain, limiter_key=None, retry_token=None, cancel=None
+):
+    """Single launch_instance call
+
+    Every call (including network retries) takes a token from the shared rate
+    limiter; a 429 throttles the limiter bucket of limiter_key.
+    """
+    RATE_LIMITER.acquire(limiter_key, priority=True, cancel=cancel)
+    logger.info(f"{t('attempting_create')} {availability_domain}...", extra=coalesced(availability_domain, "attempt"))
+    started = time.monotonic()
+    responded = False
+    try:
+        response = compute_client.launch_instance(instance_details, opc_retry_token=retry_token)
+        responded = True
+        RATE_LIMITER.ok(limiter_key)
+        return response
+    except oci.exceptions.ServiceError as e:
+        responded = True
+        if e.status == 429:
+            RATE_LIMITER.throttled(limiter_key, parse_retry_after(e.headers))
+        else:
+            RATE_LIMITER.ok(limiter_key)
+        raise
+    finally:
+        METRICS.observe_launch(availability_domain, time.monotonic() - started, responded)
+
+
+def _launch_instance_with_retry(
+    compute_client, instance_details, availability_domain, limiter_key=None, retry_token=None, cancel=None
+):
+    """Internal function to launch instance with retry logic for network errors.
+
+    All calls of one launch send the same opc-retry-token: a retry after a
+    lost response gets the instance of the first call back instead of
+    launching a second one. The backoff between retries ends with
+    AttemptCancelled as soon as cancel is cancelled.
+    """
+    retry_token = retry_token or uuid.uuid4().hex
+
+    # tenacity is imported here (not at module level) to keep startup fast
+    from tenacity import (
+        Retrying,
+        before_sleep_log,
+        retry_if_exception_type,
+        stop_after_attempt,
+        wait_exponential,
+    )
+
+    def before_sleep(retry_state):
+        """Log the retry and count it for the metrics"""
+        before_sleep_log(logger, logging.WARNING)(retry_state)
+        METRICS.observe_retry(availability_domain)
+
+    retrying = Retrying(
+        retry=retry_if_exception_type(
+            (
+                oci.exceptions.RequestException,
+                oci.exceptions.ConnectTimeout,
+                ConnectionError,
+                TimeoutError,
+            )
+        ),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        before_sleep=before_sleep,
+        reraise=True,
+        **({"sleep": cancel.sleep} if cancel else {}),
+    )
+    return retrying(
+        _launch_instance, compute_client, instance_details, availability_domain, limiter_key, retry_token, cancel
+    )
+
+
+def probe_capacity(compute_client, availability_domain, region, rungs=None, cancel=None):
+    """Ask the compute capacity report API which shape configurations fit in an AD
+
+    Much cheaper than a full launch_instance just to learn "Out of host
+    capacity", and one report covers the whole shape ladder. Probes share the
+    rate limiter bucket of the region, but leave the last token to launch
+    calls.
+
+    Returns:
+        The rungs worth launching in ladder order (every rung not reported
+        as out of capacity, [] if none fits), or None if the probe failed
+        (launch blindly)
+
+    Raises:
+        oci.exceptions.ServiceError: 429 TooManyRequests, so the attempt is
+        skipped instead of launching blindly into a throttled region
+    """
+    rungs = rungs or SHAPE_LADDER
+    try:
+        report_details = get_payload(
+            compute_client,
+            ("probe", payload_region(region), availability_domain, tuple(rung_key(rung) for rung in rungs)),
+            lambda: create_capacity_report_details(availability_domain, region, rungs),
+        )
+        RATE_LIMITER.acquire(rate_key(region), cancel=cancel)
+        # No SDK default retries: 429s must reach the rate limiter
+        report = compute_client.create_compute_capacity_report(
+            report_details, retry_strategy=oci.retry.NoneRetryStrategy()
+        ).data
+        METRICS.observe_api_response()
+        RATE_LIMITER.ok(rate_key(region))
+    except oci.exceptions.ServiceError as e:
+        METRICS.observe_api_response()
+        if e.status == 429:
+            RATE_LIMITER.throttled(rate_key(region), parse_retry_after(e.headers))
+            raise
+        RATE_LIMITER.ok(rate_key(region))
+        if e.status in (401, 403, 404):
+            # Not allowed in this tenancy/region - stop probing, launch blindly
+            region["capacity_probe"] = False
+            logger.warning(
+                f"[!]  Capacity report not available in {region['id']} ({e.status}), launching without probe"
+            )
+        else:
+            logger.debug(f"Capacity probe failed in {availability_domain}: {e.message}")
+        return None
+    except AttemptCancelled:
+        raise
+    except Exception as e:
+        logger.debug(f"Capacity probe failed in {availability_domain}: {str(e)}")
+        return None
+
+    out_of_capacity = set()
+    for shape in report.shape_availabilities or []:
+        if shape.availability_status == "OUT_OF_HOST_CAPACITY":
+            config = shape.instance_shape_config
+            out_of_capacity.add(
+                (shape.instance_shape, config.ocpus if config else None, config.memory_in_gbs if config else None)
+            )
+    return [rung for rung in rungs if rung_key(rung) not in out_of_capacity]
+
+
+LAUNCH_TAG = "oci-sniper-retry-token"  # Freeform tag carrying the opc-retry-token of a launch
+
+
+class LaunchLedger:
+    """Launch calls of this process, per account profile (for reconcile_instances())
+
+    Tracks the calls in flight, the instances launched and the retry tokens
+    of launches without an answer yet. Each launch tags its instance with its
+    token (LAUNCH_TAG), so an instance of a launch that never got a response
+    is still recognized as ours. A token is dropped once its launch has an
+    answer (instance id or error); of the unanswered ones only the newest
+    max_unanswered are kept, so a daemon does not collect them forever.
+    """
+
+    def __init__(self, max_unanswered=1000):
+        self.condition = threading.Condition()
+        self.in_flight = {}  # profile -> launch calls running
+        self.instance_ids = set()
+        self.retry_tokens = {}  # Unanswered tokens, oldest first
+        self.max_unanswered = max_unanswered
+
+    @staticmethod
+    def _profile(region):
+        return region.get("profile") if region else None
+
+    def begin(self, region):
+        with self.condition:
+            profile = self._profile(region)
+            self.in_flight[profile] = self.in_flight.get(profile, 0) + 1
+
+    def end(self, region):
+        with self.condition:
+            self.in_flight[self._profile(region)] -= 1
+            self.condition.notify_all()
+
+    def launched(self, region, instance, retry_token=None):
+        with self.condition:
+            self.instance_ids.add(instance.id)
+            self.retry_tokens.pop(retry_token, None)
+
+    def sent(self, retry_token):
+        with self.condition:
+            self.retry_tokens.pop(retry_token, None)  # A retried token moves to the end
+            self.retry_tokens[retry_token] = None
+            while len(self.retry_tokens) > self.max_unanswered:
+                del self.retry_tokens[next(iter(self.retry_tokens))]
+
+    def answered(self, retry_token):
+        """The launch got an error response: it launched nothing"""
+        with self.condition:
+            self.retry_tokens.pop(retry_token, None)
+
+    def is_own(self, instance):
+        """Instance launched by this process (answered or not)"""
+        with self.condition:
+            return (
+                instance.id in self.instance_ids
+                or (instance.freeform_tags or {}).get(LAUNCH_TAG) in self.retry_tokens
+            )
+
+    def wait_idle(self, region, timeout):
+        """Wait until no launch call of region's account profile is running
+
+        Returns:
+            False if calls were still running after timeout seconds
+        """
+        profile = self._profile(region)
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.in_flight.get(profile), timeout)
+
+
+LAUNCHES = LaunchLedger()
+
+
+def try_create_instance(
+    compute_client, availability_domain, reserved_ip_id=None, region=None, target=None, cancel=None
+):
+    """Attempt to create an instance in the specified availability domain.
+
+    If a scheduler target dict is given, the attempt's outcome is stored in
+    target["last_outcome"] for the scheduler. A target with its own shape
+    ladder rung ("concurrent" ladder mode) only tries that rung; otherwise
+    the rungs are tried best first until one launches. With a coordination
+    backend a launch is only kept if its claim wins; outcome "fulfilled"
+    means another sniper has launched the instance. A cancelled
+    CancelToken abandons the attempt at its next wait (outcome "cancelled").
+    """
+
+    # Outcome of this attempt for the history store
+    started = time.monotonic()
+    outcome, status_code, capacity = "error", None, None
+    rungs = [target["rung"]] if target and target.get("rung") else SHAPE_LADDER
+    rung = rungs[0]
+
+    try:
+        if cancel:
+            cancel.check()
+
+        # Cheap pre-probe: only send the full launch where capacity is reported
+        if region and region.get("capacity_probe"):
+            candidates = probe_capacity(compute_client, availability_domain, region, rungs, cancel)
+            if candidates == []:
+                logger.warning(
+                    f"[...] {t('no_capacity')} {availability_domain}: Out of host capacity (capacity report).",
+                    extra=coalesced(availability_domain, "no_capacity"),
+                )
+                outcome, capacity = "probe_no_capacity", False
+                return False, None
+            rungs = candidates or rungs
+
+        # Coordinated snipers: no launch once another sniper has won (claimed after the launch)
+        coordinator = COORDINATOR
+        if coordinator:
+            goal = coordination_goal(region)
+            if coordinator.fulfilled(goal):
+                outcome = "fulfilled"
+                return False, None
+
+        LAUNCHES.begin(region)
+        try:
+            for index, rung in enumerate(rungs):
+                if cancel:
+                    cancel.check()
+                instance_details = get_payload(
+                    compute_client,
+                    ("launch", payload_region(region), availability_domain, reserved_ip_id, rung_key(rung)),
+                    lambda: create_instance_config(availability_domain, reserved_ip_id, region, rung),
+                )
+
+                # Call with retry logic for network errors. A launch left without any response keeps
+                # its token, so the next attempt gets its instance (if any) instead of a second one.
+                retry_tokens = target.setdefault("retry_tokens", {}) if target is not None else {}
+                retry_token = retry_tokens.setdefault(rung_key(rung), uuid.uuid4().hex)
+                # The token as a tag identifies the instance in reconcile_instances() even without a response
+                instance_details = dict(instance_details, freeformTags={LAUNCH_TAG: retry_token})
+                LAUNCHES.sent(retry_token)
+                try:
+                    response = _launch_instance_with_retry(
+                        compute_client, instance_details, availability_domain, rate_key(region), retry_token, cancel
+                    )
+                    retry_tokens.pop(rung_key(rung), None)
+                    break
+                except oci.exceptions.ServiceError as e:
+                    retry_tokens.pop(rung_key(rung), None)
+                    LAUNCHES.answered(retry_token)
+                    if e.status == 500 and "Out of host capacity" in e.message and index < len(rungs) - 1:
+                        # Fall back to the next (smaller) configuration in the same attempt
+                        logger.warning(
+                            f"[...] {t('no_capacity')} {availability_domain} ({rung_label(rung)}), "
+                            f"{t('trying_rung')} {rung_label(rungs[index + 1])}",
+                            extra=coalesced(availability_domain, "rung_fallback"),
+                        )
+                        continue
+                    raise
+            LAUNCHES.launched(region, response.data, retry_token)
+        finally:
+            LAUNCHES.end(region)
+
+        if coordinator and not coordinator.claim(goal, response.data, region):
+            # Another sniper won first: this instance is a duplicate
+            logger.warning(f"[!]  {t('fulfilled_elsewhere')}")
+            if RECONCILE_ENABLED and RECONCILE_POLICY != "report":
+                terminate_duplicate(region, response.data)
+            else:
+                logger.warning(f"[!]  {t('duplicate_instance')}: {response.data.id} ({availability_domain})")
+            outcome = "fulfilled"
+            return False, None
+
+        logger.info(f"[OK] {t('success')} {availability_domain}!")
+        if len(SHAPE_LADDER) > 1:
+            logger.info(f"Shape: {rung_label(rung)}")
+        logger.info(f"{t('instance_ocid')}: {response.data.id}")
+        logger.info(f"{t('instance_state')}: {response.data.lifecycle_state}")
+
+        outcome, status_code, capacity = "success", 200, True
+        if target is not None:
+            # Followed by wait_for_instance_running()
+            target["work_request_id"] = response.headers.get("opc-work-request-id")
+        return True, response.data
+
+    except oci.exceptions.ServiceError as e:
+        status_code = e.status
+        if e.status == 500 and "Out of host capacity" in e.message:
+            logger.warning(
+                f"[...] {t('no_capacity')} {availability_domain}: Out of host capacity.",
+                extra=coalesced(availability_domain, "no_capacity"),
+            )
+            outcome, capacity = "no_capacity", False
+            return False, None
+        elif e.status == 400:
+            # Check for service limit errors (quota exceeded)
+            if "service limits were exceeded" in e.message.lower():
+                logger.error(f"[X] {t('quota_exceeded')} {availability_domain}")
+                logger.error(f"    {e.message}")
+                logger.error("")
+                logger.error(t('quota_hint'))
+                outcome = "quota"
+                # Return special code to signal quota error
+                return "QUOTA_ERROR", None
             else:
                 logger.error(f"[X] {t('bad_request')} {availability_domain}: {e.message}")
+                outcome = "bad_request"
                 return False, None
         elif e.status == 401:
             logger.error(f"[X] {t('auth_failed')}: {e.message}")
+            outcome = "auth_failed"
             sys.exit(1)
+        elif e.status == 429:
+            # The rate limiter already paused this tenancy/region
+            pause = RATE_LIMITER.wait_time(rate_key(region))
+            logger.warning(
+                f"[!]  {t('throttled')} {availability_domain}: {pause:.0f}s",
+                extra=coalesced(availability_domain, "throttled"),
+            )
+            outcome = "throttled"
+            return False, None
+        else:
+            logger.error(f"[X] {t('error_in_ad')} {availability_domain}: {e.message}")
+            outcome = "service_error"
+            return False, None
+
+    except (
+        oci.exceptions.RequestException,
+        oci.exceptions.ConnectTimeout,
+        ConnectionError,
+        TimeoutError,
+    ) as e:
+        # Network errors after all retries exhausted
+        logger.error(
+            f"[X] Network error in {availability_domain} after retries: {str(e)}"
+        )
+        outcome = "network_error"
+        return False, None
+
+    except AttemptCancelled:
+        logger.debug(f"Attempt in {availability_domain} cancelled")
+        outcome = "cancelled"
+        return False, None
+
+    except CoordinationError as e:
+        logger.error(
+            f"[X] {t('coordination_error')} {availability_domain}: {str(e)}",
+            extra=coalesced(availability_domain, "coordination_error"),
+        )
+        outcome = "coordination_error"
+        return False, None
+
+    except Exception as e:
+        logger.error(f"[X] {t('unexpected_error')} {availability_domain}: {str(e)}")
+        return False, None
+
+    finally:
+        METRICS.observe_attempt(region["id"] if region else None, availability_domain, outcome)
+        if target is not None:
+            target["last_outcome"] = outcome
+        if HISTORY:
+            HISTORY.record(
+                region["id"] if region else None,
+                availability_domain,
+                outcome,
+                status_code,
+                (time.monotonic() - started) * 1000,
+                capacity,
+                shape=rung["shape"],
+                ocpus=rung["ocpus"],
+                memory_in_gbs=rung["memory_in_gbs"],
+            )
+
+
+def validate_ssh_key(ssh_key):
+    """Validate SSH public key format"""
+    ssh_key = ssh_key.strip()
+
+    # Check for common SSH key patterns
+    valid_patterns = [
+        r"^ssh-rsa AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # RSA
+        r"^ssh-ed25519 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # Ed25519
+        r"^ecdsa-sha2-nistp256 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 256
+        r"^ecdsa-sha2-nistp384 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 384
+        r"^ecdsa-sha2-nistp521 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 521
+    ]
+
+    for pattern in valid_patterns:
+        if re.match(pattern, ssh_key):
+            return True
+    return False
+
+
+def validate_configuration(regions=None):
+    """Validate all required configuration values before starting."""
+    errors = []
+
+    # Check OCIDs
+    if "your_compartment_id_here" in COMPARTMENT_ID:
+        errors.append("COMPARTMENT_ID is not configured")
+
+    if "your_image_id_here" in IMAGE_ID:
+        errors.append("IMAGE_ID is not configured")
+
+    if "your_subnet_id_here" in SUBNET_ID:
+        errors.append("SUBNET_ID is not configured")
+
+    # Check SSH key with helpful examples
+    if (
+        "your_ssh_public_key_here" in SSH_PUBLIC_KEY
+        or len(SSH_PUBLIC_KEY.strip()) < 100
+    ):
+        errors.append("SSH_PUBLIC_KEY is not configured")
+        errors.append("  → Example: ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAACAQ... user@host")
+        errors.append("  → Generate new key: ssh-keygen -t rsa -b 4096")
+        errors.append("  → Or use existing: cat ~/.ssh/id_rsa.pub")
+    elif not validate_ssh_key(SSH_PUBLIC_KEY):
+        errors.append(
+            "SSH_PUBLIC_KEY has invalid format (must be ssh-rsa, ssh-ed25519, or ecdsa-sha2-*)"
+        )
+        errors.append("  → Ensure the key starts with 'ssh-rsa', 'ssh-ed25519', or 'ecdsa-sha2-nistp256'")
+
+    # Validate OCID format
+    if not COMPARTMENT_ID.startswith("ocid1."):
+        errors.append("COMPARTMENT_ID has invalid format (must start with 'ocid1.')")
+
+    if not IMAGE_ID.startswith("ocid1.image"):
+        errors.append("IMAGE_ID has invalid format (must start with 'ocid1.image')")
+
+    if not SUBNET_ID.startswith("ocid1.subnet"):
+        errors.append("SUBNET_ID has invalid format (must start with 'ocid1.subnet')")
+
+    # Validate region-specific OCIDs from config/regions.json
+    for region in regions or []:
+        prefix = f"{profile_prefix(region)}[{region['id']}]"
+        if not region["compartment_id"].startswith("ocid1."):
+            errors.append(f"{prefix} compartment_id has invalid format (must start with 'ocid1.')")
+        if not region["image_id"].startswith("ocid1.image"):
+            errors.append(f"{prefix} image_id has invalid format (must start with 'ocid1.image')")
+        if not region["subnet_id"].startswith("ocid1.subnet"):
+            errors.append(f"{prefix} subnet_id has invalid format (must start with 'ocid1.subnet')")
+
+    if errors:
+        logger.error(t("config_errors_found"))
+        for error in errors:
+            logger.error(f"   - {error}")
+        logger.error("")
+        logger.error(t("please_run_setup"))
+        logger.error(t("setup_command"))
+        return False
+
+    return True
+
+
+# ============================================================================
+# ATTEMPT HISTORY (SQLite)
+# ============================================================================
+
+
+class AttemptHistory:
+    """Persistent store of every launch attempt (SQLite, one row per attempt)
+
+    Used by the stats command to work out when and where capacity shows up,
+    independent of the rotating log files.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL NOT NULL,
+                region TEXT,
+                ad TEXT NOT NULL,
+                shape TEXT NOT NULL,
+                ocpus REAL,
+                memory_in_gbs REAL,
+                outcome TEXT NOT NULL,
+                status_code INTEGER,
+                latency_ms REAL,
+                capacity INTEGER
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_attempts_ts ON attempts (ts)")
+        self.conn.commit()
+
+    def record(self, region, ad, outcome, status_code, latency_ms, capacity,
+               shape=None, ocpus=None, memory_in_gbs=None):
+        """Store one attempt (capacity: True/False if observed, None if unknown)"""
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT INTO attempts (ts, region, ad, shape, ocpus, memory_in_gbs,"
+                    " outcome, status_code, latency_ms, capacity)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        time.time(),
+                        region,
+                        ad,
+                        shape or SHAPE,
+                        ocpus if ocpus is not None else OCPUS,
+                        memory_in_gbs if memory_in_gbs is not None else MEMORY_IN_GBS,
+                        outcome,
+                        status_code,
+                        round(latency_ms, 1),
+                        None if capacity is None else int(capacity),
+                    ),
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not record attempt: {str(e)}")
+
+    def query(self, sql, params=()):
+        """Run a read-only query and return all rows"""
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def open_history():
+    """Open the attempt history database (None if disabled or unavailable)"""
+    if not HISTORY_ENABLED:
+        return None
+    try:
+        return AttemptHistory(HISTORY_DB)
+    except sqlite3.Error as e:
+        logger.warning(f"[!]  Could not open attempt history {HISTORY_DB}: {str(e)}")
+        return None
+
+
+def print_stats(days=None):
+    """Print capacity-hit rates by AD and by hour of day from the attempt history"""
+    if not os.path.exists(HISTORY_DB):
+        print(f"No attempt history found ({HISTORY_DB}).")
+        return 1
+
+    history = AttemptHistory(HISTORY_DB)
+    where = ""
+    params = ()
+    if days:
+        where = "WHERE ts >= ?"
+        params = (time.time() - days * 86400,)
+
+    total = history.query(
+        f"SELECT COUNT(*), MIN(ts), MAX(ts), SUM(outcome = 'success') FROM attempts {where}", params
+    )[0]
+    if not total[0]:
+        print("No attempts recorded yet.")
+        history.close()
+        return 1
+
+    print("=" * 80)
+    print("  OCI Instance Sniper - Attempt Statistics")
+    print("=" * 80)
+    print(
+        f"  Attempts: {total[0]} | Successes: {total[3] or 0} | "
+        f"{datetime.fromtimestamp(total[1]).strftime('%Y-%m-%d %H:%M')} - "
+        f"{datetime.fromtimestamp(total[2]).strftime('%Y-%m-%d %H:%M')}"
+    )
+
+    # Capacity hit rate = attempts that saw capacity / attempts with a known answer
+    print("")
+    print(f"  {'Region / AD':<48} {'Attempts':>9} {'Hits':>6} {'Rate':>7} {'Avg ms':>8}")
+    print("  " + "-" * 78)
+    rows = history.query(
+        "SELECT region, ad, COUNT(*), SUM(capacity = 1), COUNT(capacity), AVG(latency_ms)"
+        f" FROM attempts {where} GROUP BY region, ad ORDER BY region, ad",
+        params,
+    )
+    for region, ad, attempts, hits, known, avg_ms in rows:
+        rate = (hits or 0) / known * 100 if known else 0
+        label = f"{region or '-'} / {ad}"
+        print(f"  {label[:48]:<48} {attempts:>9} {hits or 0:>6} {rate:>6.1f}% {avg_ms or 0:>8.0f}")
+
+    print("")
+    print(f"  {'Hour':<6} {'Attempts':>9} {'Hits':>6} {'Rate':>7}")
+    print("  " + "-" * 78)
+    rows = history.query(
+        "SELECT CAST(strftime('%H', ts, 'unixepoch', 'localtime') AS INTEGER) AS hour,"
+        " COUNT(*), SUM(capacity = 1), COUNT(capacity)"
+        f" FROM attempts {where} GROUP BY hour ORDER BY hour",
+        params,
+    )
+    for hour, attempts, hits, known in rows:
+        rate = (hits or 0) / known * 100 if known else 0
+        bar = "#" * int(round(rate / 2))
+        print(f"  {hour:02d}:00  {attempts:>9} {hits or 0:>6} {rate:>6.1f}% {bar}")
+
+    print("")
+    print(f"  {'Shape config':<48} {'Attempts':>9} {'Success':>8}")
+    print("  " + "-" * 78)
+    for shape, ocpus, memory_in_gbs, attempts, successes in history.query(
+        "SELECT shape, ocpus, memory_in_gbs, COUNT(*), SUM(outcome = 'success')"
+        f" FROM attempts {where} GROUP BY shape, ocpus, memory_in_gbs ORDER BY ocpus DESC",
+        params,
+    ):
+        label = f"{shape} {ocpus or 0:g}/{memory_in_gbs or 0:g}"
+        print(f"  {label[:48]:<48} {attempts:>9} {successes or 0:>8}")
+
+    print("")
+    print(f"  {'Outcome':<20} {'Count':>9}")
+    print("  " + "-" * 78)
+    for outcome, count in history.query(
+        f"SELECT outcome, COUNT(*) FROM attempts {where} GROUP BY outcome ORDER BY COUNT(*) DESC",
+        params,
+    ):
+        print(f"  {outcome:<20} {count:>9}")
+    print("=" * 80)
+
+    history.close()
+    return 0
+
+
+# ============================================================================
+# CHECKPOINT (crash-resumable engine state)
+# ============================================================================
+
+
+def region_key(region):
+    """Identifier of a region across restarts ("profile|region")"""
+    return f"{region.get('profile') or ''}|{region['id']}"
+
+
+def target_key(target):
+    """Identifier of a target across restarts ("profile|region|AD|shape config")"""
+    rung = ":".join(str(value) for value in rung_key(target["rung"])) if target.get("rung") else ""
+    return f"{region_key(target['region'])}|{target['ad']}|{rung}"
+
+
+def checkpoint_path(region_ids=None):
+    """Configured checkpoint file, or one per region selection in the project folder"""
+    if CHECKPOINT_PATH:
+        return CHECKPOINT_PATH
+    suffix = "-" + "-".join(sorted(region_ids)) if region_ids else ""
+    return os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), f"oci-sniper-state{suffix}.json"
+    )
+
+
+class Checkpoint:
+    """Engine state saved every few seconds, so a restart resumes instead of starting over
+
+    Saved: start time (progress/ETA), attempt count, failure streak and next
+    due time per target (the retry delay phase follows from them), resolved AD
+    names and reserved IP per region, and launched instances whose success
+    path has not finished yet. Written to a temp file and moved over the old
+    one with os.replace(), so a crash mid-write keeps the previous checkpoint.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, interval=30):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.state = self._load()
+        self.saved_at = time.monotonic()
+        self.failing = False
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[!]  Ignoring unreadable checkpoint {self.path}: {str(e)}")
+            return {}
+        if not isinstance(state, dict) or state.get("version") != self.VERSION:
+            return {}
+        return state
+
+    def region(self, region):
+        """Saved state of a region (for resolve_region())"""
+        return self.state.get("regions", {}).get(region_key(region))
+
+    def restore(self, engine):
+        """Apply the saved state to the matching targets of a new engine
+
+        Returns:
+            Number of restored targets (0 = fresh start)
+        """
+        saved = self.state.get("targets", {})
+        now, wall = time.monotonic(), time.time()
+        restored = 0
+        for target in engine.targets:
+            entry = saved.get(target_key(target))
+            if not entry:
+                continue
+            target["attempts"] = entry.get("attempts", 0)
+            target["failures"] = entry.get("failures", 0)
+            target["last_outcome"] = entry.get("last_outcome")
+            # Downtime counts as waiting; a clock jump cannot push the next attempt far out
+            target["next_due"] = now + min(max(0.0, entry.get("due_at", 0) - wall), RETRY_DELAY_SECONDS * 5)
+            restored += 1
+        if restored:
+            engine.round = max(target["attempts"] for target in engine.targets)
+            if self.state.get("start_time"):
+                engine.start_time = datetime.fromisoformat(self.state["start_time"])
+        return restored
+
+    def resume_launched(self, engine):
+        """Queue launched instances of the last run as successes (instead of launching again)
+
+        Returns:
+            Number of resumed instances
+        """
+        resumed = []
+        for entry in self.state.get("launched", []):
+            target = next((t for t in engine.targets if target_key(t) == entry.get("target")), None)
+            if not target:
+                continue
+            try:
+                instance = target["region"]["compute_client"].get_instance(entry["instance_id"]).data
+            except oci.exceptions.ServiceError as e:
+                logger.warning(f"[!]  Launched instance {entry['instance_id']} not found: {e.message}")
+                continue
+            if instance.lifecycle_state in ("TERMINATING", "TERMINATED"):
+                continue
+            target["work_request_id"] = entry.get("work_request_id")
+            engine.pending.append(("SUCCESS", target, instance))
+            resumed.append(entry)
+            logger.info(f"[OK] {t('resumed_checkpoint')}: {instance.id} ({instance.lifecycle_state})")
+        with self.lock:
+            self.state["launched"] = resumed
+        return len(resumed)
+
+    def _snapshot(self, engine):
+        now, wall = time.monotonic(), time.time()
+        return {
+            "version": self.VERSION,
+            "saved": datetime.now().isoformat(timespec="seconds"),
+            "start_time": engine.start_time.isoformat(),
+            "regions": {
+                region_key(region): {
+                    "ad_names": region["ad_names"],
+                    "reserved_ip_id": region["reserved_ip"].id if region["reserved_ip"] else None,
+                }
+                for region in engine._regions()
+            },
+            "targets": {
+                target_key(target): {
+                    "attempts": target["attempts"],
+                    "failures": target.get("failures", 0),
+                    "last_outcome": target.get("last_outcome"),
+                    "due_at": round(wall + target["next_due"] - now, 1),
+                }
+                for target in list(engine.targets)
+            },
+            "launched": self.state.get("launched", []),
+        }
+
+    def save(self, engine):
+        """Write the checkpoint now (temp file + os.replace)"""
+        with self.lock:
+            self.state = self._snapshot(engine)
+            self.saved_at = time.monotonic()
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.state, f, separators=(",", ":"))
+                os.replace(temp_path, self.path)
+                self.failing = False
+            except OSError as e:
+                if not self.failing:
+                    logger.warning(f"[!]  Could not write checkpoint {self.path}: {str(e)}")
+                self.failing = True
+
+    def remaining(self):
+        """Seconds until the next save is allowed"""
+        return max(0.0, self.interval - (time.monotonic() - self.saved_at))
+
+    def maybe_save(self, engine):
+        """Save if the interval has passed (called from the engine loop), True if saved"""
+        if self.remaining() > 0:
+            return False
+        self.save(engine)
+        return True
+
+    def launched(self, engine, target, instance):
+        """Record a launched instance right away: a restart finishes it instead of launching again"""
+        with self.lock:
+            self.state["launched"] = [
+                entry for entry in self.state.get("launched", []) if entry["instance_id"] != instance.id
+            ] + [
+                {
+                    "target": target_key(target),
+                    "instance_id": instance.id,
+                    "work_request_id": target.get("work_request_id"),
+                }
+            ]
+        self.save(engine)
+
+    def finished(self, engine, instance):
+        """The success path of an instance is done"""
+        with self.lock:
+            self.state["launched"] = [
+                entry for entry in self.state.get("launched", []) if entry["instance_id"] != instance.id
+            ]
+        self.save(engine)
+
+    def clear(self):
+        """Remove the checkpoint: the run is over, the next one starts fresh"""
+        with self.lock:
+            self.state = {}
+            for path in (self.path, f"{self.path}.tmp"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"[!]  Could not remove checkpoint {path}: {str(e)}")
+
+
+# ============================================================================
+# ATTEMPT SCHEDULER
+# ============================================================================
+
+
+def get_retry_delay(attempt):
+    """Dynamic retry delay for a target's next round (exponential backoff)"""
+    if attempt <= 10:
+        return 10  # Fast retry first 10 attempts (10s)
+    elif attempt <= 30:
+        return 30  # Medium retry next 20 attempts (30s)
+    return RETRY_DELAY_SECONDS  # Normal retry after that (60s)
+
+
+class FixedScheduler:
+    """Fixed delay ladder per target: 10s, then 30s, then RETRY_DELAY_SECONDS"""
+
+    name = "fixed"
+
+    def next_delay(self, target, targets):
+        return get_retry_delay(target["attempts"])
+
+
+class AdaptiveScheduler:
+    """History-driven polling intensity per (region, AD) within a global budget
+
+    The request budget (launch attempts per minute over all targets) is
+    split proportionally to a weight per target:
+    - hour weight: capacity-hit rate of this AD in the current hour of day
+      (+/- 1h) relative to its overall hit rate, from the attempt history
+    - failure weight: shrinks while an AD keeps failing, resets on capacity
+    """
+
+    name = "adaptive"
+    REFRESH_SECONDS = 600  # Re-read the history every 10 minutes
+    HISTORY_DAYS = 30
+    MIN_DELAY = 5
+    FAILURE_OUTCOMES = ("no_capacity", "probe_no_capacity", "service_error", "network_error")
+
+    def __init__(self, history=None, budget_per_minute=None):
+        self.history = history
+        self.budget = budget_per_minute or REQUEST_BUDGET_PER_MINUTE
+        self.max_delay = RETRY_DELAY_SECONDS * 5
+        self.hour_stats = {}  # (region, ad, hour) -> (hits, known)
+        self.ad_stats = {}  # (region, ad) -> (hits, known)
+        self.refreshed = 0.0
+
+    def _refresh(self):
+        """Load per-AD capacity hits by hour of day from the attempt history"""
+        self.refreshed = time.monotonic()
+        if not self.history:
+            return
+        try:
+            rows = self.history.query(
+                "SELECT region, ad, CAST(strftime('%H', ts, 'unixepoch', 'localtime') AS INTEGER),"
+                " SUM(capacity = 1), COUNT(capacity) FROM attempts WHERE ts >= ?"
+                " GROUP BY 1, 2, 3",
+                (time.time() - self.HISTORY_DAYS * 86400,),
+            )
+        except sqlite3.Error as e:
+            logger.debug(f"Could not read attempt history: {str(e)}")
+            return
+
+        hour_stats, ad_stats = {}, {}
+        for region, ad, hour, hits, known in rows:
+            hour_stats[(region, ad, hour)] = (hits or 0, known)
+            total_hits, total_known = ad_stats.get((region, ad), (0, 0))
+            ad_stats[(region, ad)] = (total_hits + (hits or 0), total_known + known)
+        self.hour_stats, self.ad_stats = hour_stats, ad_stats
+
+    def weight(self, target, hour):
+        """Relative polling intensity of one target"""
+        key = (target["region"]["id"], target["ad"])
+
+        # Hour-of-day weight (smoothed, so sparse history stays close to 1)
+        hits, known = self.ad_stats.get(key, (0, 0))
+        overall = (hits + 1) / (known + 20)
+        window_hits = window_known = 0
+        for h in (hour - 1, hour, hour + 1):
+            h_hits, h_known = self.hour_stats.get(key + (h % 24,), (0, 0))
+            window_hits += h_hits
+            window_known += h_known
+        hour_weight = ((window_hits + 1) / (window_known + 20)) / overall
+        hour_weight = min(4.0, max(0.5, hour_weight))
+
+        # Back off ADs that keep failing
+        failure_weight = max(0.25, 1 / (1 + target.get("failures", 0) / 30))
+
+        return hour_weight * failure_weight
+
+    def next_delay(self, target, targets):
+        if time.monotonic() - self.refreshed > self.REFRESH_SECONDS:
+            self._refresh()
+
+        if target.get("last_outcome") in self.FAILURE_OUTCOMES:
+            target["failures"] = target.get("failures", 0) + 1
         else:
-            logger.error(f"[X] {t('error_in_ad')} {availability_domain}: {e.message}")
-            return False, None
+            target["failures"] = 0
 
-    except (
-        oci.exceptions.RequestException,
-        oci.exceptions.ConnectTimeout,
-        ConnectionError,
-        TimeoutError,
-    ) as e:
-        # Network errors after all retries exhausted
-        logger.error(
-            f"[X] Network error in {availability_domain} after retries: {str(e)}"
+        # Account profiles split the budget by their share, then by weight among their own targets
+        profile = target["region"].get("profile")
+        shares = {t["region"].get("profile"): t["region"].get("share", 1) for t in targets}
+        budget = self.budget * shares.get(profile, 1) / sum(shares.values())
+
+        hour = datetime.now().hour
+        total = sum(self.weight(t, hour) for t in targets if t["region"].get("profile") == profile)
+        delay = 60 * total / (budget * self.weight(target, hour))
+        return min(self.max_delay, max(self.MIN_DELAY, delay))
+
+
+class HedgedScheduler:
+    """Staggered rotation over the ADs of a region instead of simultaneous fan-out
+
+    Every target keeps the request rate of the fixed delay ladder, but the
+    targets of a region take turns: target k of n gets the slots at k/n of
+    the delay window, so capacity appearing in any AD waits about delay/n
+    for the next request instead of up to the whole delay. AD weights
+    (hedging.ad_weights) split the same number of requests unevenly. A slow
+    launch call brings the next target in rotation forward
+    (SniperEngine._hedge()); that target then skips its own slot.
+    """
+
+    name = "hedged"
+    TOLERANCE = 1.0  # A slot missed by less than this still counts as now
+
+    def __init__(self):
+        self.origin = time.monotonic()
+
+    @staticmethod
+    def weight(target):
+        """Configured weight of a target's AD (matched by name suffix like "AD-2"), default 1"""
+        ad = target["ad"].upper()
+        for name, weight in AD_WEIGHTS.items():
+            if ad.endswith(name.upper()):
+                return weight
+        return 1
+
+    def _slots(self, target, targets):
+        """Slot grid of a target in the rotation of its region: (phase, period) in seconds"""
+        window = get_retry_delay(target["attempts"])
+        group = [other for other in targets if region_key(other["region"]) == region_key(target["region"])]
+        index = next((i for i, other in enumerate(group) if other is target), None)
+        if index is None:
+            return 0.0, window
+        weights = [self.weight(other) for other in group]
+        total = sum(weights)
+        return window * sum(weights[:index]) / total, window * total / (len(group) * weights[index])
+
+    def _until_slot(self, target, targets):
+        phase, period = self._slots(target, targets)
+        return (phase - (time.monotonic() - self.origin)) % period, period
+
+    def first_delay(self, target, targets):
+        """Delay of a new target until its first slot"""
+        delay, period = self._until_slot(target, targets)
+        return 0.0 if delay > period - self.TOLERANCE else delay
+
+    def next_delay(self, target, targets):
+        delay, period = self._until_slot(target, targets)
+        replaced = target.pop("hedged", None)
+        if replaced is not None and abs(time.monotonic() + delay - replaced) < self.TOLERANCE:
+            # The hedge request already took this slot
+            delay += period
+        return delay
+
+
+def create_scheduler(name=None):
+    """Create the configured retry scheduler ("fixed", "adaptive" or "hedged")"""
+    if (name or SCHEDULER) == "adaptive":
+        return AdaptiveScheduler(HISTORY)
+    if (name or SCHEDULER) == "hedged":
+        return HedgedScheduler()
+    return FixedScheduler()
+
+
+def rung_rank(target):
+    """Position of a target's shape ladder rung (0 = best, also for targets without a rung)
+
+    A rung removed from the ladder meanwhile (control API) ranks last.
+    """
+    if not target.get("rung"):
+        return 0
+    return SHAPE_LADDER.index(target["rung"]) if target["rung"] in SHAPE_LADDER else len(SHAPE_LADDER)
+
+
+# Settings that are only read at startup (config reload warns about them)
+RESTART_KEYS = (
+    "engine", "max_workers", "max_in_flight", "shape_ladder_mode", "endpoint_override", "profiles",
+    "reserved_public_ip_ocid", "history_enabled", "history_db", "logging", "metrics", "control", "coordination",
+)
+
+
+class SniperEngine:
+    """Pipelined attempt scheduler over all (region, AD) targets
+
+    A single long-lived thread pool runs every launch call. Each target is
+    resubmitted as soon as its own previous call has returned and its retry
+    delay has passed, so one slow AD never holds back the others. run()
+    returns on the first success without waiting for in-flight stragglers,
+    except for launches of better shape ladder rungs ("concurrent" mode).
+    """
+
+    SETTLE_TIMEOUT = 60  # Max. seconds to wait for better rungs already in flight
+
+    def __init__(self, targets, max_workers=None, scheduler=None, daemon=False):
+        self.scheduler = scheduler or create_scheduler()
+        # Targets are (region, AD) or (region, AD, shape ladder rung) tuples
+        self.targets = [self._make_target(target) for target in targets]
+        self._stagger(self.targets)
+        # Daemon mode: no attempt limit, targets can be added later (control API)
+        self.daemon = daemon
+        self.executor = ThreadPoolExecutor(
+            max_workers=(max_workers or MAX_WORKERS) if daemon else min(max_workers or MAX_WORKERS, len(self.targets)),
+            thread_name_prefix="sniper",
         )
-        return False, None
+        self.in_flight = {}  # future -> target
+        self.cancels = {}  # Account profile -> CancelToken of its attempts
+        self.round = 0
+        self.start_time = datetime.now()
+
+        # Control state, only changed on the engine thread (see call())
+        self.paused = False
+        self.stopped = False
+        self.intensity = 1.0  # Retry delays are divided by this factor
+        self.commands = queue.SimpleQueue()
+        self.wake_lock = threading.Lock()
+        self.wakeup = Future()  # Completed to interrupt the wait for results
+
+        # Account profiles: successes of other profiles found in the same round, fair submission order
+        self.pending = []
+        self.turn = 0
+        self.checkpoint = None  # Checkpoint saved from the engine loop
+        self.dirty = False  # Results since the last checkpoint
+        self.announced = None  # Due time of the last "waiting" message
+        self.next_poll = 0.0  # Next check for wins of other snipers (coordination backend)
+
+    @staticmethod
+    def _make_target(target):
+        return {
+            "region": target[0],
+            "ad": target[1],
+            "rung": target[2] if len(target) > 2 else None,
+            "attempts": 0,
+            "next_due": 0.0,
+        }
+
+    def _stagger(self, targets):
+        """First attempts of new targets: spread over the delay window (hedged scheduler)"""
+        if isinstance(self.scheduler, HedgedScheduler):
+            now = time.monotonic()
+            for target in targets:
+                target["next_due"] = now + self.scheduler.first_delay(target, self.targets)
+
+    def _hedge(self, target, busy):
+        """Slow launch call of target: the next idle target of another AD in its region is due now
+
+        Args:
+            target: Target whose call is slower than hedge_after_seconds
+            busy: id() of the targets with a call in flight
+
+        Returns:
+            The hedge target, or None
+        """
+        now = time.monotonic()
+        candidates = [
+            other for other in self.targets
+            if region_key(other["region"]) == region_key(target["region"]) and other["ad"] != target["ad"]
+            and id(other) not in busy and self._runnable(other) and other["next_due"] > now
+        ]
+        if not candidates:
+            return None
+        hedge = min(candidates, key=lambda other: other["next_due"])
+        hedge["hedged"] = hedge["next_due"]  # This slot is used up by the hedge request
+        hedge["next_due"] = now
+        logger.info(
+            f"[i]  {t('hedging').format(slow=target['ad'], seconds=HEDGE_AFTER_SECONDS)} {hedge['ad']}",
+            extra=coalesced(target["ad"], "hedging"),
+        )
+        return hedge
 
-    except Exception as e:
-        logger.error(f"[X] {t('unexpected_error')} {availability_domain}: {str(e)}")
-        return False, None
+    def _hedging(self):
+        return isinstance(self.scheduler, HedgedScheduler) and HEDGE_AFTER_SECONDS > 0
 
+    def _exhausted(self, target):
+        return not self.daemon and target["attempts"] >= MAX_ATTEMPTS
 
-def validate_ssh_key(ssh_key):
-    """Validate SSH public key format"""
-    ssh_key = ssh_key.strip()
+    def _runnable(self, target):
+        return not self._exhausted(target) and (not self.paused or target.get("burst"))
 
-    # Check for common SSH key patterns
-    valid_patterns = [
-        r"^ssh-rsa AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # RSA
-        r"^ssh-ed25519 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # Ed25519
-        r"^ecdsa-sha2-nistp256 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 256
-        r"^ecdsa-sha2-nistp384 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 384
-        r"^ecdsa-sha2-nistp521 AAAA[0-9A-Za-z+/]+[=]{0,3}(\s.*)?$",  # ECDSA 521
+    # ---------------------------------------------------------------- control
+    def call(self, fn, timeout=10):
+        """Run fn(engine) on the engine thread and return its result (thread-safe)
+
+        Used by the control API: all changes to targets and settings happen
+        between two scheduling steps, so no locking is needed elsewhere.
+        """
+        future = Future()
+        self.commands.put((fn, future))
+        self._wake()
+        return future.result(timeout)
+
+    def _wake(self):
+        with self.wake_lock:
+            if not self.wakeup.done():
+                self.wakeup.set_result(None)
+
+    def _run_commands(self):
+        with self.wake_lock:
+            if self.wakeup.done():
+                self.wakeup = Future()
+        while True:
+            try:
+                fn, future = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                future.set_result(fn(self))
+            except Exception as e:
+                future.set_exception(e)
+
+    def status(self):
+        now = time.monotonic()
+        busy = {id(target) for target in self.in_flight.values()}
+        return {
+            "state": "stopped" if self.stopped else "paused" if self.paused else "running",
+            "started": self.start_time.isoformat(timespec="seconds"),
+            "round": self.round,
+            "scheduler": self.scheduler.name,
+            "intensity": self.intensity,
+            "in_flight": len(self.in_flight),
+            "shape_ladder": [rung_label(rung) for rung in SHAPE_LADDER],
+            "targets": [
+                {
+                    "region": target["region"]["id"],
+                    "ad": target["ad"],
+                    "rung": rung_label(target["rung"]) if target["rung"] else None,
+                    "attempts": target["attempts"],
+                    "last_outcome": target.get("last_outcome"),
+                    "in_flight": id(target) in busy,
+                    "next_in_seconds": round(max(0.0, target["next_due"] - now), 1),
+                }
+                for target in self.targets
+            ],
+        }
+
+    def set_paused(self, paused):
+        self.paused = paused
+        logger.info(f"[i]  Sniper {'paused' if paused else 'resumed'} (control API)")
+        return self.status()["state"]
+
+    def stop(self):
+        self.stopped = True
+        return "stopped"
+
+    def burst(self):
+        """Attempt every target right away (also while paused)"""
+        for target in self.targets:
+            target["next_due"] = 0.0
+            target["burst"] = True
+        logger.info("[i]  Burst: attempting all targets now (control API)")
+        return len(self.targets)
+
+    def set_polling(self, intensity=None, request_budget_per_minute=None):
+        if intensity is not None:
+            if not isinstance(intensity, (int, float)) or not 0.1 <= intensity <= 10:
+                raise ValueError("intensity must be 0.1-10")
+            # Reschedule pending targets with the new factor
+            now = time.monotonic()
+            for target in self.targets:
+                target["next_due"] = now + (target["next_due"] - now) * self.intensity / intensity
+            self.intensity = float(intensity)
+        if request_budget_per_minute is not None:
+            if not isinstance(self.scheduler, AdaptiveScheduler):
+                raise ValueError("request_budget_per_minute needs the adaptive scheduler")
+            if not isinstance(request_budget_per_minute, (int, float)) or request_budget_per_minute <= 0:
+                raise ValueError("request_budget_per_minute must be > 0")
+            self.scheduler.budget = request_budget_per_minute
+        logger.info(f"[i]  Polling intensity {self.intensity:g}x (control API)")
+        return {"intensity": self.intensity, "scheduler": self.scheduler.name}
+
+    def _region_targets(self, region, rungs):
+        if SHAPE_LADDER_MODE == "concurrent" and len(SHAPE_LADDER) > 1:
+            return [(region, ad, rung) for ad in region["ad_names"] for rung in rungs]
+        return [(region, ad) for ad in region["ad_names"]]
+
+    def _regions(self):
+        regions = {}
+        for target in self.targets:
+            regions.setdefault((target["region"].get("profile"), target["region"]["id"]), target["region"])
+        return list(regions.values())
+
+    def add_region(self, region):
+        if any(
+            (target["region"].get("profile"), target["region"]["id"]) == (region.get("profile"), region["id"])
+            for target in self.targets
+        ):
+            raise ValueError(f"Region {region['id']} is already being sniped")
+        added = [self._make_target(target) for target in self._region_targets(region, SHAPE_LADDER)]
+        self.targets.extend(added)
+        self._stagger(added)
+        logger.info(f"[i]  Region {region['id']} added: {len(added)} targets")
+        return len(added)
+
+    def remove_region(self, region_id):
+        """Stop sniping in a region (calls in flight still finish)"""
+        before = len(self.targets)
+        self.targets = [target for target in self.targets if target["region"]["id"] != region_id]
+        if len(self.targets) == before:
+            raise ValueError(f"Region {region_id} is not being sniped")
+        logger.info(f"[i]  Region {region_id} removed")
+        return before - len(self.targets)
+
+    def set_shape_ladder(self, ladder):
+        """Replace the shape ladder (control API)"""
+        global SHAPE_LADDER
+        if not ladder:
+            raise ValueError("The shape ladder needs at least one rung")
+        self._retarget_rungs(SHAPE_LADDER, ladder)
+        SHAPE_LADDER = ladder
+        logger.info(f"[i]  {t('shape_ladder')}: {' > '.join(rung_label(rung) for rung in ladder)} (control API)")
+        return [rung_label(rung) for rung in ladder]
+
+    def _retarget_rungs(self, old, ladder):
+        """"concurrent" ladder mode: targets for new rungs, none for removed ones"""
+        if SHAPE_LADDER_MODE != "concurrent":
+            return
+        new_rungs = [rung for rung in ladder if rung not in old]
+        self.targets = [
+            target for target in self.targets if target["rung"] is None or target["rung"] in ladder
+        ]
+        added = [
+            self._make_target(target)
+            for region in self._regions() for target in self._region_targets(region, new_rungs)
+        ]
+        self.targets.extend(added)
+        self._stagger(added)
+
+    def _swap_region(self, region_id, region):
+        """Replace the region dict of a region's targets, keeping their schedule state
+
+        None removes the region. A region not sniped yet is added.
+        """
+        targets = [target for target in self.targets if target["region"]["id"] == region_id]
+        if region is None:
+            if targets:
+                self.remove_region(region_id)
+            return
+        region["capacity_probe"] = CAPACITY_PROBE
+        if not targets:
+            self.add_region(region)
+            return
+        old = targets[0]["region"]
+        if sorted(region["ad_names"]) != sorted(old["ad_names"]):
+            self.remove_region(region_id)
+            self.add_region(region)
+            return
+        region["generation"] = old.get("generation", 0) + 1  # New payload cache keys
+        for target in targets:
+            target["region"] = region
+        for key in list(PAYLOAD_CACHE):
+            if key[1] == payload_region(old):
+                PAYLOAD_CACHE.pop(key, None)
+        logger.info(f"[i]  Region {region_id} updated from regions.json")
+
+    def reload_config(self, config, regions_file, regions):
+        """Swap in a reloaded configuration between two scheduling steps (ConfigWatcher)
+
+        Args:
+            config: Validated sniper-config.json content
+            regions_file: regions.json content
+            regions: region id -> rebuilt region dict (clients, AD names), None = removed
+
+        Returns:
+            List of changed config keys and regions
+        """
+        global REGIONS_FILE, LANGUAGE
+        previous, language = CONFIG_FILE, LANGUAGE
+        ladder, scheduler, budget, probe = SHAPE_LADDER, SCHEDULER, REQUEST_BUDGET_PER_MINUTE, CAPACITY_PROBE
+
+        # Startup-only settings keep their running values (several are read live, e.g. by region rebuilds)
+        effective = {key: value for key, value in config.items() if key not in RESTART_KEYS}
+        effective.update({key: previous[key] for key in RESTART_KEYS if key in previous})
+        apply_config(effective)
+        REGIONS_FILE = regions_file
+        if LANGUAGE is None:
+            LANGUAGE = language  # Chosen interactively at startup
+
+        if SHAPE_LADDER != ladder:
+            self._retarget_rungs(ladder, SHAPE_LADDER)
+        if SCHEDULER != scheduler:
+            self.scheduler = create_scheduler()
+        elif isinstance(self.scheduler, AdaptiveScheduler):
+            if REQUEST_BUDGET_PER_MINUTE != budget:
+                self.scheduler.budget = REQUEST_BUDGET_PER_MINUTE
+            self.scheduler.max_delay = RETRY_DELAY_SECONDS * 5
+        if CAPACITY_PROBE != probe:
+            for region in self._regions():
+                region["capacity_probe"] = CAPACITY_PROBE
+        for region_id, region in regions.items():
+            self._swap_region(region_id, region)
+
+        changes = [key for key in sorted(set(previous) | set(config)) if previous.get(key) != config.get(key)]
+        restart = [key for key in changes if key in RESTART_KEYS]
+        if restart:
+            logger.warning(f"[!]  Changed {', '.join(restart)}: takes effect after a restart")
+        return changes + [f"regions.json:{region_id}" for region_id in regions]
+
+    # ---------------------------------------------------------------- attempt loop
+
+    def _log_round(self, attempt):
+        """Log the progress header once per round (like the old attempt loop)"""
+        self.round = attempt
+
+        if self.daemon:
+            # No attempt limit, so no progress/ETA
+            logger.info(f"\n{'='*80}")
+            logger.info(f"{t('attempt')} {attempt} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"{'='*80}")
+            return
+
+        # Calculate progress and ETA
+        elapsed_time = (datetime.now() - self.start_time).total_seconds()
+        progress_pct = (attempt / MAX_ATTEMPTS) * 100
+        avg_time_per_attempt = elapsed_time / (attempt - 1) if attempt > 1 else 0
+        remaining_attempts = MAX_ATTEMPTS - attempt
+        eta_seconds = remaining_attempts * avg_time_per_attempt
+        eta = datetime.now() + timedelta(seconds=eta_seconds) if eta_seconds > 0 else None
+
+        logger.info(f"\n{'='*80}")
+        logger.info(
+            f"{t('attempt')} {attempt}/{MAX_ATTEMPTS} ({progress_pct:.1f}%) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+        if eta:
+            logger.info(f"[t]  Running: {elapsed_time/3600:.1f}h | ETA: {eta.strftime('%H:%M')}")
+        logger.info(f"{'='*80}")
+
+    def _submit(self, target):
+        """Submit the next round for one target to the worker pool"""
+        target["attempts"] += 1
+        if target["attempts"] > self.round:
+            self._log_round(target["attempts"])
+        if self._hedging():
+            target["hedge_at"] = time.monotonic() + HEDGE_AFTER_SECONDS
+
+        region = target["region"]
+        future = self.executor.submit(
+            try_create_instance,
+            region["compute_client"],
+            target["ad"],
+            region["reserved_ip"].id if region["reserved_ip"] else None,
+            region,
+            target,
+            self._cancel_token(target),
+        )
+        self.in_flight[future] = target
+
+    def _cancel_token(self, target):
+        """CancelToken shared by the attempts of the account profile of target"""
+        return self.cancels.setdefault(target["region"].get("profile"), CancelToken())
+
+    def _fair(self, targets):
+        """Interleave targets of several account profiles, starting with another profile every round
+
+        The worker pool runs submissions first in, first out, so a saturated
+        pool serves the profiles in turn instead of in config order.
+        """
+        queues = {}
+        for target in targets:
+            queues.setdefault(target["region"].get("profile"), []).append(target)
+        if len(queues) < 2:
+            return targets
+        queues = list(queues.values())
+        self.turn = (self.turn + 1) % len(queues)
+        queues = queues[self.turn:] + queues[:self.turn]
+        ordered = []
+        while any(queues):
+            for batch in queues:
+                if batch:
+                    ordered.append(batch.pop(0))
+        return ordered
+
+    def retire_profile(self, target):
+        """Stop sniping for the account profile of target (instance launched or quota exceeded)
+
+        Returns:
+            True if targets of other profiles are left
+        """
+        profile = target["region"].get("profile")
+        if profile is None:
+            return False
+        # Attempts of this profile still in flight are abandoned at their next wait
+        self.cancels.pop(profile, CancelToken()).cancel()
+        for other in self.targets:
+            if other["region"].get("profile") == profile:
+                other["retired"] = True
+        self.targets = [other for other in self.targets if not other.get("retired")]
+        self.pending = [success for success in self.pending if success[1]["region"].get("profile") != profile]
+        return bool(self.targets or self.pending)
+
+    def _additional(self, target, instance):
+        logger.warning(
+            f"[!]  Additional instance launched in {target['ad']} ({rung_label(target['rung'] or SHAPE_LADDER[0])}): "
+            f"{instance.id}"
+        )
+
+    def _best_success(self, successes):
+        """Pick the success with the best shape ladder rung (per account profile)
+
+        Any other instance of the same profile was launched as well (several
+        rungs fired at once); it is only logged here and terminated later by
+        reconcile_instances(). The best successes of other profiles are
+        returned by the next run() calls.
+        """
+        successes = sorted(successes, key=lambda success: rung_rank(success[0]))
+        best = {}
+        for target, instance in successes:
+            profile = target["region"].get("profile")
+            if profile in best:
+                self._additional(target, instance)
+            else:
+                best[profile] = ("SUCCESS", target, instance)
+        results = list(best.values())
+        self.pending.extend(results[1:])
+        return results[0]
+
+    def _poll_coordination(self):
+        """Goal won by another sniper: ("FULFILLED", target, marker) or None"""
+        goals = {}
+        for target in self.targets:
+            goals.setdefault(coordination_goal(target["region"]), target)
+        for goal, target in goals.items():
+            try:
+                marker = COORDINATOR.fulfilled(goal)
+            except CoordinationError as e:
+                logger.warning(
+                    f"[!]  {t('coordination_error')}: {str(e)}",
+                    extra=coalesced(COORDINATOR.name, "coordination_error"),
+                )
+                return None
+            # Own wins come back as results of the launch call
+            if marker and marker.get("owner") != COORDINATOR.owner:
+                return "FULFILLED", target, marker
+        return None
+
+    def run(self):
+        """Run until a launch succeeds, the quota is exceeded or all targets are exhausted
+
+        Returns:
+            Tuple (status, target, instance) with status "SUCCESS",
+            "QUOTA_ERROR", "MAX_ATTEMPTS", "STOPPED" (daemon mode) or
+            "FULFILLED" (another sniper won, instance is its marker).
+            With account profiles, call again after retire_profile() to go
+            on with the other profiles.
+        """
+        if self.pending:
+            return self.pending.pop(0)
+
+        while True:
+            self._run_commands()
+            if self.stopped:
+                return "STOPPED", None, None
+            if COORDINATOR and time.monotonic() >= self.next_poll:
+                self.next_poll = time.monotonic() + COORDINATION_POLL_SECONDS
+                fulfilled = self._poll_coordination()
+                if fulfilled:
+                    return fulfilled
+            if self.checkpoint and self.dirty and self.checkpoint.maybe_save(self):
+                self.dirty = False
+
+            now = time.monotonic()
+            busy = {id(target) for target in self.in_flight.values()}
+
+            # Hedge launch calls that are slower than hedge_after_seconds
+            for target in list(self.in_flight.values()):
+                if target.get("hedge_at", now + 1) <= now:
+                    del target["hedge_at"]
+                    self._hedge(target, busy)
+
+            # Submit every idle target whose delay has passed
+            due = [
+                target for target in self.targets
+                if id(target) not in busy and self._runnable(target) and target["next_due"] <= now
+            ]
+            for target in self._fair(due):
+                target.pop("burst", None)
+                self._submit(target)
+
+            busy = {id(target) for target in self.in_flight.values()}
+            idle = [
+                target for target in self.targets
+                if id(target) not in busy and self._runnable(target)
+            ]
+            if not self.in_flight and not idle and not self.daemon:
+                return "MAX_ATTEMPTS", None, None
+
+            # Sleep until the next result arrives, the next target is due or a control command comes in
+            timeout = next_due = None
+            if idle:
+                next_due = min(target["next_due"] for target in idle)
+                timeout = max(0.0, next_due - now)
+            if not self.in_flight and idle and next_due != self.announced:
+                # Wait before next attempt (dynamic delay)
+                self.announced = next_due
+                logger.info(t("waiting_before_retry").format(seconds=round(timeout)))
+            if self.checkpoint and self.dirty:
+                # Wake up for the checkpoint of the results just processed
+                timeout = self.checkpoint.remaining() if timeout is None else min(timeout, self.checkpoint.remaining())
+            if COORDINATOR:
+                # Stop within a poll interval of another sniper's win
+                remaining = max(0.0, self.next_poll - now)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            hedges = [target["hedge_at"] for target in self.in_flight.values() if "hedge_at" in target]
+            if hedges:
+                remaining = max(0.0, min(hedges) - now)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+            if not self.in_flight:
+                wait([self.wakeup], timeout=timeout)
+                continue
+
+            done, _ = wait(list(self.in_flight) + [self.wakeup], timeout=timeout, return_when=FIRST_COMPLETED)
+            self.dirty = self.dirty or bool(done)
+            successes = []
+
+            for future in done:
+                if future is self.wakeup:
+                    continue
+                target = self.in_flight.pop(future)
+                target.pop("hedge_at", None)
+                delay = max(
+                    self.scheduler.next_delay(target, self.targets) / self.intensity,
+                    RATE_LIMITER.wait_time(rate_key(target["region"])),
+                )
+                target["next_due"] = time.monotonic() + delay
+                METRICS.set_backoff(target["region"]["id"], target["ad"], delay)
+                try:
+                    ad_success, ad_instance = future.result()
+                except Exception as e:
+                    logger.error(f"[X] Exception in parallel AD check for {target['ad']}: {str(e)}")
+                    continue
+
+                if target.get("retired"):
+                    # Launch of a profile that got its instance while this call was in flight
+                    if ad_success and ad_success != "QUOTA_ERROR":
+                        self._additional(target, ad_instance)
+                    continue
+                if ad_success == "QUOTA_ERROR":
+                    return "QUOTA_ERROR", target, None
+                elif ad_success:
+                    successes.append((target, ad_instance))
+
+            if successes:
+                # Let launches of better rungs that are already in flight finish
+                rank = min(rung_rank(target) for target, _ in successes)
+                better = [future for future, target in self.in_flight.items() if rung_rank(target) < rank]
+                if better:
+                    done, _ = wait(better, timeout=self.SETTLE_TIMEOUT)
+                    for future in done:
+                        target = self.in_flight.pop(future)
+                        try:
+                            ad_success, ad_instance = future.result()
+                        except Exception:
+                            continue
+                        if ad_success and ad_success != "QUOTA_ERROR":
+                            successes.append((target, ad_instance))
+                return self._best_success(successes)
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for in-flight launch calls
+
+        Their pending retries, backoff sleeps and rate limiter waits are
+        cancelled, so the worker threads end right after a call already sent.
+        """
+        for cancel in self.cancels.values():
+            cancel.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncSniperEngine(SniperEngine):
+    """asyncio variant of the attempt scheduler
+
+    Every target runs as its own coroutine; delays are asyncio sleeps and a
+    global semaphore bounds the number of launch calls in flight. The OCI
+    SDK is blocking, so the calls themselves go through a bounded executor
+    bridge: threads scale with MAX_IN_FLIGHT, not with the number of
+    (region, AD) targets.
+    """
+
+    def __init__(self, targets, max_in_flight=None, scheduler=None):
+        self.max_in_flight = max_in_flight or MAX_IN_FLIGHT
+        super().__init__(targets, max_workers=self.max_in_flight, scheduler=scheduler)
+        self.result = None
+        self.successes = []
+        self.calling = set()  # id() of targets with a launch call in flight
+        self.wakeups = {}  # id() of target -> asyncio.Event that ends its delay early (hedging)
+
+    async def _target_loop(self, target, semaphore, done):
+        """Attempt loop of a single (region, AD) target"""
+        loop = asyncio.get_running_loop()
+        region = target["region"]
+
+        while target["attempts"] < MAX_ATTEMPTS and not done.is_set():
+            delay = target["next_due"] - time.monotonic()
+            if delay > 0:
+                await self._sleep(target, delay)
+                continue
+
+            async with semaphore:
+                if done.is_set():
+                    return
+                target["attempts"] += 1
+                if target["attempts"] > self.round:
+                    self._log_round(target["attempts"])
+
+                self.calling.add(id(target))
+                hedge = loop.call_later(HEDGE_AFTER_SECONDS, self._hedge_slow, target) if self._hedging() else None
+                try:
+                    ad_success, ad_instance = await loop.run_in_executor(
+                        self.executor,
+                        try_create_instance,
+                        region["compute_client"],
+                        target["ad"],
+                        region["reserved_ip"].id if region["reserved_ip"] else None,
+                        region,
+                        target,
+                        self._cancel_token(target),
+                    )
+                except Exception as e:
+                    logger.error(f"[X] Exception in parallel AD check for {target['ad']}: {str(e)}")
+                    ad_success, ad_instance = False, None
+                finally:
+                    self.calling.discard(id(target))
+                    if hedge:
+                        hedge.cancel()
+
+            delay = max(
+                self.scheduler.next_delay(target, self.targets),
+                RATE_LIMITER.wait_time(rate_key(region)),
+            )
+            target["next_due"] = time.monotonic() + delay
+            METRICS.set_backoff(region["id"], target["ad"], delay)
+
+            if ad_success == "QUOTA_ERROR":
+                self.result = ("QUOTA_ERROR", target, None)
+                done.set()
+            elif ad_success:
+                self.successes.append((target, ad_instance))
+                done.set()
+
+    async def _sleep(self, target, delay):
+        """Sleep until a target is due; a hedge request (_hedge_slow()) ends it early"""
+        wakeup = self.wakeups.setdefault(id(target), asyncio.Event())
+        try:
+            await asyncio.wait_for(wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        wakeup.clear()
+
+    def _hedge_slow(self, target):
+        hedge = self._hedge(target, self.calling)
+        if hedge and id(hedge) in self.wakeups:
+            self.wakeups[id(hedge)].set()
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        done = asyncio.Event()
+        self.wakeups = {}  # Events belong to the event loop of this run
+        tasks = [
+            asyncio.create_task(self._target_loop(target, semaphore, done))
+            for target in self.targets
+        ]
+        waiter = asyncio.create_task(done.wait())
+        saver = asyncio.create_task(self._save_checkpoints()) if self.checkpoint else None
+        watcher = asyncio.create_task(self._watch_coordination(done)) if COORDINATOR else None
+        helpers = [task for task in (saver, watcher) if task]
+
+        # Return on the first result, or when every target is exhausted
+        await asyncio.wait(
+            [waiter, asyncio.gather(*tasks, return_exceptions=True)],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        # Let launches of better rungs that are already in flight finish
+        if self.result is None and self.successes:
+            rank = min(rung_rank(target) for target, _ in self.successes)
+            better = [
+                task for task, target in zip(tasks, self.targets)
+                if id(target) in self.calling and rung_rank(target) < rank
+            ]
+            if better:
+                await asyncio.wait(better, timeout=self.SETTLE_TIMEOUT)
+            self.result = self._best_success(self.successes)
+
+        for task in tasks + [waiter] + helpers:
+            task.cancel()
+        await asyncio.gather(*tasks, waiter, *helpers, return_exceptions=True)
+
+        return self.result or ("MAX_ATTEMPTS", None, None)
+
+    async def _watch_coordination(self, done):
+        """Stop all target loops on a win of another sniper"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Backend I/O off the event loop (not in the bounded launch executor)
+            fulfilled = await loop.run_in_executor(None, self._poll_coordination)
+            if fulfilled:
+                self.result = fulfilled
+                done.set()
+                return
+            await asyncio.sleep(COORDINATION_POLL_SECONDS)
+
+    async def _save_checkpoints(self):
+        while True:
+            await asyncio.sleep(self.checkpoint.interval)
+            self.checkpoint.save(self)
+
+    def run(self):
+        """Run the asyncio attempt loop (same result tuple as SniperEngine.run)"""
+        if self.pending:
+            return self.pending.pop(0)
+        return asyncio.run(self._run())
+
+
+def get_profile_regions(profile, region_ids=None):
+    """Regions of one account profile
+
+    The profile's "regions" are region identifiers (entries of regions.json)
+    or regions.json-style entries, merged over the shared ones: subnets and
+    images belong to one tenancy. Its compartment_id overrides the shared one.
+    """
+    shared = {region_id: entry for region_id, entry in REGIONS_FILE.items() if isinstance(entry, dict)}
+    own = profile["regions"]
+    if own is None:
+        own = {region_id: {} for region_id in shared}
+    elif isinstance(own, list):
+        own = {region_id: {} for region_id in own}
+    compartment = {"compartment_id": profile["compartment_id"]} if profile["compartment_id"] else {}
+    entries = {region_id: {**shared.get(region_id, {}), **compartment, **entry} for region_id, entry in own.items()}
+
+    regions = [
+        region for region in get_configured_regions(None, entries) if not region_ids or region["id"] in region_ids
     ]
+    for region in regions:
+        region["profile"] = profile["name"]
+        region["share"] = profile["share"]
+    return regions
+
+
+def profile_prefix(region):
+    """Log prefix naming the account profile of a region ("" without profiles)"""
+    return f"[{region['profile']}] " if region.get("profile") else ""
+
+
+def get_sniper_regions(region_ids=None):
+    """Configured regions, or the legacy single region from ~/.oci/config"""
+    if PROFILES:
+        return [region for profile in PROFILES for region in get_profile_regions(profile, region_ids)]
+    regions = get_configured_regions(region_ids)
+    if not regions:
+        # No regions.json entries: legacy single region from ~/.oci/config
+        regions = [
+            {
+                "id": None,
+                "name": None,
+                "compartment_id": COMPARTMENT_ID,
+                "image_id": IMAGE_ID,
+                "subnet_id": SUBNET_ID,
+                "reserved_public_ip_ocid": "",
+            }
+        ]
+    return regions
+
+
+def check_configuration(region_ids=None):
+    """Validate the configuration without any API call (check command)"""
+    if not validate_configuration(get_sniper_regions(region_ids)):
+        return 1
+    logger.info(f"[OK] {t('config_valid')}")
+    return 0
+
+
+def finish_instance(target, instance):
+    """Success path of one launched instance: RUNNING, reserved IP, SSH info, notifications"""
+    global NOTIFIER
+
+    # Wait for instance to be RUNNING, binding the reserved IP meanwhile
+    winning_region = target["region"]
+    reserved_ip_obj = winning_region["reserved_ip"]
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="reserved-ip") as executor:
+        attach_future = None
+        if reserved_ip_obj:
+            attach_future = executor.submit(
+                attach_reserved_ip,
+                winning_region["compute_client"],
+                winning_region["network_client"],
+                instance,
+                reserved_ip_obj,
+            )
+        instance, public_ip, private_ip = wait_for_instance_running(
+            winning_region["compute_client"],
+            instance.id,
+            winning_region["network_client"],
+            work_request_client=winning_region["work_request_client"],
+            work_request_id=target.get("work_request_id"),
+        )
+        attached_address = attach_future.result() if attach_future else None
 
-    for pattern in valid_patterns:
-        if re.match(pattern, ssh_key):
-            return True
-    return False
+    # The address read while waiting may be the released ephemeral IP: attach_reserved_ip() knows better
+    if attached_address is not None:
+        public_ip = attached_address or None
 
+    logger.info("\n" + "=" * 80)
+    if instance.lifecycle_state == "RUNNING" or not public_ip:
+        logger.info(f"[!!!] {t('instance_created_title')}")
+    else:
+        # Returned on the public IP: reachable soon, SSH works once it is RUNNING
+        logger.info(f"[!!!] {t('instance_provisioning_title')}")
+    logger.info("=" * 80)
+    logger.info(f"{t('instance_details')}:")
+    logger.info(f"  - Name: {instance.display_name}")
+    logger.info(f"  - OCID: {instance.id}")
+    logger.info(
+        f"  - {t('availability_domains')}: {instance.availability_domain}"
+    )
+    logger.info(f"  - Shape: {instance.shape}")
+    if instance.shape_config:
+        logger.info(
+            f"  - Config: {instance.shape_config.ocpus:g} OCPUs, {instance.shape_config.memory_in_gbs:g} GB RAM"
+        )
+    logger.info(f"  - State: {instance.lifecycle_state}")
+
+    if public_ip:
+        logger.info("")
+        logger.info("=" * 80)
+        logger.info(f"🌐 {t('ssh_connection_info')}")
+        logger.info("=" * 80)
+        logger.info(f"{t('public_ip')}: {public_ip}")
+        if private_ip:
+            logger.info(f"{t('private_ip')}: {private_ip}")
+        logger.info("")
+        logger.info(f"{t('ssh_command')}:")
+        logger.info(f"  ssh ubuntu@{public_ip}")
+        logger.info("")
+        logger.info("First-time connection (auto-accepts fingerprint):")
+        logger.info(
+            f"  ssh -o StrictHostKeyChecking=accept-new ubuntu@{public_ip}"
+        )
+        logger.info("=" * 80)
 
-def validate_configuration():
-    """Validate all required configuration values before starting."""
-    errors = []
+        # Generate SSH config
+        generate_ssh_config(public_ip, instance.display_name)
 
-    # Check OCIDs
-    if "your_compartment_id_here" in COMPARTMENT_ID:
-        errors.append("COMPARTMENT_ID is not configured")
+        # Email, webhooks, commands and desktop toast in the background
+        NOTIFIER = NOTIFIER or create_notifier()
+        if NOTIFIER:
+            NOTIFIER.notify(build_notification(instance, public_ip, private_ip, winning_region))
 
-    if "your_image_id_here" in IMAGE_ID:
-        errors.append("IMAGE_ID is not configured")
+    logger.info("")
+    logger.info(f"{t('next_steps')}:")
+    logger.info(f"{t('step_1')}")
+    logger.info(f"{t('step_2')}")
+    logger.info(f"{t('step_3')}")
+    logger.info(f"{t('step_4')}")
+    logger.info("=" * 80)
 
-    if "your_subnet_id_here" in SUBNET_ID:
-        errors.append("SUBNET_ID is not configured")
 
-    # Check SSH key with helpful examples
-    if (
-        "your_ssh_public_key_here" in SSH_PUBLIC_KEY
-        or len(SSH_PUBLIC_KEY.strip()) < 100
-    ):
-        errors.append("SSH_PUBLIC_KEY is not configured")
-        errors.append("  → Example: ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAACAQ... user@host")
-        errors.append("  → Generate new key: ssh-keygen -t rsa -b 4096")
-        errors.append("  → Or use existing: cat ~/.ssh/id_rsa.pub")
-    elif not validate_ssh_key(SSH_PUBLIC_KEY):
-        errors.append(
-            "SSH_PUBLIC_KEY has invalid format (must be ssh-rsa, ssh-ed25519, or ecdsa-sha2-*)"
+def reconcile_instances(target, instance, regions, since):
+    """Find duplicates of a launched instance and terminate them per RECONCILE_POLICY
+
+    Launch calls already in flight at the win (other ADs, rungs, regions)
+    and snipers without coordination can land more instances. Every other
+    instance named INSTANCE_NAME, created since the run started, in the
+    regions of the winner's account profile is surplus. "own" terminates
+    the surplus launched by this process (recognized by its retry-token tag,
+    also for launches that got no response) and only reports the rest
+    (maybe another sniper's win), "all" terminates all of it, "report" none.
+
+    Args:
+        target: Winning target
+        instance: The instance kept
+        regions: Sniped region dicts (with clients)
+        since: Start of the run (aware datetime), older instances are never touched
+
+    Returns:
+        Ids of the terminated instances
+    """
+    # Launch calls still running at the win land first (retries included)
+    if not LAUNCHES.wait_idle(target["region"], RECONCILE_SETTLE_SECONDS):
+        logger.warning(f"[!]  Launch calls still running after {RECONCILE_SETTLE_SECONDS}s, checking for duplicates anyway")
+
+    surplus = []
+    for region in regions:
+        if region.get("profile") != target["region"].get("profile") or "compute_client" not in region:
+            continue
+        try:
+            found = oci.pagination.list_call_get_all_results(
+                region["compute_client"].list_instances,
+                region["compartment_id"],
+                display_name=INSTANCE_NAME,
+            ).data
+        except oci.exceptions.ServiceError as e:
+            logger.warning(f"[!]  {t('reconcile_failed')} {region['id']}: {e.message}")
+            continue
+        except (oci.exceptions.RequestException, oci.exceptions.ConnectTimeout, ConnectionError, TimeoutError) as e:
+            logger.warning(f"[!]  {t('reconcile_failed')} {region['id']}: {str(e)}")
+            continue
+        surplus.extend(
+            (region, other) for other in found
+            if other.id != instance.id
+            and other.lifecycle_state not in ("TERMINATING", "TERMINATED")
+            and other.time_created and other.time_created >= since
         )
-        errors.append("  → Ensure the key starts with 'ssh-rsa', 'ssh-ed25519', or 'ecdsa-sha2-nistp256'")
 
-    # Validate OCID format
-    if not COMPARTMENT_ID.startswith("ocid1."):
-        errors.append("COMPARTMENT_ID has invalid format (must start with 'ocid1.')")
+    terminated = []
+    for region, other in surplus:
+        own = LAUNCHES.is_own(other)
+        if RECONCILE_POLICY == "report" or (RECONCILE_POLICY == "own" and not own):
+            logger.warning(
+                f"[!]  {t('duplicate_instance')}: {other.id} ({other.availability_domain}, {other.lifecycle_state})"
+                f"{'' if own else ' - not launched by this sniper'}"
+            )
+            continue
+        if terminate_duplicate(region, other):
+            terminated.append(other.id)
+    return terminated
 
-    if not IMAGE_ID.startswith("ocid1.image"):
-        errors.append("IMAGE_ID has invalid format (must start with 'ocid1.image')")
 
-    if not SUBNET_ID.startswith("ocid1.subnet"):
-        errors.append("SUBNET_ID has invalid format (must start with 'ocid1.subnet')")
+def terminate_duplicate(region, instance):
+    """Terminate a surplus instance
 
-    if errors:
-        logger.error(t("config_errors_found"))
-        for error in errors:
-            logger.error(f"   - {error}")
-        logger.error("")
-        logger.error(t("please_run_setup"))
-        logger.error(t("setup_command"))
+    Returns:
+        True if the terminate call was accepted
+    """
+    try:
+        region["compute_client"].terminate_instance(instance.id)
+    except oci.exceptions.ServiceError as e:
+        logger.error(f"[X] {t('duplicate_terminate_failed')} {instance.id}: {e.message}")
         return False
-
+    except (oci.exceptions.RequestException, oci.exceptions.ConnectTimeout, ConnectionError, TimeoutError) as e:
+        logger.error(f"[X] {t('duplicate_terminate_failed')} {instance.id}: {str(e)}")
+        return False
+    logger.warning(f"[!]  {t('duplicate_terminated')}: {instance.id} ({instance.availability_domain})")
     return True
 
 
-def main():
-    """Main function to continuously attempt instance creation."""
+def main(region_ids=None, engine_mode=None, daemon=False, reset_coordination=False):
+    """Main function to continuously attempt instance creation.
+
+    All configured regions (or the requested ones) are sniped from this single
+    process: one scheduler fans out over every (region, AD) pair. In daemon
+    mode there is no attempt limit and the control API can change regions,
+    shapes and polling at runtime. With a coordination backend, all snipers
+    sharing it stop once one of them has launched the instance.
+    """
+
+    global HISTORY, COORDINATOR
+
+    engine_mode = engine_mode or ENGINE
+    if (daemon or PROFILES) and engine_mode == "async":
+        logger.warning(f"[!]  {'Daemon mode' if daemon else 'Account profiles'} use the threads engine")
+        engine_mode = "threads"
 
     logger.info("=" * 80)
     logger.info(t("title"))
     logger.info("=" * 80)
 
+    regions = get_sniper_regions(region_ids)
+    if not regions:
+        logger.error("[X] No regions to snipe in (check the profiles in sniper-config.json)")
+        sys.exit(1)
+
     # Validate configuration
-    if not validate_configuration():
+    if not validate_configuration(regions):
         sys.exit(1)
 
     logger.info(f"{t('target_shape')}: {SHAPE}")
     logger.info(f"{t('target_config')}: {OCPUS} OCPUs, {MEMORY_IN_GBS} GB RAM, {BOOT_VOLUME_SIZE_IN_GBS} GB Boot Volume")
+    if len(SHAPE_LADDER) > 1:
+        logger.info(
+            f"{t('shape_ladder')} ({SHAPE_LADDER_MODE}): {' > '.join(rung_label(rung) for rung in SHAPE_LADDER)}"
+        )
+        if RESIZE_UP_ENABLED:
+            logger.info(f"Resize up: {RESIZE_UP_ATTEMPTS} attempts")
     logger.info(f"{t('availability_domains')}: {', '.join(AVAILABILITY_DOMAINS)}")
     logger.info(f"{t('retry_delay')}: {RETRY_DELAY_SECONDS} seconds")
-    logger.info(f"{t('max_attempts')}: {MAX_ATTEMPTS}")
+    logger.info(f"{t('max_attempts')}: {'-' if daemon else MAX_ATTEMPTS}")
+    logger.info(f"Engine: {engine_mode}{' (daemon)' if daemon else ''}")
+    if SCHEDULER == "adaptive":
+        logger.info(f"Scheduler: adaptive ({REQUEST_BUDGET_PER_MINUTE} requests/min)")
+    elif SCHEDULER == "hedged":
+        logger.info(f"Scheduler: hedged (hedge after {HEDGE_AFTER_SECONDS or '-'}s)")
+    else:
+        logger.info("Scheduler: fixed")
     logger.info("=" * 80)
 
-    # Initialize OCI config and clients
+    # Initialize OCI config and region-scoped clients (one OCI config per account profile)
+    load_sdk()
     try:
-        config = oci.config.from_file("~/.oci/config", CONFIG_PROFILE)
-        compute_client = oci.core.ComputeClient(config)
-        network_client = oci.core.VirtualNetworkClient(config)
-        identity_client = oci.identity.IdentityClient(config)
+        oci_configs = {profile["name"]: load_oci_config(profile["oci_profile"]) for profile in PROFILES}
+        oci_configs[None] = config = load_oci_config() if not PROFILES else None
+        for region in regions:
+            init_region_clients(oci_configs[region.get("profile")], region)
         logger.info(f"[OK] {t('oci_init_success')}")
     except Exception as e:
         logger.error(f"[X] {t('oci_init_failed')}: {str(e)}")
@@ -902,220 +5180,264 @@ def main():
             logger.error("Please run: oci setup config")
         sys.exit(1)
 
-    # Get full availability domain names
+    logger.info(f"{t('regions')}: {', '.join(profile_prefix(region) + region['id'] for region in regions)}")
+
+    # Exactly-once launch with the other snipers sharing the coordination backend
     try:
-        compartment = config["tenancy"]
-        list_ads = identity_client.list_availability_domains(compartment)
-        full_ad_names = [ad.name for ad in list_ads.data]
-        logger.info(f"{t('available_ads')}: {', '.join(full_ad_names)}")
-    except Exception as e:
-        logger.warning(f"Could not fetch AD names: {str(e)}")
-        full_ad_names = AVAILABILITY_DOMAINS
+        COORDINATOR = open_coordinator()
+        if COORDINATOR:
+            goals = sorted({coordination_goal(region) for region in regions})
+            if reset_coordination:
+                for goal in goals:
+                    COORDINATOR.reset(goal)
+            logger.info(
+                f"Coordination: {COORDINATOR.name} ({', '.join(goals)})"
+                f"{' - reset' if reset_coordination else ''}"
+            )
+    except CoordinationError as e:
+        logger.error(f"[X] {t('coordination_error')}: {str(e)}")
+        return 1
 
     # Reserved IP: Automatisch pruefen ob eine existiert
     logger.info("")
-    configured_ip_ocid = CONFIG_FILE.get("reserved_public_ip_ocid", "").strip()
-
-    # Automatisch nach vorhandener Reserved IP suchen (keine Frage mehr)
     logger.info("=" * 80)
     logger.info(f"[i]  {t('reserved_ip_info')}")
     logger.info("=" * 80)
 
-    reserved_ip_obj = get_or_create_reserved_ip(
-        network_client, COMPARTMENT_ID,
-        reserved_ip_ocid=configured_ip_ocid if configured_ip_ocid else None,
-        create_if_missing=False  # Nur nutzen wenn vorhanden, nicht erstellen
-    )
-    reserved_ip_id = reserved_ip_obj.id if reserved_ip_obj else None
+    # State of an interrupted run: attempt counts, AD names, reserved IPs, launched instances
+    checkpoint = Checkpoint(checkpoint_path(region_ids), CHECKPOINT_SECONDS) if CHECKPOINT_ENABLED else None
 
-    logger.info("")
+    # Resolve AD names and reserved IP per region
+    for region in regions:
+        resolve_region(oci_configs[region.get("profile")], region, checkpoint and checkpoint.region(region))
 
-    # Main retry loop with Ctrl+C handling
-    attempt = 0
-    start_time = datetime.now()
+    # Account profiles with their own API rate limit (OCI throttles per tenancy and region)
+    for profile in PROFILES:
+        if profile["rate_limit_per_second"] or profile["rate_limit_burst"]:
+            for region in regions:
+                if region.get("profile") == profile["name"]:
+                    RATE_LIMITER.set_limit(
+                        rate_key(region), profile["rate_limit_per_second"], profile["rate_limit_burst"]
+                    )
 
-    try:
-        while attempt < MAX_ATTEMPTS:
-            attempt += 1
-
-            # Calculate dynamic retry delay (exponential backoff)
-            if attempt <= 10:
-                retry_delay = 10  # Fast retry first 10 attempts (10s)
-            elif attempt <= 30:
-                retry_delay = 30  # Medium retry next 20 attempts (30s)
-            else:
-                retry_delay = RETRY_DELAY_SECONDS  # Normal retry after that (60s)
+    # Record every attempt for the stats command
+    HISTORY = open_history()
 
-            # Calculate progress and ETA
-            elapsed_time = (datetime.now() - start_time).total_seconds()
-            progress_pct = (attempt / MAX_ATTEMPTS) * 100
-            avg_time_per_attempt = elapsed_time / attempt if attempt > 0 else 0
-            remaining_attempts = MAX_ATTEMPTS - attempt
-            eta_seconds = remaining_attempts * avg_time_per_attempt
-            eta = datetime.now() + timedelta(seconds=eta_seconds) if eta_seconds > 0 else None
+    # Optional metrics endpoint for long-running snipers
+    if METRICS_ENABLED:
+        try:
+            start_metrics_server(METRICS, METRICS_HOST, METRICS_PORT)
+        except OSError as e:
+            logger.warning(f"[!]  Could not start metrics endpoint on {METRICS_HOST}:{METRICS_PORT}: {str(e)}")
+
+    # One target per (region, AD) pair, all driven by the same scheduler.
+    # "concurrent" ladder mode fires every shape configuration as its own target.
+    if SHAPE_LADDER_MODE == "concurrent" and len(SHAPE_LADDER) > 1:
+        targets = [
+            (region, ad, rung) for region in regions for ad in region["ad_names"] for rung in SHAPE_LADDER
+        ]
+    else:
+        targets = [(region, ad) for region in regions for ad in region["ad_names"]]
 
-            logger.info(f"\n{'='*80}")
+    logger.info("")
+
+    # Main retry loop with Ctrl+C handling
+    if engine_mode == "async":
+        engine = AsyncSniperEngine(targets)
+    else:
+        engine = SniperEngine(targets, daemon=daemon)
+
+    # Resume instead of starting over with the fast retries of attempt 1
+    if checkpoint:
+        engine.checkpoint = checkpoint
+        restored = checkpoint.restore(engine)
+        checkpoint.resume_launched(engine)
+        if restored:
             logger.info(
-                f"{t('attempt')} {attempt}/{MAX_ATTEMPTS} ({progress_pct:.1f}%) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                f"[OK] {t('resumed_checkpoint')}: {restored}/{len(engine.targets)} targets, "
+                f"{t('attempt').lower()} {engine.round}, {engine.start_time:%Y-%m-%d %H:%M}"
             )
-            if eta:
-                logger.info(f"[t]  Running: {elapsed_time/3600:.1f}h | ETA: {eta.strftime('%H:%M')}")
-            logger.info(f"{'='*80}")
 
-            # Try availability domains in parallel (max 3 workers for 3 ADs)
-            success = False
-            instance = None
-            quota_error = False
+    if daemon:
 
-            with ThreadPoolExecutor(max_workers=min(3, len(full_ad_names))) as executor:
-                # Submit all AD attempts concurrently
-                future_to_ad = {
-                    executor.submit(try_create_instance, compute_client, ad, reserved_ip_id): ad
-                    for ad in full_ad_names
-                }
-
-                # Process results as they complete
-                for future in as_completed(future_to_ad):
-                    ad = future_to_ad[future]
-                    try:
-                        ad_success, ad_instance = future.result()
-                        if ad_success == "QUOTA_ERROR":
-                            quota_error = True
-                            # Cancel remaining futures
-                            for f in future_to_ad:
-                                f.cancel()
-                            break
-                        elif ad_success:
-                            success = True
-                            instance = ad_instance
-                            # Cancel remaining futures
-                            for f in future_to_ad:
-                                f.cancel()
-                            break
-                    except Exception as e:
-                        logger.error(f"[X] Exception in parallel AD check for {ad}: {str(e)}")
-
-            # Exit if quota exceeded - retrying won't help
-            if quota_error:
-                logger.error("")
-                logger.error("=" * 80)
-                logger.error(f"[X] {t('quota_error_exit')}")
-                logger.error("=" * 80)
-                return 1
-
-            if success:
-                # Wait for instance to be RUNNING
-                instance, public_ip, private_ip = wait_for_instance_running(
-                    compute_client, instance.id, network_client
-                )
+        def load_region(region_id):
+            """Region from regions.json with clients and AD names (control API)"""
+            if PROFILES:
+                raise ValueError("Adding regions is not supported with account profiles")
+            region = get_sniper_regions([region_id])[0]
+            init_region_clients(config, region)
+            resolve_region(config, region)
+            return region
 
-                # If reserved IP was created but no public IP from VNIC, use reserved IP
-                if not public_ip and reserved_ip_obj:
-                    public_ip = reserved_ip_obj.ip_address
-
-                logger.info("\n" + "=" * 80)
-                logger.info(f"[!!!] {t('instance_created_title')}")
-                logger.info("=" * 80)
-                logger.info(f"{t('instance_details')}:")
-                logger.info(f"  - Name: {instance.display_name}")
-                logger.info(f"  - OCID: {instance.id}")
-                logger.info(
-                    f"  - {t('availability_domains')}: {instance.availability_domain}"
-                )
-                logger.info(f"  - Shape: {instance.shape}")
-                logger.info(f"  - State: {instance.lifecycle_state}")
+        try:
+            start_control_server(engine, CONTROL_HOST, CONTROL_PORT, CONTROL_TOKEN, load_region)
+        except OSError as e:
+            logger.error(f"[X] Could not start control API on {CONTROL_HOST}:{CONTROL_PORT}: {str(e)}")
+            return 1
+
+    # Config edits apply without a restart (the async engine has no command hook)
+    watcher = None
+    if CONFIG_RELOAD_SECONDS and engine_mode != "async":
+        watcher = ConfigWatcher(engine, config, region_ids).start()
+
+    def finish(target, instance):
+        finish_instance(target, instance)
+        if RECONCILE_ENABLED:
+            # After the RUNNING wait: launches still in flight at the win have landed by now
+            reconcile_instances(target, instance, regions, engine.start_time.astimezone(timezone.utc))
+        if checkpoint:
+            checkpoint.finished(engine, instance)
+        # Landed on a smaller rung: try to grow to the best configuration, after everything else is done
+        if RESIZE_UP_ENABLED and len(SHAPE_LADDER) > 1:
+            resize_up(target["region"]["compute_client"], instance, RESIZE_UP_ATTEMPTS)
+
+    # Account profiles: instances of finished profiles boot while the others keep sniping
+    finisher = ThreadPoolExecutor(thread_name_prefix="finish")
+    finishing = []
 
-                if public_ip:
-                    logger.info("")
-                    logger.info("=" * 80)
-                    logger.info(f"🌐 {t('ssh_connection_info')}")
-                    logger.info("=" * 80)
-                    logger.info(f"{t('public_ip')}: {public_ip}")
-                    if private_ip:
-                        logger.info(f"{t('private_ip')}: {private_ip}")
-                    logger.info("")
-                    logger.info(f"{t('ssh_command')}:")
-                    logger.info(f"  ssh ubuntu@{public_ip}")
+    try:
+        try:
+            while True:
+                status, target, instance = engine.run()
+                if status == "SUCCESS" and checkpoint:
+                    checkpoint.launched(engine, target, instance)
+                if status == "QUOTA_ERROR":
+                    # Retrying won't help (for this account profile)
+                    logger.error("")
+                    logger.error("=" * 80)
+                    logger.error(f"[X] {profile_prefix(target['region'])}{t('quota_error_exit')}")
+                    logger.error("=" * 80)
+                elif status == "FULFILLED":
+                    # Another sniper won: no duplicate (for this account profile)
                     logger.info("")
-                    logger.info("First-time connection (auto-accepts fingerprint):")
                     logger.info(
-                        f"  ssh -o StrictHostKeyChecking=accept-new ubuntu@{public_ip}"
+                        f"[OK] {profile_prefix(target['region'])}{t('fulfilled_elsewhere')}: "
+                        f"{instance.get('instance_id')} ({instance.get('region') or '-'}, {instance.get('owner')})"
                     )
-                    logger.info("=" * 80)
-
-                    # Generate SSH config
-                    generate_ssh_config(public_ip, instance.display_name)
-
-                    # Send email notification
-                    send_email_notification(instance, public_ip, private_ip)
-
-                    # Windows Desktop Notification
-                    try:
-                        if sys.platform == "win32":
-                            try:
-                                # Try winotify first (modern, Python 3.13 compatible)
-                                from winotify import Notification, audio
-                                toast = Notification(
-                                    app_id="OCI Instance Sniper",
-                                    title="OCI Instance Ready!",
-                                    msg=f"Instance created: {public_ip}\nSSH: ssh ubuntu@{public_ip}",
-                                    duration="long"
-                                )
-                                toast.set_audio(audio.Default, loop=False)
-                                toast.show()
-                            except ImportError:
-                                # Fallback to win10toast (older, may not work on Python 3.13+)
-                                from win10toast import ToastNotifier
-                                toaster = ToastNotifier()
-                                toaster.show_toast(
-                                    "OCI Instance Ready!",
-                                    f"Instance created: {public_ip}",
-                                    duration=15,
-                                    threaded=True
-                                )
-                    except ImportError:
-                        pass  # No notification library installed
-                    except Exception as e:
-                        logger.debug(f"Desktop notification failed: {str(e)}")
-
-                logger.info("")
-                logger.info(f"{t('next_steps')}:")
-                logger.info(f"{t('step_1')}")
-                logger.info(f"{t('step_2')}")
-                logger.info(f"{t('step_3')}")
-                logger.info(f"{t('step_4')}")
-                logger.info("=" * 80)
-                return 0
-
-            # Wait before next attempt (dynamic delay)
-            if attempt < MAX_ATTEMPTS:
-                logger.info(
-                    t("waiting_before_retry").format(seconds=retry_delay)
-                )
-                time.sleep(retry_delay)
+                    logger.info(t("coordination_reset_hint"))
+                elif status != "SUCCESS":
+                    break
+                if not engine.retire_profile(target):
+                    break
+                if status == "SUCCESS":
+                    finishing.append(finisher.submit(finish, target, instance))
+        finally:
+            if watcher:
+                watcher.stop()
+            # Don't wait for losing ADs - the success path starts right away
+            engine.shutdown()
+            finisher.shutdown(wait=True)
+
+        for future in finishing:
+            future.result()
+        launched = bool(finishing)
+
+        if status == "STOPPED":
+            if checkpoint:
+                checkpoint.save(engine)  # A stopped daemon resumes on the next start
+            logger.info("\n[i]  Sniper stopped (control API)")
+            return 0
+
+        if status == "SUCCESS":
+            finish(target, instance)
+        # The run is over: the next start snipes from scratch
+        if checkpoint:
+            checkpoint.clear()
+
+        if status in ("SUCCESS", "FULFILLED"):
+            return 0
+
+        if status == "QUOTA_ERROR":
+            return 0 if launched else 1
 
         logger.warning(
             f"\n[X] {t('max_attempts_reached').format(attempts=MAX_ATTEMPTS)}"
         )
         logger.info(t("script_can_restart"))
-        return 1
+        return 0 if launched else 1
 
     except KeyboardInterrupt:
+        if checkpoint:
+            checkpoint.save(engine)
         logger.info(f"\n\n[!]  {t('script_interrupted')}")
         logger.info(t("script_can_restart"))
         return 130  # Standard exit code for SIGINT
 
 
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="OCI Instance Sniper")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="run",
+        choices=["run", "stats", "check"],
+        help="run: snipe instances (default), stats: show capacity statistics from the attempt history, "
+        "check: validate the configuration and exit",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        help="stats: only include the last N days",
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        dest="regions",
+        metavar="REGION",
+        help="Only snipe in this region (repeatable). Default: all regions configured in config/regions.json",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        help="Attempt loop implementation (default: 'engine' from sniper-config.json or threads)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run without attempt limit or prompts, controlled via the local control API "
+        "('control' in sniper-config.json, default http://127.0.0.1:9465)",
+    )
+    parser.add_argument(
+        "--reset-coordination",
+        action="store_true",
+        help="Forget the instance launched by the coordinated snipers ('coordination' in sniper-config.json) "
+        "and snipe another one",
+    )
+    args = parser.parse_args()
+
+    # OCI_REGION (comma separated) is used when no --region is given
+    if not args.regions and os.getenv("OCI_REGION"):
+        args.regions = [r.strip() for r in os.getenv("OCI_REGION").split(",") if r.strip()]
+
+    return args
+
+
 if __name__ == "__main__":
-    # Select language interactively if not set in config
-    select_language()
+    # Config, .env and logging first: OCI_REGION may come from .env
+    init_runtime()
+    args = parse_args()
+
+    if args.command == "stats":
+        sys.exit(print_stats(args.days))
+    if args.command == "check":
+        sys.exit(check_configuration(args.regions))
+
+    # Select language interactively if not set in config (no prompt as daemon)
+    if not args.daemon:
+        select_language()
 
     try:
-        sys.exit(main())
+        exit_code = main(args.regions, args.engine, args.daemon, args.reset_coordination)
     except KeyboardInterrupt:
         logger.info(f"\n\n[!]  {t('script_interrupted')}")
         logger.info(t("script_can_restart"))
-        sys.exit(0)
+        exit_code = 0
     except Exception as e:
         logger.error(f"\n[X] {t('fatal_error')}: {str(e)}")
-        sys.exit(1)
+        exit_code = 1
+
+    # Bounded grace period for notifications still in the queue
+    if NOTIFIER:
+        NOTIFIER.close(NOTIFY_FLUSH_SECONDS)
+    sys.exit(exit_code)
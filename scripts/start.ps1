@@ -171,6 +171,9 @@ function Show-MainMenu {
 
     Write-Host ""
     Write-Host "  ----------------------------------------" -ForegroundColor DarkGray
+    if ($configuredRegions.Count -gt 1) {
+        Write-Host "  [A] Alle Regionen (ein Prozess)" -ForegroundColor Yellow
+    }
     Write-Host "  [8] Logs anzeigen" -ForegroundColor Yellow
     Write-Host "  [9] Setup neue Region" -ForegroundColor Yellow
     Write-Host "  [0] Beenden" -ForegroundColor Yellow
@@ -179,30 +182,38 @@ function Show-MainMenu {
 }
 
 function Start-Sniper {
+    # $Region = $null startet alle konfigurierten Regionen in einem Prozess
     param($Region, [switch]$Background)
 
     $pythonScript = Join-Path $ScriptDir "oci-instance-sniper.py"
     $logsDir = Join-Path $ProjectRoot "logs"
     if (-not (Test-Path $logsDir)) { New-Item -ItemType Directory -Path $logsDir | Out-Null }
 
-    $logFile = Join-Path $logsDir "$($Region.id)_$(Get-Date -Format 'yyyyMMdd_HHmmss').log"
+    # Regions-OCIDs liest das Python-Script selbst aus config\regions.json
+    Remove-Item Env:OCI_REGION -ErrorAction SilentlyContinue
+    $pythonArgs = @($pythonScript)
+    if ($Region) {
+        $pythonArgs += @("--region", $Region.id)
+        $logName = $Region.id
+        $displayName = $Region.name
+    } else {
+        $logName = "all-regions"
+        $displayName = ($configuredRegions | ForEach-Object { $_.name }) -join ", "
+    }
 
-    $env:OCI_REGION = $Region.id
-    $env:OCI_IMAGE_ID = $Region.image_id
-    $env:OCI_SUBNET_ID = $Region.subnet_id
-    $env:OCI_COMPARTMENT_ID = $Region.compartment_id
+    $logFile = Join-Path $logsDir "$($logName)_$(Get-Date -Format 'yyyyMMdd_HHmmss').log"
 
     Write-Host ""
-    Write-Host "  Starte $($Region.name)..." -ForegroundColor Green
+    Write-Host "  Starte $displayName..." -ForegroundColor Green
     Write-Host "  Log: $logFile" -ForegroundColor DarkGray
 
     if ($Background) {
-        Start-Process -FilePath "python" -ArgumentList $pythonScript -WindowStyle Hidden -RedirectStandardOutput $logFile -RedirectStandardError "$logFile.err"
+        Start-Process -FilePath "python" -ArgumentList $pythonArgs -WindowStyle Hidden -RedirectStandardOutput $logFile -RedirectStandardError "$logFile.err"
         Write-Host "  [OK] Im Hintergrund gestartet" -ForegroundColor Green
         Write-Host "`n  Taste druecken..." -ForegroundColor DarkGray
         $null = Get-Key
     } else {
-        & python $pythonScript 2>&1 | Tee-Object -FilePath $logFile
+        & python @pythonArgs 2>&1 | Tee-Object -FilePath $logFile
     }
 }
 
@@ -376,6 +387,7 @@ while ($true) {
 
     switch ($choice) {
         "0" { exit }
+        "a" { Show-ModeMenu -Region $null }
         "8" { Show-Logs }
         "9" { Setup-Region }
         default {
@@ -0,0 +1,125 @@
+"""
+Launch coordination tests: two snipers on one backend (file, SQLite, and
+Redis via the stand-in of scripts/fake-oci-server.py) keep one instance.
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import types
+import unittest
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def load_script(filename, module_name):
+    """Import one of the hyphenated scripts in scripts/ as a module"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fake = load_script("fake-oci-server.py", "fake_oci_server")
+sniper = load_script("oci-instance-sniper.py", "oci_instance_sniper")
+
+GOAL = "oci-instance"
+
+
+def instance(name):
+    return types.SimpleNamespace(id=f"ocid1.instance.oc1..{name}")
+
+
+class CoordinatorTests:
+    """Shared cases; subclasses create the coordinators of one backend"""
+
+    def make_coordinator(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        sniper.apply_config({"language": "EN"})
+        self.workdir = tempfile.mkdtemp(prefix="sniper-coordination-")
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        # Two snipers: same backend and goal, different owners (as if on two hosts)
+        self.first, self.second = self.make_coordinator(), self.make_coordinator()
+        self.first.owner, self.second.owner = "host-a:1", "host-b:2"
+
+    def test_only_one_concurrent_claim_wins(self):
+        instances = {self.first: instance("first"), self.second: instance("second")}
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def claim(coordinator):
+            barrier.wait()
+            results[coordinator.owner] = coordinator.claim(GOAL, instances[coordinator])
+
+        threads = [threading.Thread(target=claim, args=(c,)) for c in instances]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        self.assertEqual(sorted(results.values()), [False, True])
+        winner = self.first if results["host-a:1"] else self.second
+        for coordinator in instances:
+            marker = coordinator.fulfilled(GOAL)
+            self.assertEqual(marker["owner"], winner.owner)
+            self.assertEqual(marker["instance_id"], instances[winner].id)
+
+    def test_fulfilled_stops_the_other_sniper(self):
+        self.assertIsNone(self.second.fulfilled(GOAL))
+        self.assertTrue(self.first.claim(GOAL, instance("first")))
+
+        self.assertEqual(self.second.fulfilled(GOAL)["owner"], "host-a:1")
+        self.assertIsNone(self.second.acquire(GOAL))
+        self.assertFalse(self.second.claim(GOAL, instance("second")))
+        # The winner's own later claims keep theirs (duplicates go to reconcile_instances())
+        self.assertTrue(self.first.claim(GOAL, instance("first-again")))
+
+    def test_reset_allows_a_new_win(self):
+        self.first.claim(GOAL, instance("first"))
+        self.second.reset(GOAL)
+        self.assertIsNone(self.first.fulfilled(GOAL))
+        self.assertTrue(self.second.claim(GOAL, instance("second")))
+
+
+class FileCoordinatorTest(CoordinatorTests, unittest.TestCase):
+    def make_coordinator(self):
+        return sniper.FileCoordinator(self.workdir, key=GOAL, wait_seconds=2)
+
+
+class SqliteCoordinatorTest(CoordinatorTests, unittest.TestCase):
+    def make_coordinator(self):
+        return sniper.SqliteCoordinator(os.path.join(self.workdir, "coordination.db"), key=GOAL, wait_seconds=2)
+
+
+class RedisCoordinatorTest(CoordinatorTests, unittest.TestCase):
+    def setUp(self):
+        self.server = fake.make_server("127.0.0.1", 0, fake.load_scenario())
+        self.redis = fake.make_redis_server(self.server.cloud, "127.0.0.1", 0)
+        threading.Thread(target=self.redis.serve_forever, daemon=True).start()
+        super().setUp()
+
+    def tearDown(self):
+        for coordinator in (self.first, self.second):
+            coordinator._close()
+        self.redis.shutdown()
+        self.redis.server_close()
+        self.server.server_close()
+
+    def make_coordinator(self):
+        url = f"redis://127.0.0.1:{self.redis.server_address[1]}"
+        return sniper.RedisCoordinator(url, key=GOAL, wait_seconds=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
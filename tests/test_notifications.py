@@ -0,0 +1,162 @@
+"""
+Notification dispatcher tests against the SMTP sink and webhook hook of
+scripts/fake-oci-server.py (no network access, no OCI SDK needed).
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+import urllib.request
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def load_script(filename, module_name):
+    """Import one of the hyphenated scripts in scripts/ as a module"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+fake = load_script("fake-oci-server.py", "fake_oci_server")
+sniper = load_script("oci-instance-sniper.py", "oci_instance_sniper")
+
+PAYLOAD = {
+    "event": "instance_created",
+    "instance_id": "ocid1.instance.oc1..test",
+    "name": "oci-instance",
+    "region": "eu-frankfurt-1",
+    "availability_domain": "FAKE:EU-FRANKFURT-1-AD-1",
+    "shape": "VM.Standard.A1.Flex",
+    "ocpus": 4,
+    "memory_in_gbs": 24,
+    "public_ip": "130.61.0.1",
+    "private_ip": "10.0.0.2",
+    "state": "RUNNING",
+    "created_at": "2026-01-01 00:00:00",
+}
+
+
+class DispatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.server = fake.make_server("127.0.0.1", 0, fake.load_scenario())
+        self.smtp = fake.make_smtp_server(self.server.cloud, "127.0.0.1", 0)
+        for server in (self.server, self.smtp):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}"
+        sniper.apply_config(
+            {
+                "language": "EN",
+                "email": {
+                    "enabled": True,
+                    "smtp_server": "127.0.0.1",
+                    "smtp_port": self.smtp.server_address[1],
+                    "starttls": False,
+                    "from": "sniper@example.com",
+                    "to": "me@example.com",
+                    "password": "",
+                },
+            }
+        )
+        self.dispatchers = []
+
+    def tearDown(self):
+        for dispatcher in self.dispatchers:
+            dispatcher.closing.set()
+        for server in (self.server, self.smtp):
+            server.shutdown()
+            server.server_close()
+
+    def dispatcher(self, channels, **kwargs):
+        dispatcher = sniper.NotificationDispatcher(channels, **kwargs)
+        self.dispatchers.append(dispatcher)
+        return dispatcher
+
+    def events(self, operation):
+        with urllib.request.urlopen(f"{self.endpoint}/_fake/events", timeout=10) as response:
+            return [event for event in json.loads(response.read()) if event["operation"] == operation]
+
+    def wait_for(self, operation, count, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            events = self.events(operation)
+            if len(events) >= count:
+                return events
+            time.sleep(0.05)
+        return self.events(operation)
+
+    def test_full_queue_drops_notification(self):
+        # The only worker hangs in the SMTP greeting, the queue holds one job
+        self.server.cloud.scenario["smtp_delay_seconds"] = 2
+        dispatcher = self.dispatcher([sniper.EmailChannel(5)], queue_size=1, workers=1, retries=1)
+        with self.assertLogs(sniper.logger, "WARNING") as logs:
+            for _ in range(3):
+                dispatcher.notify(PAYLOAD)
+        self.assertTrue(any("queue full" in line for line in logs.output))
+        dispatcher.close(10)
+        self.assertLess(len(self.wait_for("smtp_message", 3, timeout=1)), 3)
+
+    def test_webhook_retried_after_failure(self):
+        self.server.cloud.scenario["webhook_fail_count"] = 1
+        channel = sniper.WebhookChannel(f"{self.endpoint}/_fake/webhook", 5)
+        dispatcher = self.dispatcher([channel], retries=3)
+        dispatcher.notify(PAYLOAD)
+        dispatcher.close(10)
+        self.assertEqual([event["status"] for event in self.events("webhook")], [500, 200])
+
+    def test_slow_smtp_times_out_without_delaying_webhook(self):
+        self.server.cloud.scenario["smtp_delay_seconds"] = 3
+        webhook = sniper.WebhookChannel(f"{self.endpoint}/_fake/webhook", 5)
+        dispatcher = self.dispatcher([sniper.EmailChannel(0.5), webhook], workers=2, retries=1)
+        started = time.monotonic()
+        with self.assertLogs(sniper.logger, "WARNING") as logs:
+            dispatcher.notify(PAYLOAD)
+            self.assertEqual(len(self.wait_for("webhook", 1)), 1)
+            webhook_seconds = time.monotonic() - started
+            dispatcher.close(10)
+        self.assertLess(webhook_seconds, 1)
+        # Gave up after the 0.5s timeout instead of waiting for the 3s greeting
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertTrue(any(sniper.t("email_failed") in line for line in logs.output))
+        self.assertEqual(self.events("smtp_message"), [])
+
+    def test_smtp_connection_reused(self):
+        channel = sniper.EmailChannel(5)
+        channel.send(PAYLOAD)
+        connection = channel.server
+        channel.send(PAYLOAD)
+        self.assertIs(channel.server, connection)
+        self.assertEqual(len(self.wait_for("smtp_message", 2)), 2)
+        channel.close()
+
+    def test_notify_does_not_block_while_smtp_is_down(self):
+        self.server.cloud.scenario["smtp_delay_seconds"] = 5
+        dispatcher = self.dispatcher([sniper.EmailChannel(10)], retries=1)
+        started = time.monotonic()
+        dispatcher.notify(PAYLOAD)
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_email_reports_the_instance_state(self):
+        channel = sniper.EmailChannel(5)
+        sent = []
+        channel._connect = lambda: type("Server", (), {"send_message": lambda self, msg: sent.append(msg)})()
+        channel.send(dict(PAYLOAD, state="PROVISIONING"))
+        body = sent[0].get_payload()[0].get_payload()
+        self.assertIn("Status: PROVISIONING", body)
+        self.assertNotIn("RUNNING", body)
+        self.assertIn("Still Provisioning", sent[0]["Subject"])
+
+
+if __name__ == "__main__":
+    unittest.main()